@@ -0,0 +1,98 @@
+"""Measure the bytes and latency trade-off of API response compression.
+
+Loads a temporary database, then requests the heaviest API endpoints with no
+compression and with gzip/deflate at several levels. Reports response size,
+server time and the estimated total time to deliver the response over a link
+of the given bandwidth.
+
+Usage:
+    python benchmarks/bench_compression.py --customers 5000 --decisions 2000 --mbps 10
+"""
+import argparse
+import gzip
+import os
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_serializers import load
+from src.main import create_app
+from src.models.business import db
+from src.ai_executives_enhanced import AIExecutiveTeam
+from src.services.decision_log import decision_log
+
+PATHS = ['/api/customers', '/api/ai-decisions?limit=1000', '/api/ai-decisions?stream=1', '/api/dashboard']
+SETTINGS = [('identity', None), ('gzip', 1), ('gzip', 6), ('gzip', 9), ('deflate', 6)]
+
+def load_decisions(count: int):
+    team = AIExecutiveTeam()
+    for executive in team.executives.values():
+        executive.model = None
+    roles = list(team.executives)
+    decision_log.record_many(
+        team.get_executive_decision(roles[index % len(roles)], {
+            'type': 'pricing', 'event_type': 'wedding', 'duration': 3, 'base_price': 747, 'request': index
+        })
+        for index in range(count)
+    )
+    db.session.commit()
+
+# Stamped with the current time on every dashboard request
+VOLATILE = re.compile(rb'"last_active":"[^"]*"')
+
+def decode(body: bytes, coding: str) -> bytes:
+    if coding == 'gzip':
+        body = gzip.decompress(body)
+    elif coding == 'deflate':
+        body = zlib.decompress(body)
+    return VOLATILE.sub(b'', body)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=5000)
+    parser.add_argument('--decisions', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--mbps', type=float, default=10, help='link bandwidth for the transfer estimate')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'DECISION_LOG_MODE': 'sync'
+        })
+        with app.app_context():
+            load(args.customers, 10, 10, args.seed)
+            load_decisions(args.decisions)
+
+        client = app.test_client()
+        for path in PATHS:
+            reference = None
+            for coding, level in SETTINGS:
+                if level is not None:
+                    app.config['COMPRESS_LEVEL'] = level
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    response = client.get(path, headers={'Accept-Encoding': coding})
+                    body = response.get_data()
+                    timings.append(time.perf_counter() - started)
+                server = min(timings)
+                served_coding = response.headers.get('Content-Encoding', 'identity')
+                plain = decode(body, served_coding)
+                if reference is None:
+                    reference = plain
+                status = 'ok' if plain == reference else 'MISMATCH'
+                transfer = len(body) * 8 / (args.mbps * 1e6)
+                label = coding if level is None else f'{coding}-{level}'
+                print(f"{path:>28} {label:>10}: {len(body):9d} bytes ({len(body) / len(reference):6.1%})  "
+                      f"server {server * 1000:7.1f} ms  total @{args.mbps:g} Mbit/s {(server + transfer) * 1000:8.1f} ms  "
+                      f"{served_coding} {status}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Load test the SQLite profile: concurrent inquiry writes alongside API reads.
+
+Runs the same mixed workload against a temporary database with SQLite's
+defaults (rollback journal, no busy timeout beyond the driver's), with the
+production pragmas only, and with the pragmas plus a separate read-only pool
+for the analytics views, using several worker processes with several
+threads each, like a preforking server. Writer processes perform the inquiry
+transaction (customer, booking and communication rows); reader processes call
+API endpoints through the test client. Roles are split by process so that
+GIL contention between threads does not mask database lock contention.
+
+Usage:
+    python benchmarks/bench_db_load.py --workers 4 --writers 2 --threads 4 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+READ_PATHS = ['/api/dashboard', '/api/analytics', '/api/analytics/timeseries', '/api/ai-decisions']
+
+PROFILES = {
+    'default': {'SQLITE_PRAGMAS': {}, 'SQLALCHEMY_READ_URI': None},
+    'wal': {'SQLALCHEMY_READ_URI': None},
+    'production': {},
+}
+
+def _app(path: str, profile: str, threads: int):
+    os.environ['WEB_THREADS'] = str(threads)
+    from src.main import create_app
+    config = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'DECISION_LOG_MODE': 'sync'}
+    config.update(PROFILES[profile])
+    return create_app(config)
+
+def _write_inquiry(worker: int, sequence: int):
+    from src.models.business import db, Customer, Booking, Communication
+    customer = Customer(name=f'Load {worker}-{sequence}', email=f'load{worker}.{sequence}@example.com',
+                        created_at=datetime.now())
+    db.session.add(customer)
+    db.session.flush()
+    booking = Booking(customer_id=customer.id, event_type='wedding', event_date=date.today(),
+                      duration_hours=3, base_price=747.0, final_price=747.0, status='inquiry',
+                      created_at=datetime.now())
+    db.session.add(booking)
+    db.session.flush()
+    db.session.add(Communication(customer_id=customer.id, booking_id=booking.id,
+                                 message_type='ai_response', content='Thank you', sent_at=datetime.now()))
+    db.session.commit()
+
+def _run_worker(args):
+    path, profile, worker, threads, writes, seconds = args
+    app = _app(path, profile, threads)
+    from src.models.business import db
+
+    deadline = time.perf_counter() + seconds
+    counts = {'writes': 0, 'reads': 0, 'errors': 0, 'locked': 0}
+    lock = threading.Lock()
+
+    def writer(thread: int):
+        sequence = 0
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                sequence += 1
+                try:
+                    _write_inquiry(worker * 1000 + thread, sequence)
+                    key = 'writes'
+                except Exception as exc:
+                    db.session.rollback()
+                    key = 'locked' if 'database is locked' in str(exc) else 'errors'
+                with lock:
+                    counts[key] += 1
+
+    def reader(thread: int):
+        client = app.test_client()
+        index = thread
+        while time.perf_counter() < deadline:
+            index += 1
+            response = client.get(READ_PATHS[index % len(READ_PATHS)])
+            body = response.get_data(as_text=True)
+            if response.status_code == 200:
+                key = 'reads'
+            else:
+                key = 'locked' if 'database is locked' in body else 'errors'
+            with lock:
+                counts[key] += 1
+
+    pool = [
+        threading.Thread(target=writer if writes else reader, args=(thread,))
+        for thread in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return counts
+
+def run(profile: str, workers: int, threads: int, writers: int, seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'load.db')
+        _app(path, profile, threads)  # create the schema up front
+
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(workers) as pool:
+            results = pool.map(_run_worker, [
+                (path, profile, worker, threads, worker < writers, seconds) for worker in range(workers)
+            ])
+
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+    print(f"{profile:>10}: {totals['writes'] / seconds:8.1f} writes/s  {totals['reads'] / seconds:8.1f} reads/s  "
+          f"{totals['locked']:5d} locked  {totals['errors']:5d} other errors")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4, help='worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker')
+    parser.add_argument('--writers', type=int, default=2, help='worker processes that write')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--profile', choices=sorted(PROFILES), action='append')
+    args = parser.parse_args()
+
+    for profile in args.profile or ['default', 'wal', 'production']:
+        run(profile, args.workers, args.threads, args.writers, args.seconds)
+
+if __name__ == '__main__':
+    main()
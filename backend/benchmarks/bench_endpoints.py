@@ -0,0 +1,295 @@
+"""Latency and throughput of every API endpoint (bar those in SKIPPED) under concurrent load.
+
+Creates the app against a temporary SQLite database, loads a synthetic
+dataset at the requested scale, then drives each endpoint through the test
+client from 1..N threads for a fixed time. Read endpoints run first, against
+the freshly loaded data, then the write endpoints. AI executives run on their
+offline fallback so results do not depend on an LLM. Results (latency
+percentiles, requests per second, SQL statements per request, status codes)
+are printed and written as JSON. Pass an earlier run as ``--baseline`` to
+compare two commits: the script exits non-zero when an endpoint's median
+latency regressed beyond ``--tolerance`` or its SQL statement count or
+error rate went up.
+
+Threads share one interpreter, so throughput above one thread measures
+database and lock contention rather than CPU scaling; compare runs made on
+the same machine with the same arguments.
+
+Usage:
+    python benchmarks/bench_endpoints.py --customers 5000 --threads 1,4 --seconds 3 --output before.json
+    python benchmarks/bench_endpoints.py --customers 5000 --threads 1,4 --seconds 3 --baseline before.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_serializers import load
+from bench_compression import load_decisions
+from src.main import create_app
+from src.ai_executives_enhanced import get_ai_team
+
+_sequence = itertools.count(1)
+
+def _inquiry(rng, scale):
+    number = next(_sequence)
+    return {
+        'fullName': f'Bench {number}',
+        'email': f'bench{number}@example.com',
+        'eventType': rng.choice(['wedding', 'corporate', 'birthday']),
+        'eventDate': (date.today() + timedelta(days=rng.randrange(1, 365))).isoformat(),
+        'duration': rng.choice([2, 3, 4, 5]),
+        'guestCount': 120,
+        'venue': 'The Hilton'
+    }
+
+def _user(rng, scale):
+    number = next(_sequence)
+    return {'username': f'bench{number}', 'email': f'bench{number}@example.com'}
+
+def _booking(rng, scale):
+    return rng.randrange(1, scale['customers'] * 2 + 1)
+
+def _unit(rng, scale):
+    return rng.randrange(1, scale['equipment'] + 1)
+
+def _completion(rng, scale):
+    return {'staff_ids': rng.sample(range(1, scale['staff'] + 1), min(2, scale['staff'])),
+            'rating': rng.choice([None, 4, 5])}
+
+# Sent with every request; only the admin endpoints look at it
+ADMIN_TOKEN = 'bench'
+HEADERS = {'X-Admin-Token': ADMIN_TOKEN}
+
+# (name, method, path, JSON body); path and body may be callables of
+# (rng, scale) so every request can pick its own ids and payload
+READ_ENDPOINTS = [
+    ('customers', 'GET', '/api/customers', None),
+    ('dashboard', 'GET', '/api/dashboard', None),
+    ('staff', 'GET', '/api/staff', None),
+    ('equipment', 'GET', '/api/equipment', None),
+    ('ai-decisions', 'GET', '/api/ai-decisions?limit=100', None),
+    ('ai-decisions-stream', 'GET', '/api/ai-decisions?stream=1', None),
+    ('ai-executives-status', 'GET', '/api/ai-executives/status', None),
+    ('analytics', 'GET', '/api/analytics', None),
+    ('analytics-timeseries', 'GET', '/api/analytics/timeseries?bucket=week', None),
+    ('users', 'GET', '/api/users', None),
+    ('user', 'GET', '/api/users/1', None),
+    ('bookings', 'GET', '/api/bookings?status=confirmed&limit=50', None),
+    ('bookings-history', 'GET', '/api/bookings?history=1&limit=50', None),
+    ('search', 'GET', '/api/search?q=customer', None),
+    ('maintenance-due', 'GET', '/api/equipment/maintenance-due?days=90', None),
+    ('metrics', 'GET', '/metrics', None),
+]
+
+WRITE_ENDPOINTS = [
+    ('inquiry', 'POST', '/api/inquiries', _inquiry),
+    ('quote', 'POST', lambda rng, scale: f'/api/bookings/{_booking(rng, scale)}/quote', {}),
+    ('confirm', 'POST', lambda rng, scale: f'/api/bookings/{_booking(rng, scale)}/confirm', {}),
+    ('add-staff', 'POST', '/api/staff', {'name': 'Bench Staff', 'role': 'Photographer', 'base_salary': 2800}),
+    ('profit-distribution', 'POST', '/api/profit-distribution', {'total_profit': 10000}),
+    ('pricing-optimization', 'POST', '/api/optimization/pricing', {'market_demand': 'high'}),
+    ('create-user', 'POST', '/api/users', _user),
+    ('update-user', 'PUT', '/api/users/1', {'email': 'bench-updated@example.com'}),
+    ('complete', 'POST', lambda rng, scale: f'/api/bookings/{_booking(rng, scale)}/complete', _completion),
+    ('maintenance', 'POST', lambda rng, scale: f'/api/equipment/{_unit(rng, scale)}/maintenance', {}),
+    # Last: every call grows the dataset the other endpoints run against
+    ('sample-data', 'POST', '/api/admin/sample-data',
+     {'customers': 10, 'staff': 0, 'equipment': 0, 'decisions': 10}),
+]
+
+# Not benchmarked: the first destroys the data the other endpoints rely on;
+# the profile routes only exist with PROFILING_ENABLED
+SKIPPED = ['DELETE /api/users/<id>', 'GET /api/admin/profiles[/<name>]']
+
+def _resolve(value, rng, scale):
+    return value(rng, scale) if callable(value) else value
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_endpoint(app, endpoint, threads: int, seconds: float, warmup: int, scale, seed: int):
+    name, method, path, body = endpoint
+    latencies, statuses, queries = [], {}, []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        client = app.test_client()
+        local_latencies, local_statuses, local_queries = [], {}, []
+        for _ in range(warmup if index == 0 else 0):
+            client.open(_resolve(path, rng, scale), method=method, json=_resolve(body, rng, scale),
+                        headers=HEADERS).get_data()
+        start.wait()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            url, payload = _resolve(path, rng, scale), _resolve(body, rng, scale)
+            started = time.perf_counter()
+            response = client.open(url, method=method, json=payload, headers=HEADERS)
+            response.get_data()
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[response.status_code] = local_statuses.get(response.status_code, 0) + 1
+            if 'X-Query-Count' in response.headers:
+                local_queries.append(int(response.headers['X-Query-Count']))
+        with lock:
+            latencies.extend(local_latencies)
+            queries.extend(local_queries)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    start = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()  # released once every worker has warmed up
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    return {
+        'endpoint': name,
+        'method': method,
+        'path': path if isinstance(path, str) else None,
+        'threads': threads,
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if status >= 500),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'rps': round(len(latencies) / elapsed, 2),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 3),
+            'p50': round(_percentile(latencies, 0.50) * 1000, 3),
+            'p95': round(_percentile(latencies, 0.95) * 1000, 3),
+            'p99': round(_percentile(latencies, 0.99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3)
+        } if latencies else None,
+        'queries': statistics.median(queries) if queries else None
+    }
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, tolerance: float) -> int:
+    """Print changes against a baseline run; return the number of regressions"""
+    previous = {(row['endpoint'], row['threads']): row for row in baseline['results']}
+    regressions = 0
+    print(f"\nAgainst {baseline['meta'].get('commit') or 'baseline'} (tolerance {tolerance:.0%}):")
+    for row in results:
+        old = previous.get((row['endpoint'], row['threads']))
+        if old is None or not old['latency_ms'] or not row['latency_ms']:
+            continue
+        change = row['latency_ms']['p50'] / old['latency_ms']['p50'] - 1
+        notes = []
+        if change > tolerance:
+            notes.append('SLOWER')
+        if row['queries'] is not None and old['queries'] is not None and row['queries'] > old['queries']:
+            notes.append(f"QUERIES {old['queries']:g} -> {row['queries']:g}")
+        error_rate, old_error_rate = row['errors'] / row['requests'], old['errors'] / old['requests']
+        if error_rate > old_error_rate:
+            notes.append(f"ERRORS {old_error_rate:.0%} -> {error_rate:.0%}")
+        regressions += bool(notes)
+        print(f"{row['endpoint']:>22} x{row['threads']:<3} p50 {old['latency_ms']['p50']:8.2f} -> "
+              f"{row['latency_ms']['p50']:8.2f} ms ({change:+7.1%})  "
+              f"rps {old['rps']:8.1f} -> {row['rps']:8.1f}  {' '.join(notes)}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=2000)
+    parser.add_argument('--staff', type=int, default=50)
+    parser.add_argument('--equipment', type=int, default=50)
+    parser.add_argument('--decisions', type=int, default=2000)
+    parser.add_argument('--threads', default='1,4', help='comma-separated concurrency levels')
+    parser.add_argument('--seconds', type=float, default=2, help='measured time per endpoint and level')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', help='comma-separated endpoint names to run')
+    parser.add_argument('--reads-only', action='store_true', help='skip the endpoints that write')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed median latency increase')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.threads.split(',')]
+    endpoints = READ_ENDPOINTS + ([] if args.reads_only else WRITE_ENDPOINTS)
+    if args.only:
+        wanted = set(args.only.split(','))
+        endpoints = [endpoint for endpoint in endpoints if endpoint[0] in wanted]
+    scale = {'customers': args.customers, 'staff': args.staff, 'equipment': args.equipment,
+             'decisions': args.decisions}
+
+    for executive in get_ai_team().executives.values():
+        executive.model = None
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['WEB_THREADS'] = str(max(levels))
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'DECISION_LOG_MODE': 'sync',
+            'QUERY_AUDIT': True,
+            'QUERY_AUDIT_STRICT': False,
+            'ADMIN_TOKEN': ADMIN_TOKEN
+        })
+        # Failures are counted per status code; their tracebacks would bury the table
+        app.logger.setLevel(logging.CRITICAL)
+        with app.app_context():
+            load(args.customers, args.staff, args.equipment, args.seed)
+            load_decisions(args.decisions)
+
+        print(f"skipped: {', '.join(SKIPPED)}")
+        for endpoint in endpoints:
+            for threads in levels:
+                row = run_endpoint(app, endpoint, threads, args.seconds, args.warmup, scale, args.seed)
+                results.append(row)
+                latency = row['latency_ms'] or {'p50': 0, 'p95': 0, 'p99': 0}
+                queries = '-' if row['queries'] is None else f"{row['queries']:g}"
+                print(f"{row['endpoint']:>22} x{threads:<3} {row['rps']:8.1f} req/s  p50 {latency['p50']:8.2f}  "
+                      f"p95 {latency['p95']:8.2f}  p99 {latency['p99']:8.2f} ms  queries {queries:>4}  "
+                      f"statuses {row['statuses']}")
+
+    report = {
+        'meta': {
+            'commit': _commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': scale,
+            'threads': levels,
+            'seconds': args.seconds,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
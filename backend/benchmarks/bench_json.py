@@ -0,0 +1,125 @@
+"""Microbenchmark the orjson and stdlib JSON providers on API-shaped payloads.
+
+Checks that both providers produce identical response bytes, exiting
+non-zero when they differ; tests/test_json_provider.py runs the same check
+on every pytest run.
+
+Usage:
+    python benchmarks/bench_json.py --customers 20000 --decisions 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.ai_executives_enhanced import AIExecutiveTeam
+from src.extensions.json_provider import JSONProvider, OrjsonProvider, orjson
+
+def customers_payload(count: int, rng):
+    now = datetime.now()
+    return [
+        {
+            'id': index,
+            'name': f'Customer {index}',
+            'email': f'customer{index}@example.com',
+            'phone': '555-0100',
+            'created_at': (now - timedelta(seconds=rng.randrange(10 ** 7))).isoformat(),
+            'bookings': [
+                {
+                    'id': index * 2 + offset,
+                    'event_type': rng.choice(['wedding', 'corporate', 'birthday']),
+                    'event_date': (date.today() + timedelta(days=rng.randrange(365))).isoformat(),
+                    'duration_hours': 3,
+                    'venue': 'The Hilton',
+                    'guest_count': 120,
+                    'base_price': 747.0,
+                    'final_price': 859.05,
+                    'status': 'confirmed',
+                    'created_at': now.isoformat()
+                }
+                for offset in range(2)
+            ]
+        }
+        for index in range(count)
+    ]
+
+def decisions_payload(count: int, rng):
+    team = AIExecutiveTeam()
+    for executive in team.executives.values():
+        executive.model = None
+    payload = []
+    for index in range(count):
+        log = team.get_executive_decision(rng.choice(list(team.executives)), {
+            'type': 'pricing',
+            'event_type': 'wedding',
+            'duration': 3,
+            'base_price': 747
+        })
+        payload.append({
+            'id': index,
+            'executive_role': log['executive'],
+            'decision_type': 'pricing',
+            'context': log['context'],
+            'decision': log['decision'],
+            'impact_level': log['decision']['impact_level'],
+            'created_at': log['timestamp']
+        })
+    return payload
+
+def analytics_payload():
+    return {
+        'period': {'start_date': '2026-01-01', 'end_date': '2026-01-31'},
+        'financial': {'total_revenue': 15750.0, 'total_profit_distributed': 11025.0,
+                      'wage_earner_percentage': 70.0, 'total_staff_compensation': 8500.0},
+        'operational': {'active_staff_count': 3, 'average_performance': 96.0, 'total_events_completed': 26},
+        'ai_governance': {'decisions_made': 120, 'average_decisions_per_day': 4.0, 'system_efficiency': 97.5}
+    }
+
+def best_of(provider, payload, repeat: int):
+    timings = []
+    body = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = provider.response(payload).get_data()
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--decisions', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if orjson is None:
+        sys.exit("orjson is not installed; nothing to compare")
+
+    rng = random.Random(args.seed)
+    app = Flask(__name__)
+    stdlib, fast = JSONProvider(app), OrjsonProvider(app)
+    payloads = {
+        '/api/customers': customers_payload(args.customers, rng),
+        '/api/ai-decisions': decisions_payload(args.decisions, rng),
+        '/api/analytics': analytics_payload(),
+    }
+
+    mismatches = 0
+    for name, payload in payloads.items():
+        stdlib_time, stdlib_body = best_of(stdlib, payload, args.repeat)
+        fast_time, fast_body = best_of(fast, payload, args.repeat)
+        status = 'identical' if stdlib_body == fast_body else 'MISMATCH'
+        print(f"{name:>18}: stdlib {stdlib_time * 1000:9.3f} ms  orjson {fast_time * 1000:9.3f} ms  "
+              f"speedup {stdlib_time / fast_time:5.1f}x  {len(fast_body)} bytes {status}")
+        mismatches += stdlib_body != fast_body
+
+    if mismatches:
+        sys.exit(f"{mismatches} payloads encode differently")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Compare audit-table size with inline payloads vs the content-addressed store.
+
+Usage:
+    python benchmarks/bench_payload_store.py --decisions 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.models.business import db, AIExecutiveDecision, DecisionPayload
+from src.ai_executives_enhanced import AIExecutiveTeam
+from src.services.payload_store import store_payloads
+
+EVENT_TYPES = ['wedding', 'corporate', 'birthday', 'graduation', 'holiday']
+CHUNK = 5000
+
+def decision_logs(count: int, seed: int):
+    """Decision logs shaped like the ones the routes record, using the fallback executives"""
+    rng = random.Random(seed)
+    team = AIExecutiveTeam()
+    for executive in team.executives.values():
+        executive.model = None
+
+    for _ in range(count):
+        duration = rng.choice([2, 3, 4, 5])
+        context = rng.choice([
+            {
+                'type': 'pricing',
+                'event_type': rng.choice(EVENT_TYPES),
+                'duration': duration,
+                'guest_count': rng.choice([0, 50, 100, 150, 200]),
+                'venue': '',
+                'base_price': {2: 498, 3: 747, 4: 996, 5: 1245}[duration]
+            },
+            {
+                'type': 'customer_response',
+                'customer_profile': {
+                    'event_type': rng.choice(EVENT_TYPES),
+                    'budget_indicator': {2: 498, 3: 747, 4: 996, 5: 1245}[duration],
+                    'special_requests': ''
+                }
+            }
+        ])
+        role = rng.choice(list(team.executives))
+        yield team.executives[role].make_decision(context)
+
+def database_size(path: str) -> int:
+    return sum(
+        os.path.getsize(path + suffix)
+        for suffix in ('', '-wal')
+        if os.path.exists(path + suffix)
+    )
+
+def payload_bytes() -> int:
+    """Bytes spent on context/decision payloads, inline or in the payload store"""
+    inline = db.session.execute(db.select(db.func.sum(
+        db.func.coalesce(db.func.length(AIExecutiveDecision.context), 0) +
+        db.func.coalesce(db.func.length(AIExecutiveDecision.decision), 0) +
+        db.func.coalesce(db.func.length(AIExecutiveDecision.context_hash), 0) +
+        db.func.coalesce(db.func.length(AIExecutiveDecision.decision_hash), 0)
+    ))).scalar() or 0
+    stored = db.session.execute(db.select(db.func.sum(
+        db.func.length(DecisionPayload.hash) + db.func.length(DecisionPayload.data)
+    ))).scalar() or 0
+    return inline + stored
+
+def load(dedupe: bool, count: int, seed: int):
+    rows = []
+    for log in decision_logs(count, seed):
+        row = {
+            'executive_role': log['executive'],
+            'decision_type': log['context']['type'],
+            'impact_level': log['decision'].get('impact_level', 'Medium'),
+            'created_at': datetime.fromisoformat(log['timestamp'])
+        }
+        if dedupe:
+            row['context_hash'], row['decision_hash'] = store_payloads([log['context'], log['decision']])
+        else:
+            row['context'] = json.dumps(log['context'])
+            row['decision'] = json.dumps(log['decision'])
+        rows.append(row)
+        if len(rows) == CHUNK:
+            db.session.execute(db.insert(AIExecutiveDecision), rows)
+            db.session.commit()
+            rows = []
+    if rows:
+        db.session.execute(db.insert(AIExecutiveDecision), rows)
+    db.session.commit()
+    db.session.execute(db.text('VACUUM'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--decisions', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = {}
+    payloads = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('inline', 'dedupe'):
+            path = os.path.join(tmp, f'{mode}.db')
+            app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+            with app.app_context():
+                started = time.perf_counter()
+                load(mode == 'dedupe', args.decisions, args.seed)
+                elapsed = time.perf_counter() - started
+                payloads[mode] = payload_bytes()
+                db.session.remove()
+                db.engine.dispose()
+            results[mode] = database_size(path)
+            print(f"{mode:>6}: database {results[mode] / 1024 / 1024:8.1f} MiB  "
+                  f"payloads {payloads[mode] / 1024 / 1024:8.2f} MiB  load {elapsed:6.1f}s")
+
+    print(f"database reduction: {results['inline'] / results['dedupe']:.1f}x  "
+          f"payload reduction: {payloads['inline'] / payloads['dedupe']:.1f}x")
+
+if __name__ == '__main__':
+    main()
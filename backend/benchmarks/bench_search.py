@@ -0,0 +1,72 @@
+"""Time the full-text search at scale against its accepted bound.
+
+Loads a synthetic dataset into a temporary SQLite database, merges the
+search index as `flask search-index optimize` would after a bulk load, then
+times each query in QUERIES: common words, names, several words at once, a
+half-typed last word and words nothing matches. Exits non-zero when any
+query's median exceeds --max-ms, so it can gate changes to the search or to
+the index definition.
+
+Usage:
+    python benchmarks/bench_search.py --customers 200000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.services.sample_data import generate_sample_data
+from src.services.search_index import optimize_search_index, search
+
+TODAY = date(2026, 1, 1)
+# The bound README.md records for 200,000 customers
+MAX_MS = 20.0
+
+QUERIES = [
+    'garcia', 'smith', 'wedding', 'gold', 'hilton', 'thank',
+    'corporate oak barn', 'wedding at the hilton with the gold backdrop',
+    'garc', 'maria garc', 'xyzzy',
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--max-ms', type=float, default=MAX_MS)
+    args = parser.parse_args()
+
+    slow = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'DECISION_LOG_MODE': 'sync'
+        })
+        with app.app_context():
+            counts = generate_sample_data(customers=args.customers, today=TODAY)
+            optimize_search_index()
+            print(f"{counts['customers']} customers, {counts['bookings']} bookings")
+
+            for query in QUERIES:
+                search(query)
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    hits = search(query)
+                    timings.append(time.perf_counter() - started)
+                median = statistics.median(timings) * 1000
+                slow += median > args.max_ms
+                print(f"{query[:40]:>42}: {median:7.2f} ms  {len(hits):3} hits  "
+                      f"{'SLOW' if median > args.max_ms else 'ok'}")
+
+    if slow:
+        print(f"{slow} queries over {args.max_ms} ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
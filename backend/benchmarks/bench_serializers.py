@@ -0,0 +1,223 @@
+"""Compare row-tuple serializers with ORM hydration for the list endpoints.
+
+Checks that both paths produce byte-identical JSON, exiting non-zero when
+they differ, and reports timings. tests/test_serializers.py runs the same
+comparison on every pytest run.
+
+Usage:
+    python benchmarks/bench_serializers.py --customers 20000 --staff 5000 --equipment 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as time_of_day, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify
+from src.main import create_app
+from src.models.business import db, Customer, Booking, StaffMember, Equipment, BusinessMetrics, Communication
+from src.services import serializers
+
+# Reference implementations: the list endpoints as they were written before
+# the serializers, hydrating ORM objects and formatting field by field
+
+def legacy_customers():
+    result = []
+    for customer in Customer.query.all():
+        customer_data = {
+            'id': customer.id,
+            'name': customer.name,
+            'email': customer.email,
+            'phone': customer.phone,
+            'created_at': customer.created_at.isoformat(),
+            'bookings': []
+        }
+        # The relationship has no order; the endpoint lists bookings by id
+        for booking in sorted(customer.bookings, key=lambda booking: booking.id):
+            customer_data['bookings'].append({
+                'id': booking.id,
+                'event_type': booking.event_type,
+                'event_date': booking.event_date.isoformat(),
+                'duration_hours': booking.duration_hours,
+                'venue': booking.venue,
+                'guest_count': booking.guest_count,
+                'base_price': booking.base_price,
+                'final_price': booking.final_price,
+                'status': booking.status,
+                'created_at': booking.created_at.isoformat()
+            })
+        result.append(customer_data)
+    return result
+
+def legacy_staff():
+    return [
+        {
+            'id': staff.id,
+            'name': staff.name,
+            'role': staff.role,
+            'status': staff.status,
+            'base_salary': float(staff.base_salary),
+            'profit_share': float(staff.profit_share),
+            'performance_score': staff.performance_score,
+            'events_completed': staff.events_completed,
+            'hire_date': staff.hire_date.isoformat(),
+            'total_compensation': float(staff.base_salary + staff.profit_share)
+        }
+        for staff in StaffMember.query.all()
+    ]
+
+def legacy_equipment():
+    return [
+        {
+            'id': item.id,
+            'name': item.name,
+            'type': item.type,
+            'status': item.status,
+            'purchase_date': item.purchase_date.isoformat() if item.purchase_date else None,
+            'last_maintenance': item.last_maintenance.isoformat() if item.last_maintenance else None,
+            'next_maintenance': item.next_maintenance.isoformat() if item.next_maintenance else None,
+            'location': item.location,
+            'usage_count': item.usage_count
+        }
+        for item in Equipment.query.all()
+    ]
+
+def _timestamp(rng, now):
+    value = now - timedelta(seconds=rng.randrange(365 * 86400), microseconds=rng.randrange(1000000))
+    # Exercise the zero-microsecond isoformat() branch too
+    return value.replace(microsecond=0) if rng.random() < 0.2 else value
+
+def load(customers: int, staff: int, equipment: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    db.session.execute(db.insert(Customer), [
+        {
+            'name': f'Customer {index}',
+            'email': f'customer{index}@example.com',
+            'phone': rng.choice(['', None, '555-0100']),
+            'company': rng.choice([None, 'Acme']),
+            'created_at': _timestamp(rng, now),
+            'updated_at': _timestamp(rng, now)
+        }
+        for index in range(customers)
+    ])
+    db.session.execute(db.insert(Booking), [
+        {
+            'customer_id': rng.randrange(1, customers + 1),
+            'event_type': rng.choice(['wedding', 'corporate', 'birthday']),
+            'event_date': date.today() + timedelta(days=rng.randrange(-365, 365)),
+            'event_time': rng.choice([None, time_of_day(18, 30), time_of_day(9, 15, 5, 250)]),
+            'duration_hours': rng.choice([2, 3, 4, 5]),
+            'venue': rng.choice(['', 'The Hilton', None]),
+            'guest_count': rng.choice([None, 80, 150]),
+            'base_price': rng.choice([498.0, 747.0, 0.0]),
+            'final_price': rng.choice([None, 747.0, 859.05]),
+            'status': rng.choice(['inquiry', 'confirmed']),
+            'created_at': _timestamp(rng, now)
+        }
+        for _ in range(customers * 2)
+    ])
+    db.session.execute(db.insert(StaffMember), [
+        {
+            'name': f'Staff {index}',
+            'role': 'Photographer',
+            'base_salary': rng.choice([2200.0, 2800.5, 3500.0]),
+            'profit_share': rng.choice([0.0, 123.45, 1e-7]),
+            'performance_score': rng.choice([85, 96.5, 98.25]),
+            'events_completed': rng.randrange(40),
+            'hire_date': date.today() - timedelta(days=rng.randrange(2000)),
+            'created_at': _timestamp(rng, now)
+        }
+        for index in range(staff)
+    ])
+    db.session.execute(db.insert(Equipment), [
+        {
+            'name': f'Booth {index}',
+            'type': rng.choice(['camera', 'printer', 'lighting']),
+            'status': 'active',
+            'purchase_date': rng.choice([None, date.today() - timedelta(days=400)]),
+            'last_maintenance': rng.choice([None, date.today() - timedelta(days=30)]),
+            'next_maintenance': rng.choice([None, date.today() + timedelta(days=60)]),
+            'created_at': _timestamp(rng, now)
+        }
+        for index in range(equipment)
+    ])
+    db.session.execute(db.insert(BusinessMetrics), [
+        {
+            'date': date.today() - timedelta(days=index),
+            'total_revenue': 5000.0 + index,
+            'profit_distributed': 3500.0,
+            'staff_count': 3,
+            'average_performance': 95.5,
+            'created_at': _timestamp(rng, now)
+        }
+        for index in range(365)
+    ])
+    db.session.execute(db.insert(Communication), [
+        {'customer_id': 1, 'message_type': 'email', 'content': 'Hi', 'sent_at': _timestamp(rng, now)}
+        for _ in range(1000)
+    ])
+    db.session.commit()
+
+def best_of(function, repeat: int):
+    timings = []
+    body = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        body = jsonify(function()).get_data()
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--staff', type=int, default=5000)
+    parser.add_argument('--equipment', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    cases = [
+        ('customers', legacy_customers, serializers.customers_with_bookings),
+        ('staff', legacy_staff, lambda: serializers.STAFF_LIST.all(order_by=StaffMember.id)),
+        ('equipment', legacy_equipment, lambda: serializers.EQUIPMENT_LIST.all(order_by=Equipment.id)),
+    ]
+    model_cases = [(Booking, serializers.BOOKING)]
+    mismatches = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+        with app.app_context():
+            load(args.customers, args.staff, args.equipment, args.seed)
+
+            for name, legacy, fast in cases:
+                legacy_time, legacy_body = best_of(legacy, args.repeat)
+                fast_time, fast_body = best_of(fast, args.repeat)
+                status = 'identical' if legacy_body == fast_body else 'MISMATCH'
+                mismatches += legacy_body != fast_body
+                print(f"{name:>23}: orm {legacy_time * 1000:8.1f} ms  rows {fast_time * 1000:8.1f} ms  "
+                      f"speedup {legacy_time / fast_time:4.1f}x  {len(fast_body)} bytes {status}")
+
+            for model, serializer in model_cases:
+                order = model.id
+                legacy_time, legacy_body = best_of(
+                    lambda: [item.to_dict() for item in model.query.order_by(order).all()], args.repeat
+                )
+                fast_time, fast_body = best_of(lambda: serializer.all(order_by=order), args.repeat)
+                status = 'identical' if legacy_body == fast_body else 'MISMATCH'
+                mismatches += legacy_body != fast_body
+                print(f"{model.__name__ + '.to_dict':>23}: orm {legacy_time * 1000:8.1f} ms  "
+                      f"rows {fast_time * 1000:8.1f} ms  speedup {legacy_time / fast_time:4.1f}x  {status}")
+
+    if mismatches:
+        print(f"{mismatches} serializers differ from the ORM output")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
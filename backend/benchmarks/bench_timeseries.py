@@ -0,0 +1,115 @@
+"""Benchmark the SQL-bucketed analytics time series at scale.
+
+Usage:
+    python benchmarks/bench_timeseries.py --bookings 1000000 --decisions 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.models.business import db, Customer, Booking, BusinessMetrics, AIExecutiveDecision
+from src.services.timeseries import build_timeseries, BUCKETS
+
+EVENT_TYPES = ['wedding', 'corporate', 'birthday', 'graduation', 'holiday']
+STATUSES = ['inquiry', 'confirmed', 'cancelled']
+ROLES = ['AI_CEO', 'AI_CMO', 'AI_COO']
+CHUNK = 50000
+
+def _insert_chunked(model, rows):
+    for start in range(0, len(rows), CHUNK):
+        db.session.execute(db.insert(model), rows[start:start + CHUNK])
+    db.session.commit()
+
+def load(bookings: int, decisions: int, days: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    db.session.execute(db.insert(Customer), [{'name': 'Bench Customer', 'email': 'bench@example.com'}])
+
+    rows = []
+    for _ in range(bookings):
+        created = now - timedelta(seconds=rng.randrange(days * 86400))
+        rows.append({
+            'customer_id': 1,
+            'event_type': rng.choice(EVENT_TYPES),
+            'event_date': (created + timedelta(days=rng.randrange(120))).date(),
+            'duration_hours': rng.choice([2, 3, 4, 5]),
+            'base_price': 747.0,
+            'final_price': 747.0,
+            'status': rng.choice(STATUSES),
+            'created_at': created
+        })
+        if len(rows) == CHUNK:
+            _insert_chunked(Booking, rows)
+            rows = []
+    _insert_chunked(Booking, rows)
+
+    rows = []
+    for _ in range(decisions):
+        rows.append({
+            'executive_role': rng.choice(ROLES),
+            'decision_type': 'pricing',
+            'context': '{}',
+            'decision': '{}',
+            'impact_level': 'Medium',
+            'created_at': now - timedelta(seconds=rng.randrange(days * 86400))
+        })
+        if len(rows) == CHUNK:
+            _insert_chunked(AIExecutiveDecision, rows)
+            rows = []
+    _insert_chunked(AIExecutiveDecision, rows)
+
+    _insert_chunked(BusinessMetrics, [
+        {
+            'date': (now - timedelta(days=day)).date(),
+            'total_revenue': 5000.0,
+            'profit_distributed': 3500.0,
+            'staff_count': 3,
+            'average_performance': 95.0
+        }
+        for day in range(days)
+    ])
+    db.session.execute(db.text('ANALYZE'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=1000000)
+    parser.add_argument('--decisions', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+        with app.app_context():
+            started = time.perf_counter()
+            load(args.bookings, args.decisions, args.days, args.seed)
+            print(f"loaded {args.bookings} bookings, {args.decisions} decisions "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+            end_date = datetime.now().date()
+            windows = {'30d': 30, '1y': 365, 'all': args.days + 120}
+            for window, days in windows.items():
+                start_date = end_date - timedelta(days=days)
+                for bucket in BUCKETS:
+                    timings = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        result = build_timeseries(start_date, end_date, bucket)
+                        timings.append(time.perf_counter() - started)
+                    points = sum(len(value) for key, value in result.items() if key != 'period')
+                    print(f"{window:>4} {bucket:>5}: best {min(timings) * 1000:8.1f} ms  "
+                          f"median {sorted(timings)[len(timings) // 2] * 1000:8.1f} ms  "
+                          f"({points} points)")
+            db.session.remove()
+
+if __name__ == '__main__':
+    main()
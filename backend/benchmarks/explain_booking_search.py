@@ -0,0 +1,104 @@
+"""Check that every booking search runs off an index, and time it at scale.
+
+Loads a synthetic dataset into a temporary SQLite database, then runs
+EXPLAIN QUERY PLAN for each filter combination the /api/bookings search
+supports, first and later pages, both orders. A plan fails the check when it
+scans the booking table without an index, when it picks an index other than
+the one the combination is meant to use, or when it sorts the matches
+instead of reading them in index order. The only sorts allowed are the
+per-branch merges of a multi-value filter, each bounded by the page size.
+Exits non-zero on any failure, so it can gate changes to the search or to
+Booking's indexes.
+
+Usage:
+    python benchmarks/explain_booking_search.py --customers 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.models.business import db
+from src.services.booking_search import search_query
+from src.services.sample_data import generate_sample_data
+
+TODAY = date(2026, 1, 1)
+START, END = TODAY - timedelta(days=300), TODAY - timedelta(days=200)
+
+# name -> (filters, index the plan must use)
+CASES = {
+    'all bookings': ({}, 'ix_booking_event_date'),
+    'date range': ({'start_date': START, 'end_date': END}, 'ix_booking_event_date'),
+    'status': ({'status': ['confirmed']}, 'ix_booking_status_event_date'),
+    'statuses': ({'status': ['confirmed', 'inquiry']}, 'ix_booking_status_event_date'),
+    'event type + range': (
+        {'event_type': ['wedding'], 'start_date': START, 'end_date': END}, 'ix_booking_event_type_event_date'
+    ),
+    'event types': ({'event_type': ['wedding', 'prom', 'corporate']}, 'ix_booking_event_type_event_date'),
+    'venue': ({'venue': 'Oak Barn'}, 'ix_booking_venue_event_date'),
+    'customer': ({'customer_id': 42}, 'ix_booking_customer_id_event_date'),
+}
+
+def problems(plan, index: str):
+    found = []
+    merged = any(line.startswith('MERGE') for line in plan)
+    for line in plan:
+        if line.startswith(('SCAN booking', 'SEARCH booking')) and 'INDEX' not in line:
+            found.append(f'no index: {line}')
+        if line.startswith(('SCAN booking', 'SEARCH booking')) and f'INDEX {index}' not in line:
+            found.append(f'expected {index}: {line}')
+        if 'TEMP B-TREE' in line and not (merged and line == 'USE TEMP B-TREE FOR ORDER BY'):
+            found.append(f'sorts matches: {line}')
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, default=50000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--analyze', action='store_true', help='run ANALYZE first, as PRAGMA optimize would')
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'DECISION_LOG_MODE': 'sync'
+        })
+        with app.app_context():
+            counts = generate_sample_data(customers=args.customers, today=TODAY)
+            print(f"{counts['bookings']} bookings")
+            if args.analyze:
+                db.session.execute(db.text('ANALYZE'))
+                db.session.commit()
+
+            for name, (filters, index) in CASES.items():
+                for descending in (False, True):
+                    for after in (None, (TODAY - timedelta(days=250), 1000)):
+                        query = search_query(filters, after, args.limit + 1, descending)
+                        sql = str(query.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+                        plan = [row[3] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql))]
+                        timings = []
+                        for _ in range(args.repeat):
+                            started = time.perf_counter()
+                            db.session.execute(query).all()
+                            timings.append(time.perf_counter() - started)
+
+                        found = problems(plan, index)
+                        failures += bool(found)
+                        label = f"{name}, {'desc' if descending else 'asc'}, {'next page' if after else 'first page'}"
+                        print(f"{label:>42}: {min(timings) * 1000:7.2f} ms  {'FAIL' if found else 'ok'}")
+                        for problem in found:
+                            print(f"{'':>44}{problem}")
+
+    if failures:
+        print(f"{failures} plans without the expected index use")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
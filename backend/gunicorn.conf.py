@@ -0,0 +1,48 @@
+"""Gunicorn settings for the autonomous CMS backend.
+
+Run from the backend directory:
+
+    gunicorn -c gunicorn.conf.py src.wsgi:app
+
+WEB_CONCURRENCY sets the number of worker processes and WEB_THREADS the
+threads per worker (which also sizes each worker's connection pool).
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+
+# Import the app once in the master and fork it, sharing loaded code
+# between workers and failing fast on startup errors
+preload_app = True
+
+# AI executive calls can take a while; don't kill workers mid-request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+# Prometheus metrics: with PROMETHEUS_MULTIPROC_DIR set, workers record into
+# files in that directory and /metrics aggregates them across workers
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith('.db'):
+                os.remove(os.path.join(directory, name))  # stale files from a previous run
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,6 +2,7 @@ import json
 import openai
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+from src.services.pricing import BASE_PRICES, MAX_MULTIPLIER
 import logging
 
 # Configure logging
@@ -266,20 +267,15 @@ class AICMO(AIExecutive):
         competitor_pricing = context.get("competitor_pricing", {})
         
         # Base pricing structure
-        base_pricing = {
-            "2_hour": 498,
-            "3_hour": 747,
-            "4_hour": 996,
-            "5_hour": 1245
-        }
+        base_pricing = {f"{hours}_hour": price for hours, price in BASE_PRICES.items()}
         
-        # Adjust based on demand
+        # Adjust based on demand, capped like the pricing engine's own multipliers
         high_demand_periods = demand.get("high_demand_periods", [])
         seasonal_adjustments = {}
         
         for period in high_demand_periods:
             seasonal_adjustments[period] = {
-                "adjustment": 1.15,  # 15% increase during high demand
+                "adjustment": MAX_MULTIPLIER,
                 "reasoning": "High demand period pricing optimization"
             }
         
@@ -1,15 +1,51 @@
 import json
 import os
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 import google.generativeai as genai
 
+# Recent decisions kept in process memory; the audit table has the full record
+DECISION_HISTORY_SIZE = 100
+
+# Called after every decision as listener(role, seconds, source, usage), where
+# source is 'llm' or 'fallback' and usage maps 'prompt'/'completion' to the
+# LLM token counts when the model reported them
+decision_listeners: List[Callable[[str, float, str, Optional[Dict[str, int]]], None]] = []
+
+def _token_usage(response) -> Optional[Dict[str, int]]:
+    metadata = getattr(response, 'usage_metadata', None)
+    if metadata is None:
+        return None
+    return {
+        'prompt': getattr(metadata, 'prompt_token_count', 0) or 0,
+        'completion': getattr(metadata, 'candidates_token_count', 0) or 0
+    }
+
+class LocalDecisionCounter:
+    """Per-process decision counts, used when no shared counter is installed"""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def increment(self, role: str) -> int:
+        with self._lock:
+            self._counts[role] = self._counts.get(role, 0) + 1
+            return self._counts[role]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
 class AIExecutive:
-    def __init__(self, role: str, name: str, description: str):
+    def __init__(self, role: str, name: str, description: str, counter=None):
         self.role = role
         self.name = name
         self.description = description
-        self.decisions_made = 0
+        self.counter = counter or LocalDecisionCounter()
         self.efficiency = 95
         self.status = "ACTIVE"
         
@@ -21,28 +57,42 @@ class AIExecutive:
         else:
             self.model = None
 
+    @property
+    def decisions_made(self) -> int:
+        return self.counter.counts().get(self.role, 0)
+
     def make_decision(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Make an AI-powered decision based on context"""
-        self.decisions_made += 1
+        decision_id = self.counter.increment(self.role)
+        started = time.perf_counter()
+        source, usage = 'fallback', None
         
         if self.model:
             try:
                 prompt = self._create_decision_prompt(context)
                 response = self.model.generate_content(prompt)
                 decision = self._parse_ai_response(response.text)
+                source, usage = 'llm', _token_usage(response)
             except Exception as e:
                 print(f"AI decision fallback for {self.role}: {e}")
                 decision = self._fallback_decision(context)
         else:
             decision = self._fallback_decision(context)
         
+        elapsed = time.perf_counter() - started
+        for listener in decision_listeners:
+            try:
+                listener(self.role, elapsed, source, usage)
+            except Exception as e:
+                print(f"AI decision listener failed for {self.role}: {e}")
+        
         # Log decision for transparency
         decision_log = {
             "executive": self.role,
             "timestamp": datetime.now().isoformat(),
             "context": context,
             "decision": decision,
-            "decision_id": self.decisions_made
+            "decision_id": decision_id
         }
         
         return decision_log
@@ -180,20 +230,23 @@ class AIExecutive:
             "implementation_steps": ["Analyze situation", "Implement solution", "Monitor results"]
         }
 
-    def get_status(self) -> Dict[str, Any]:
+    def get_status(self, decisions_made: Optional[int] = None) -> Dict[str, Any]:
         """Get current status of the AI executive"""
+        if decisions_made is None:
+            decisions_made = self.decisions_made
         return {
             "role": self.role,
             "name": self.name,
             "description": self.description,
             "status": self.status,
-            "decisions_made": self.decisions_made,
+            "decisions_made": decisions_made,
             "efficiency": self.efficiency,
             "last_active": datetime.now().isoformat()
         }
 
 class AIExecutiveTeam:
-    def __init__(self):
+    def __init__(self, counter=None):
+        self.counter = counter or LocalDecisionCounter()
         self.executives = {
             "AI_CEO": AIExecutive(
                 "AI_CEO",
@@ -211,7 +264,14 @@ class AIExecutiveTeam:
                 "Operations management, scheduling, and quality assurance"
             )
         }
-        self.decision_history = []
+        self.use_counter(self.counter)
+        self.decision_history = deque(maxlen=DECISION_HISTORY_SIZE)
+
+    def use_counter(self, counter):
+        """Count decisions with ``counter``, e.g. one shared by all worker processes"""
+        self.counter = counter
+        for executive in self.executives.values():
+            executive.counter = counter
 
     def make_collective_decision(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Make a collective decision involving multiple executives"""
@@ -235,9 +295,10 @@ class AIExecutiveTeam:
 
     def get_team_status(self) -> Dict[str, Any]:
         """Get status of all executives"""
+        counts = self.counter.counts()
         return {
-            "executives": [exec.get_status() for exec in self.executives.values()],
-            "total_decisions": sum(exec.decisions_made for exec in self.executives.values()),
+            "executives": [exec.get_status(counts.get(role, 0)) for role, exec in self.executives.items()],
+            "total_decisions": sum(counts.get(role, 0) for role in self.executives),
             "average_efficiency": sum(exec.efficiency for exec in self.executives.values()) / len(self.executives),
             "system_status": "OPERATIONAL"
         }
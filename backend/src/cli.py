@@ -0,0 +1,182 @@
+import click
+import json
+import signal
+import threading
+import time
+from datetime import date
+from flask import current_app
+from flask.cli import AppGroup
+
+from src.services.decision_retention import apply_retention, deduplicate_decisions, DEFAULT_BATCH_SIZE
+from src.services.sample_data import generate_sample_data, SCALES, DEFAULT_CHUNK_SIZE
+from src.services.search_index import optimize_search_index, rebuild_search_index
+from src.services.staff_stats import rebuild_staff_summary, staff_summary
+from src.services import booking_archive
+from src.services.campaigns import DEFAULT_HASHTAGS, SEGMENTS, TEMPLATES, content_type_for, run_campaign
+from src.services.outbox import outbox_counts, requeue_failed, run_worker
+from src.models.business import db
+
+decisions_cli = AppGroup('decisions', help='AI executive decision audit log maintenance.')
+
+@decisions_cli.command('archive')
+@click.option('--days', type=int, default=None, help='Archive decisions older than this many days.')
+@click.option('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches.')
+@click.option('--pause', type=float, default=0.05, show_default=True,
+              help='Seconds to sleep between batches.')
+def archive_decisions_command(days, batch_size, max_batches, pause):
+    """Move old decisions from the hot table into the compacted archive"""
+    days = days if days is not None else current_app.config['DECISION_RETENTION_DAYS']
+    archived = apply_retention(days, batch_size=batch_size, max_batches=max_batches, pause=pause)
+    click.echo(f"Archived {archived} decisions older than {days} days")
+
+@decisions_cli.command('dedupe')
+@click.option('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches.')
+def dedupe_decisions_command(batch_size, max_batches):
+    """Move inline decision payloads of legacy rows into the payload store"""
+    converted = deduplicate_decisions(batch_size=batch_size, max_batches=max_batches)
+    click.echo(f"Deduplicated {converted} decisions")
+
+bookings_cli = AppGroup('bookings', help='Booking table maintenance.')
+
+@bookings_cli.command('archive')
+@click.option('--days', type=int, default=None, help='Archive bookings for events more than this many days ago.')
+@click.option('--batch-size', type=int, default=booking_archive.DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches.')
+@click.option('--pause', type=float, default=0.05, show_default=True,
+              help='Seconds to sleep between batches.')
+def archive_bookings_command(days, batch_size, max_batches, pause):
+    """Move settled bookings for long-past events into the archive table"""
+    days = days if days is not None else current_app.config['BOOKING_ARCHIVE_DAYS']
+    archived = booking_archive.apply_booking_retention(
+        days, statuses=current_app.config['BOOKING_ARCHIVE_STATUSES'],
+        batch_size=batch_size, max_batches=max_batches, pause=pause
+    )
+    click.echo(f"Archived {archived} bookings for events more than {days} days ago")
+
+@click.command('sample-data')
+@click.option('--scale', type=click.Choice(list(SCALES)), default='small', show_default=True,
+              help='Preset row counts; the options below override them.')
+@click.option('--customers', type=int, default=None)
+@click.option('--staff', type=int, default=None)
+@click.option('--equipment', type=int, default=None)
+@click.option('--decisions', type=int, default=None)
+@click.option('--seed', type=int, default=42, show_default=True)
+@click.option('--history-days', type=int, default=730, show_default=True)
+@click.option('--today', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Anchor date of the data (default: today); fix it for identical reruns.')
+@click.option('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, show_default=True)
+def sample_data_command(scale, customers, staff, equipment, decisions, seed, history_days, today, chunk_size):
+    """Append a seeded synthetic dataset for development and load testing"""
+    counts = dict(SCALES[scale])
+    for name, value in (('customers', customers), ('staff', staff), ('equipment', equipment),
+                        ('decisions', decisions)):
+        if value is not None:
+            counts[name] = value
+    started = time.perf_counter()
+    inserted = generate_sample_data(
+        **counts, seed=seed, history_days=history_days, today=today.date() if today else None,
+        chunk_size=chunk_size,
+        progress=lambda table, rows: click.echo(f"  {table}: {rows}", err=True)
+    )
+    elapsed = time.perf_counter() - started
+    total = sum(inserted.values())
+    click.echo(f"Inserted {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s): "
+               + ', '.join(f'{table} {rows}' for table, rows in inserted.items()))
+
+campaigns_cli = AppGroup('campaigns', help='Bulk outreach to customer segments.')
+
+@campaigns_cli.command('send')
+@click.option('--content-type', type=click.Choice(list(TEMPLATES)), default=None,
+              help='Template to send (default: what --strategy schedules for today).')
+@click.option('--strategy', type=click.File(), default=None,
+              help='JSON content strategy from the AI CMO, or a decision record holding one.')
+@click.option('--segment', type=click.Choice(SEGMENTS), default='all', show_default=True)
+@click.option('--event-type', default=None, help='Only customers with a booking of this event type.')
+@click.option('--batch-size', type=int, default=None, help='Recipients per page (default: CAMPAIGN_BATCH_SIZE).')
+@click.option('--dry-run', is_flag=True, help='Count and render the messages without queueing them.')
+def send_campaign_command(content_type, strategy, segment, event_type, batch_size, dry_run):
+    """Queue a content type for every customer in a segment; outbox workers send it"""
+    plan = {}
+    if strategy is not None:
+        plan = json.load(strategy)
+        plan = plan.get('decision', plan) if isinstance(plan.get('decision'), dict) else plan
+    if content_type is None:
+        if not plan:
+            raise click.UsageError("Pass --content-type or --strategy")
+        try:
+            content_type = content_type_for(plan, date.today())
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+    started = time.perf_counter()
+    counts = run_campaign(
+        content_type, segment, event_type, hashtags=plan.get('hashtag_strategy') or DEFAULT_HASHTAGS,
+        batch_size=batch_size, dry_run=dry_run,
+        progress=lambda counts: click.echo(f"  queued {counts['queued']}", err=True)
+    )
+    elapsed = time.perf_counter() - started
+    click.echo(f"{'Rendered' if dry_run else 'Queued'} {counts['recipients']} '{content_type}' messages "
+               f"to {segment} in {elapsed:.1f}s")
+
+outbox_cli = AppGroup('outbox', help='Delivery of queued customer communications.')
+
+@outbox_cli.command('work')
+@click.option('--once', is_flag=True, help='Exit once nothing is due instead of polling.')
+def outbox_work_command(once):
+    """Deliver queued communications until interrupted"""
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        # Finish the batch in hand, then exit
+        signal.signal(signum, lambda *_: stop.set())
+    totals = run_worker(
+        stop, once,
+        progress=lambda totals: click.echo(
+            f"  sent {totals['sent']}, retrying {totals['retrying']}, failed {totals['failed']}", err=True
+        )
+    )
+    click.echo(f"Sent {totals['sent']}, retrying {totals['retrying']}, failed {totals['failed']}")
+
+@outbox_cli.command('status')
+def outbox_status_command():
+    """Count queued communications by status"""
+    click.echo(', '.join(f'{status} {count}' for status, count in outbox_counts().items()))
+
+@outbox_cli.command('retry-failed')
+def outbox_retry_failed_command():
+    """Queue messages that ran out of attempts again"""
+    click.echo(f"Requeued {requeue_failed()} communications")
+
+search_cli = AppGroup('search-index', help='Full-text search index maintenance.')
+
+@search_cli.command('rebuild')
+def rebuild_search_index_command():
+    """Re-index every customer, booking and communication"""
+    rebuild_search_index()
+    click.echo("Search index rebuilt")
+
+@search_cli.command('optimize')
+def optimize_search_index_command():
+    """Merge index segments after bulk loads"""
+    optimize_search_index()
+    click.echo("Search index optimized")
+
+@click.command('staff-summary')
+def staff_summary_command():
+    """Recompute the team aggregates from the staff table"""
+    rebuild_staff_summary()
+    db.session.commit()
+    summary = staff_summary()
+    click.echo(f"{summary['active_count']} active staff, {summary['events_completed']} events completed, "
+               f"average score {summary['average_performance']:.1f}")
+
+def register_cli(app):
+    """Attach maintenance commands to ``flask``"""
+    app.cli.add_command(decisions_cli)
+    app.cli.add_command(bookings_cli)
+    app.cli.add_command(campaigns_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(sample_data_command)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(staff_summary_command)
@@ -0,0 +1,94 @@
+from flask import current_app, request
+from typing import Iterable, Iterator, Optional
+import zlib
+
+# zlib window bits selecting the container format for each content coding
+# (HTTP "deflate" is the zlib format, not raw deflate)
+_WBITS = {'gzip': 16 + zlib.MAX_WBITS, 'deflate': zlib.MAX_WBITS}
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best supported coding for the request's Accept-Encoding, gzip on ties"""
+    best, best_quality = None, 0
+    for coding in _WBITS:
+        quality = accept_encodings[coding]
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def _compress_stream(chunks: Iterable[bytes], coding: str, level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[coding])
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            # Sync-flush each chunk so clients see progress as it is produced
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+class Compression:
+    """Gzip/deflate compression of API responses.
+
+    Responses whose mimetype is in ``COMPRESS_MIMETYPES`` and whose body is at
+    least ``COMPRESS_MIN_SIZE`` bytes are compressed at ``COMPRESS_LEVEL``
+    (1-9) in the coding the client prefers. Streamed responses are compressed
+    incrementally, chunk by chunk. Responses that already carry a
+    Content-Encoding (such as precompressed static assets), file responses,
+    partial content and ``Cache-Control: no-transform`` are left alone.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_MIMETYPES', ['application/json'])
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        config = current_app.config
+        if response.mimetype not in config['COMPRESS_MIMETYPES']:
+            return response
+        # The body varies with Accept-Encoding even when this one goes out plain
+        response.vary.add('Accept-Encoding')
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+        ):
+            return response
+
+        coding = choose_encoding(request.accept_encodings)
+        if coding is None:
+            return response
+        level = config['COMPRESS_LEVEL']
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, coding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < config['COMPRESS_MIN_SIZE']:
+                return response
+            compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[coding])
+            response.set_data(compressor.compress(body) + compressor.flush())
+
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{coding}', weak)
+        return response
+
+def init_compression(app):
+    """Compress API responses for clients that accept gzip or deflate"""
+    return Compression(app)
@@ -0,0 +1,158 @@
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from functools import wraps
+from typing import Any, Dict, Optional
+import os
+
+DEFAULT_DATABASE_URL = 'sqlite:///party_favor_autonomous.db'
+
+# Bind key of the engine serving read-only views
+READ_BIND = 'read'
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer; synchronous=NORMAL is durable across application crashes in
+# WAL mode (only an OS crash can lose the last commits); busy_timeout makes
+# writers wait for the lock instead of failing with "database is locked".
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,        # milliseconds
+    'cache_size': -64000,        # negative values are KiB: 64 MB page cache
+    'mmap_size': 268435456,      # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+}
+
+def database_url() -> str:
+    """Database URL from ``DATABASE_URL``, defaulting to the local SQLite file"""
+    url = os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    # Hosting providers still hand out the pre-SQLAlchemy-1.4 scheme
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def read_database_url(url: str) -> Optional[str]:
+    """URL for read-only views, or None to keep them on the primary.
+
+    ``DATABASE_READ_URL`` points at a replica. Without one, a file-backed
+    SQLite database is opened a second time through a separate pool of
+    ``query_only`` connections; in WAL mode these read a consistent snapshot
+    without taking the write lock. In-memory SQLite cannot be shared that way.
+    """
+    read_url = os.environ.get('DATABASE_READ_URL')
+    if read_url:
+        return read_url
+    parsed = make_url(url)
+    if parsed.get_backend_name() == 'sqlite' and parsed.database not in (None, '', ':memory:'):
+        return url
+    return None
+
+def worker_threads() -> int:
+    """Request threads per worker process (``WEB_THREADS``, as passed to gunicorn)"""
+    return max(1, int(os.environ.get('WEB_THREADS', 4)))
+
+def engine_options(url: str, threads: int) -> Dict[str, Any]:
+    """Pool settings sized for ``threads`` concurrent requests per process.
+
+    Pools are per process, so the worker count only matters to the server:
+    each worker needs one connection per request thread, plus a little
+    overflow for the background decision log writer and CLI jobs.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == 'sqlite':
+        if parsed.database in (None, '', ':memory:'):
+            return {}  # in-memory databases live on a single connection
+        return {'pool_size': threads, 'max_overflow': 2, 'pool_timeout': 30}
+
+    return {
+        'pool_size': threads,
+        'max_overflow': max(2, threads // 2),
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+    }
+
+def _apply_pragmas(pragmas: Dict[str, Any]):
+    statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return on_connect
+
+def configure_database(app):
+    """Fill in database settings not given explicitly in the app config.
+
+    Must run before ``db.init_app`` so the pool options reach the engines.
+    """
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', database_url())
+    app.config.setdefault('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    threads = worker_threads()
+
+    options = engine_options(url, threads)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    # None keeps read-only views on the primary
+    read_url = app.config.setdefault('SQLALCHEMY_READ_URI', read_database_url(url))
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    if read_url and READ_BIND not in binds:
+        binds[READ_BIND] = {'url': read_url, **engine_options(read_url, threads)}
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+def install_pragmas(app, db):
+    """Hook ``SQLITE_PRAGMAS`` onto the app's SQLite engines.
+
+    The read engine's connections are additionally made ``query_only``.
+    Must run after ``db.init_app`` and before the first connection is made.
+    """
+    with app.app_context():
+        for key, engine in db.engines.items():
+            if engine.dialect.name != 'sqlite':
+                continue
+            pragmas = dict(app.config['SQLITE_PRAGMAS'])
+            if key == READ_BIND:
+                pragmas['query_only'] = 'ON'
+            if pragmas:
+                event.listen(engine, 'connect', _apply_pragmas(pragmas))
+
+def dispose_engines(app, db):
+    """Close pooled connections so forked worker processes open their own"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+def read_only(view):
+    """Route the view's queries to the read engine when one is configured.
+
+    The view must not write: on SQLite the read connections are
+    ``query_only`` and reject writes, and a replica would not accept them.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+class RoutingSession(Session):
+    """Session that sends the queries of ``read_only`` views to the read engine.
+
+    Everything else, and models with their own bind key, use the usual binds.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('db_read_only'):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None and (mapper is None or not _has_bind_key(mapper)):
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _has_bind_key(mapper) -> bool:
+    return inspect(mapper).local_table.metadata.info.get('bind_key') is not None
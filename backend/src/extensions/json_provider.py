@@ -0,0 +1,139 @@
+from flask.json.provider import DefaultJSONProvider
+from datetime import date, datetime, time
+from typing import Any
+import dataclasses
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Floats orjson formats differently from the stdlib: exponents (1e16, 1e-7
+# where the stdlib writes 1e+16, 1e-07) and 1e-5 <= |x| < 1e-4 (0.00001 where
+# the stdlib writes 1e-05); repr() uses plain decimals exactly for
+# 1e-4 <= |x| < 1e16. A scan of the encoded bytes rules them out cheaply for
+# most bodies; when it finds a look-alike (a digit, 'e', a digit, as in a
+# hash), the payload's floats are checked to tell a real one from text.
+# Matching 'e' first and checking the preceding digit afterwards is an order
+# of magnitude faster than a digit-led pattern.
+_EXPONENT = re.compile(rb'e[-0-9]')
+_SMALL_DECIMAL = b'0.0000'
+
+def _looks_divergent(body: bytes) -> bool:
+    if _SMALL_DECIMAL in body:
+        return True
+    for match in _EXPONENT.finditer(body):
+        if 0x30 <= body[match.start() - 1] <= 0x39:
+            return True
+    return False
+
+_CONTAINERS = (dict, list, tuple)
+
+def _divergent_float(value: float) -> bool:
+    return value != 0 and not 1e-4 <= abs(value) < 1e16
+
+def _has_divergent_float(obj: Any) -> bool:
+    """Whether ``obj`` holds a float orjson would write differently.
+
+    Walks the containers orjson serializes natively and the dataclasses it
+    hands to default(); strings are never inspected.
+    """
+    stack = [obj]
+    pop, push, extend = stack.pop, stack.append, stack.extend
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is dict:
+            extend(value.values())
+        elif kind is list or kind is tuple:
+            extend(value)
+        elif kind is float:
+            if _divergent_float(value):
+                return True
+        elif kind is str or kind is int or kind is bool or value is None:
+            continue
+        elif isinstance(value, float):
+            if _divergent_float(value):
+                return True
+        elif isinstance(value, dict):
+            extend(value.values())
+        elif isinstance(value, _CONTAINERS):
+            extend(value)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            push(dataclasses.asdict(value))
+    return False
+
+def _default(o: Any) -> Any:
+    # ISO 8601 for temporal values, matching what orjson emits natively
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+class JSONProvider(DefaultJSONProvider):
+    """Standard library provider that encodes dates and times as ISO 8601"""
+
+    default = staticmethod(_default)
+
+class OrjsonProvider(JSONProvider):
+    """Provider backed by orjson, producing the same bytes as JSONProvider.
+
+    Responses orjson cannot reproduce exactly (indented debug output,
+    non-ASCII text under ``ensure_ascii``, non-string dict keys, integers
+    beyond 64 bits, very large or very small floats) are handed to the
+    standard library encoder instead. ``dumps()`` keeps the stdlib's spaced
+    separators. The one remaining difference is NaN and infinity, which are
+    not valid JSON: orjson writes them as null.
+    """
+
+    def _options(self) -> int:
+        # Dataclasses go through default() so their keys are sorted like asdict()
+        options = orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def _encode(self, obj: Any, options: int):
+        """orjson output, or None when the stdlib encoder must be used"""
+        try:
+            body = orjson.dumps(obj, default=self.default, option=options)
+        except TypeError:
+            return None
+        if self.ensure_ascii and not body.isascii():
+            return None
+        if _looks_divergent(body) and _has_divergent_float(obj):
+            return None
+        return body
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass  # let the stdlib accept its extensions (NaN, huge ints) or raise
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self._encode(obj, self._options() | orjson.OPT_APPEND_NEWLINE)
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json(app):
+    """Install the fastest available JSON provider.
+
+    ``JSON_PROVIDER`` selects ``orjson`` or ``stdlib``; the default ``auto``
+    uses orjson when it is installed.
+    """
+    choice = app.config.setdefault('JSON_PROVIDER', 'auto')
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+
+    use_orjson = orjson is not None and choice in ('auto', 'orjson')
+    app.json = OrjsonProvider(app) if use_orjson else JSONProvider(app)
+    return app.json
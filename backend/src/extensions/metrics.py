@@ -0,0 +1,119 @@
+from flask import Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Dict, Optional
+import os
+import time
+
+# Under a preforking server set PROMETHEUS_MULTIPROC_DIR so every worker
+# records into shared files and /metrics reports totals across workers
+# (see gunicorn.conf.py)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1, 2, 5, 10, 20, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint',
+    ['endpoint', 'method'], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter('http_requests_total', 'Requests by endpoint and status', ['endpoint', 'method', 'status'])
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements executed per request',
+    ['endpoint'], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_QUERY_TIME = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request',
+    ['endpoint'], buckets=LATENCY_BUCKETS
+)
+QUERIES = Counter('db_queries_total', 'SQL statements executed, including outside requests')
+QUERY_TIME = Counter('db_query_duration_seconds_total', 'Time spent executing SQL statements')
+
+AI_DECISION_LATENCY = Histogram(
+    'ai_decision_duration_seconds', 'AI executive decision latency',
+    ['role', 'source'], buckets=LLM_BUCKETS
+)
+AI_DECISIONS = Counter('ai_decisions_total', 'AI executive decisions by source (llm or fallback)', ['role', 'source'])
+AI_TOKENS = Counter('ai_llm_tokens_total', 'LLM tokens used by AI executives', ['role', 'kind'])
+
+CACHE_LOOKUPS = Counter('cache_lookups_total', 'Cache lookups by cache and result (hit or miss)', ['cache', 'result'])
+
+def record_cache(cache: str, hits: int, misses: int):
+    if hits:
+        CACHE_LOOKUPS.labels(cache, 'hit').inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache, 'miss').inc(misses)
+
+def _record_decision(role: str, seconds: float, source: str, usage: Optional[Dict[str, int]]):
+    AI_DECISION_LATENCY.labels(role, source).observe(seconds)
+    AI_DECISIONS.labels(role, source).inc()
+    if usage:
+        for kind, tokens in usage.items():
+            AI_TOKENS.labels(role, kind).inc(tokens)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    QUERIES.inc()
+    QUERY_TIME.inc(elapsed)
+    if has_request_context():
+        totals = g.get('_metrics_sql')
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += elapsed
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_sql = [0, 0.0]
+
+def _after_request(response):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - started)
+    REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+    queries, seconds = g.pop('_metrics_sql')
+    REQUEST_QUERIES.labels(endpoint).observe(queries)
+    REQUEST_QUERY_TIME.labels(endpoint).observe(seconds)
+    return response
+
+def metrics_view():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+_hooks_installed = False
+
+def init_metrics(app):
+    """Record request, SQL, AI executive and cache metrics and serve /metrics.
+
+    ``METRICS_ENABLED`` (default on) switches all of it off. Each hook does
+    a few counter increments, cheap enough to leave on in production.
+    """
+    global _hooks_installed
+
+    app.config.setdefault('METRICS_ENABLED', os.environ.get('METRICS_ENABLED', '1') != '0')
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    # Process-wide hooks, shared by every app in the process
+    if not _hooks_installed:
+        from src.ai_executives_enhanced import decision_listeners
+
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        decision_listeners.append(_record_decision)
+        _hooks_installed = True
@@ -0,0 +1,135 @@
+from flask import Blueprint, abort, current_app, g, jsonify, request, send_from_directory
+from datetime import datetime
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import re
+import tracemalloc
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Profile-Token'
+MEMORY_HEADER = 'X-Profile-Memory'
+_NAME = re.compile(r'^[\w.-]+\.(?:prof|txt)$')
+
+profiling_bp = Blueprint('profiling', __name__)
+
+def _authorized() -> bool:
+    token = request.headers.get(TOKEN_HEADER)
+    return token is not None and hmac.compare_digest(token, current_app.config['PROFILING_TOKEN'])
+
+def _before_request():
+    if TOKEN_HEADER not in request.headers or not _authorized():
+        return
+    if request.headers.get(MEMORY_HEADER) == '1':
+        g._profile_tracemalloc_started = not tracemalloc.is_tracing()
+        if g._profile_tracemalloc_started:
+            tracemalloc.start(current_app.config['PROFILING_TRACEMALLOC_FRAMES'])
+        g._profile_snapshot = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    g._profiler = profiler
+    profiler.enable()
+
+def _after_request(response):
+    profiler = g.pop('_profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+
+    config = current_app.config
+    endpoint = (request.endpoint or 'unmatched').replace('/', '_')
+    stem = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{endpoint}-{uuid.uuid4().hex[:8]}"
+    directory = config['PROFILING_DIR']
+    os.makedirs(directory, exist_ok=True)
+
+    profiler.dump_stats(os.path.join(directory, stem + '.prof'))
+    report = io.StringIO()
+    report.write(f'{request.method} {request.full_path} -> {response.status_code}\n\n')
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(config['PROFILING_TOP'])
+
+    snapshot = g.pop('_profile_snapshot', None)
+    if snapshot is not None:
+        # tracemalloc is process-wide: concurrent requests show up in the diff
+        after = tracemalloc.take_snapshot()
+        if g.pop('_profile_tracemalloc_started', False):
+            tracemalloc.stop()
+        report.write('\nMemory allocated during the request (top lines):\n')
+        for stat in after.compare_to(snapshot, 'lineno')[:config['PROFILING_TOP']]:
+            report.write(f'{stat}\n')
+
+    with open(os.path.join(directory, stem + '.txt'), 'w') as f:
+        f.write(report.getvalue())
+    _prune(directory, config['PROFILING_KEEP'])
+
+    response.headers['X-Profile-Id'] = stem
+    return response
+
+def _prune(directory: str, keep: int):
+    """Keep the newest ``keep`` profiles"""
+    stems = sorted({name.rsplit('.', 1)[0] for name in os.listdir(directory) if _NAME.match(name)})
+    for stem in stems[:-keep] if keep else stems:
+        for suffix in ('.prof', '.txt'):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+@profiling_bp.route('', methods=['GET'])
+def list_profiles():
+    """List captured request profiles, newest first"""
+    if not _authorized():
+        abort(403)
+    directory = current_app.config['PROFILING_DIR']
+    names = sorted(os.listdir(directory), reverse=True) if os.path.isdir(directory) else []
+    profiles = [
+        {
+            'id': name[:-len('.prof')],
+            'endpoint': name.split('-', 2)[1] if name.count('-') >= 2 else None,
+            'captured_at': datetime.fromtimestamp(os.path.getmtime(os.path.join(directory, name))).isoformat(),
+            'profile': f"{request.base_url}/{name}",
+            'report': f"{request.base_url}/{name[:-len('.prof')]}.txt"
+        }
+        for name in names
+        if name.endswith('.prof')
+    ]
+    return jsonify(profiles), 200
+
+@profiling_bp.route('/<name>', methods=['GET'])
+def get_profile(name):
+    """Download a profile (.prof, for pstats or snakeviz) or its text report (.txt)"""
+    if not _authorized():
+        abort(403)
+    if not _NAME.match(name):
+        abort(404)
+    return send_from_directory(current_app.config['PROFILING_DIR'], name,
+                               mimetype='text/plain' if name.endswith('.txt') else 'application/octet-stream')
+
+def init_profiling(app):
+    """Profile single requests on demand.
+
+    With ``PROFILING_ENABLED`` set, a request carrying ``X-Profile-Token:
+    <PROFILING_TOKEN>`` runs under cProfile (plus a tracemalloc diff when
+    ``X-Profile-Memory: 1`` is sent too). The ``.prof`` dump and a text report
+    land in ``PROFILING_DIR``, the newest ``PROFILING_KEEP`` are kept, and
+    ``/api/admin/profiles`` lists them for the same token. When disabled,
+    nothing is registered at all.
+    """
+    app.config.setdefault('PROFILING_ENABLED', os.environ.get('PROFILING_ENABLED') == '1')
+    app.config.setdefault('PROFILING_TOKEN', os.environ.get('PROFILING_TOKEN'))
+    app.config.setdefault('PROFILING_DIR', os.environ.get('PROFILING_DIR', os.path.join(app.instance_path, 'profiles')))
+    app.config.setdefault('PROFILING_KEEP', 50)
+    app.config.setdefault('PROFILING_TOP', 40)
+    app.config.setdefault('PROFILING_TRACEMALLOC_FRAMES', 1)
+    if not app.config['PROFILING_ENABLED']:
+        return
+    if not app.config['PROFILING_TOKEN']:
+        logger.warning('PROFILING_ENABLED is set without PROFILING_TOKEN; profiling stays off')
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.register_blueprint(profiling_bp, url_prefix='/api/admin/profiles')
@@ -0,0 +1,194 @@
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EXTENSIONS = os.path.join(_SRC, 'extensions')
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'IN \((?:[?]|%\(\w+\)s|:\w+)(?:, (?:[?]|%\(\w+\)s|:\w+))*\)')
+
+def statement_shape(statement: str) -> str:
+    """Statement text with layout and IN-list lengths normalised away"""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', statement).strip())
+
+def _origin() -> Optional[str]:
+    """file:line of the innermost application frame issuing the query"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SRC) and not filename.startswith(_EXTENSIONS):
+            return f'{os.path.relpath(filename, os.path.dirname(_SRC))}:{frame.f_lineno}'
+        frame = frame.f_back
+    return None
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryReport:
+    """Statements executed while a request or capture_queries() block ran"""
+
+    def __init__(self, endpoint: Optional[str] = None):
+        self.endpoint = endpoint
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.origins: Dict[str, str] = {}
+
+    def record(self, statement: str, seconds: float):
+        shape = statement_shape(statement)
+        self.count += 1
+        self.duration += seconds
+        self.shapes[shape] += 1
+        if shape not in self.origins:
+            self.origins[shape] = _origin()
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """SELECT shapes run at least ``threshold`` times: likely N+1 loops"""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= threshold and shape.upper().startswith('SELECT')
+        ]
+
+    def summary(self, threshold: int = 3) -> str:
+        lines = [f'{self.count} statements in {self.duration * 1000:.1f} ms'
+                 + (f' for {self.endpoint}' if self.endpoint else '')]
+        for shape, count in self.repeated(threshold):
+            lines.append(f'  N+1 suspect: {count}x from {self.origins[shape]}: {shape[:200]}')
+        return '\n'.join(lines)
+
+    def assert_budget(self, max_queries: int):
+        if self.count > max_queries:
+            raise QueryBudgetExceeded(f'query budget of {max_queries} exceeded\n{self.summary()}')
+
+# Reports collecting in the current thread, innermost last
+_active = threading.local()
+
+def _reports() -> List[QueryReport]:
+    reports = getattr(_active, 'reports', None)
+    if reports is None:
+        reports = _active.reports = []
+    return reports
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._audit_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    reports = getattr(_active, 'reports', None)
+    if reports:
+        elapsed = time.perf_counter() - context._audit_started
+        for report in reports:
+            report.record(statement, elapsed)
+
+_listening = False
+_listen_lock = threading.Lock()
+
+def _listen():
+    global _listening
+    if _listening:
+        return
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listening = True
+
+@contextmanager
+def capture_queries(endpoint: Optional[str] = None):
+    """Collect the statements run by this thread inside the block.
+
+        with capture_queries() as report:
+            client.get('/api/dashboard')
+        report.assert_budget(6)
+    """
+    _listen()
+    report = QueryReport(endpoint)
+    reports = _reports()
+    reports.append(report)
+    try:
+        yield report
+    finally:
+        reports.remove(report)
+
+def query_budget(max_queries: int):
+    """Declare the most statements a view may run; enforced by the auditor"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_budget = max_queries
+            return view(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+def _enabled() -> bool:
+    # Unset, it follows the app's mode per request: app.run(debug=True) only
+    # turns debug on after create_app has run
+    enabled = current_app.config['QUERY_AUDIT']
+    return current_app.debug or current_app.testing if enabled is None else enabled
+
+def _before_request():
+    if not _enabled():
+        return
+    _listen()
+    report = QueryReport(request.endpoint)
+    _reports().append(report)
+    g._query_report = report
+
+def _after_request(response):
+    report = g.pop('_query_report', None)
+    if report is None:
+        return response
+    _reports().remove(report)
+
+    config = current_app.config
+    response.headers['X-Query-Count'] = str(report.count)
+    if report.repeated(config['QUERY_AUDIT_REPEAT_THRESHOLD']):
+        logger.warning('%s', report.summary(config['QUERY_AUDIT_REPEAT_THRESHOLD']))
+
+    budget = g.get('query_budget')
+    if budget is not None and report.count > budget:
+        message = f'{report.endpoint} exceeded its query budget of {budget}\n{report.summary()}'
+        if config['QUERY_AUDIT_STRICT']:
+            raise QueryBudgetExceeded(message)
+        logger.warning('%s', message)
+    return response
+
+def _teardown_request(exc):
+    # A request that failed before after_request still releases its report
+    report = g.pop('_query_report', None)
+    if report is not None and report in _reports():
+        _reports().remove(report)
+
+def init_query_audit(app):
+    """Audit SQL per request in development and testing.
+
+    Enabled by ``QUERY_AUDIT`` (default: whenever the app is in debug or
+    testing mode, checked per request). Every
+    response gets an ``X-Query-Count`` header; SELECT shapes repeated
+    ``QUERY_AUDIT_REPEAT_THRESHOLD`` times in one request are logged as N+1
+    suspects with the route and the line that issued them; views over their
+    ``query_budget`` fail under ``QUERY_AUDIT_STRICT`` (default: testing)
+    and are logged otherwise.
+    """
+    setting = os.environ.get('QUERY_AUDIT')
+    app.config.setdefault('QUERY_AUDIT', None if setting is None else setting == '1')
+    app.config.setdefault('QUERY_AUDIT_REPEAT_THRESHOLD', 3)
+    app.config.setdefault('QUERY_AUDIT_STRICT', app.testing)
+    if app.config['QUERY_AUDIT'] is False:
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,129 @@
+from flask import abort, current_app, request, send_file
+from datetime import datetime, timezone
+from typing import Dict, Optional
+import gzip
+import hashlib
+import mimetypes
+import os
+
+INDEX = 'index.html'
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+# Files up to this size are held in memory, larger ones are sent from disk
+MEMORY_LIMIT = 1024 * 1024
+# Text-like files at least this big get a gzip variant built at startup
+GZIP_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = (
+    'application/javascript', 'application/json', 'application/manifest+json',
+    'application/wasm', 'application/xml', 'image/svg+xml', 'text/',
+)
+
+class Asset:
+    """One file in the static folder, with its precompressed gzip variant"""
+
+    __slots__ = ('path', 'filename', 'mimetype', 'size', 'last_modified', 'etag',
+                 'immutable', 'data', 'gzip_data', 'gzip_filename')
+
+    def __init__(self, path: str, filename: str, immutable: bool):
+        stat = os.stat(filename)
+        self.path = path
+        self.filename = filename
+        mimetype, encoding = mimetypes.guess_type(path)
+        # A .gz file requested directly is served as the archive it is
+        self.mimetype = 'application/gzip' if encoding == 'gzip' else mimetype or 'application/octet-stream'
+        self.size = stat.st_size
+        self.last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+        self.immutable = immutable
+        self.data = None
+        self.gzip_data = None
+        self.gzip_filename = None
+
+        if self.size <= MEMORY_LIMIT:
+            with open(filename, 'rb') as f:
+                self.data = f.read()
+            digest = hashlib.blake2b(self.data, digest_size=8).hexdigest()
+        else:
+            digest = f'{stat.st_mtime_ns:x}-{self.size:x}'
+        self.etag = digest
+
+        if os.path.isfile(filename + '.gz'):
+            if os.path.getsize(filename + '.gz') <= MEMORY_LIMIT:
+                with open(filename + '.gz', 'rb') as f:
+                    self.gzip_data = f.read()
+            else:
+                self.gzip_filename = filename + '.gz'
+        elif self.data is not None and self.size >= GZIP_MIN_SIZE and self.mimetype.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(self.data, compresslevel=9, mtime=0)
+            if len(compressed) < self.size:
+                self.gzip_data = compressed
+
+class StaticAssets:
+    """Serves the built frontend from a manifest made once at startup.
+
+    Requests are answered from the manifest, so there is no filesystem
+    lookup per request: unknown paths get the in-memory ``index.html``
+    (the SPA fallback). Gzip variants, either ``.gz`` files shipped next to
+    the originals or compressed at startup, are chosen from
+    ``Accept-Encoding``. Files under the ``STATIC_IMMUTABLE_PREFIXES``
+    (Vite's content-hashed ``assets/`` by default) are cached for a year;
+    everything else is revalidated with its ETag. The manifest reflects the
+    folder at startup: restart after rebuilding the frontend.
+    """
+
+    def __init__(self, app=None):
+        self.assets: Dict[str, Asset] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STATIC_IMMUTABLE_PREFIXES', ('assets/',))
+        self.build(app.static_folder, tuple(app.config['STATIC_IMMUTABLE_PREFIXES']))
+        app.extensions['static_assets'] = self
+
+        app.add_url_rule('/', 'serve', self.serve, defaults={'path': ''})
+        app.add_url_rule('/<path:path>', 'serve', self.serve)
+
+    def build(self, folder: Optional[str], immutable_prefixes=()):
+        assets = {}
+        if folder and os.path.isdir(folder):
+            for root, _, files in os.walk(folder):
+                for name in files:
+                    filename = os.path.join(root, name)
+                    path = os.path.relpath(filename, folder).replace(os.sep, '/')
+                    assets[path] = Asset(path, filename, path.startswith(immutable_prefixes))
+        self.assets = assets
+
+    def serve(self, path: str):
+        asset = self.assets.get(path) or self.assets.get(INDEX)
+        if asset is None:
+            abort(404)
+        return self.response(asset)
+
+    def response(self, asset: Asset):
+        use_gzip = (
+            (asset.gzip_data is not None or asset.gzip_filename is not None)
+            and request.accept_encodings['gzip'] > 0
+        )
+        if use_gzip and asset.gzip_data is not None:
+            response = current_app.response_class(asset.gzip_data, mimetype=asset.mimetype)
+        elif use_gzip:
+            response = send_file(asset.gzip_filename, mimetype=asset.mimetype, etag=False, max_age=None)
+        elif asset.data is not None:
+            response = current_app.response_class(asset.data, mimetype=asset.mimetype)
+        else:
+            response = send_file(asset.filename, mimetype=asset.mimetype, etag=False, max_age=None)
+
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        if asset.gzip_data is not None or asset.gzip_filename is not None:
+            response.vary.add('Accept-Encoding')
+        # Each encoding is a different representation with its own validator
+        response.set_etag(asset.etag + ('-gzip' if use_gzip else ''))
+        response.last_modified = asset.last_modified
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE if asset.immutable else REVALIDATE_CACHE
+        return response.make_conditional(request)
+
+def init_static(app):
+    """Serve ``app.static_folder`` and the SPA fallback through StaticAssets"""
+    return StaticAssets(app)
@@ -6,11 +6,30 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from src.models.business import db
+from src.models.schema import ensure_schema
 from src.routes.user import user_bp
 from src.routes.customer import customer_bp
 from src.routes.business import business_bp
+from src.cli import register_cli
+from src.services.decision_log import decision_log
+from src.services.executive_state import init_executive_state
+from src.services.search_index import ensure_search_index
+from src.services.pricing import init_pricing
+from src.services.staff_stats import ensure_staff_summary
+from src.services.maintenance import ensure_maintenance_schedule
+from src.services.booking_archive import ensure_booking_history
+from src.services.mail import init_mail
+from src.services.campaigns import init_campaigns
+from src.services.outbox import init_outbox
+from src.extensions.json_provider import init_json
+from src.extensions.database import configure_database, install_pragmas
+from src.extensions.static_assets import init_static
+from src.extensions.compression import init_compression
+from src.extensions.metrics import init_metrics
+from src.extensions.query_audit import init_query_audit
+from src.extensions.profiling import init_profiling
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
     
     # Enable CORS for frontend communication
@@ -23,21 +42,44 @@ def create_app():
     app.register_blueprint(customer_bp, url_prefix='/api')
     app.register_blueprint(business_bp, url_prefix='/api')
 
-    # Enable database functionality for autonomous CMS
-    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///party_favor_autonomous.db"
+    # Enable database functionality for autonomous CMS (DATABASE_URL overrides the SQLite file)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DECISION_RETENTION_DAYS'] = int(os.environ.get('DECISION_RETENTION_DAYS', 90))
+    app.config['BOOKING_ARCHIVE_DAYS'] = int(os.environ.get('BOOKING_ARCHIVE_DAYS', 365))
+    app.config['BOOKING_ARCHIVE_STATUSES'] = os.environ.get(
+        'BOOKING_ARCHIVE_STATUSES', 'completed,cancelled,inquiry'
+    ).split(',')
+    app.config['SAMPLE_DATA_REQUEST_LIMIT'] = 50_000
+    app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+    if config:
+        app.config.update(config)
+    init_json(app)
+    init_profiling(app)  # first in, last out: its profile spans every other hook
+    init_metrics(app)
+    init_query_audit(app)
+    init_compression(app)
+    configure_database(app)
     db.init_app(app)
+    install_pragmas(app, db)
+    decision_log.init_app(app)
     
     with app.app_context():
-        db.create_all()
-
-    @app.route('/', defaults={'path': ''})
-    @app.route('/<path:path>')
-    def serve(path):
-        if path != "" and os.path.exists(app.static_folder + '/' + path):
-            return send_from_directory(app.static_folder, path)
-        else:
-            return send_from_directory(app.static_folder, 'index.html')
+        db.create_all(bind_key=None)  # the schema lives on the primary; other binds only read it
+        ensure_schema()
+        ensure_booking_history()
+        app.extensions['search_index'] = ensure_search_index()
+        ensure_staff_summary()
+        ensure_maintenance_schedule()
+    init_executive_state(app)
+    init_pricing(app)
+    init_mail(app)
+    init_campaigns(app)
+    init_outbox(app)
+
+    register_cli(app)
+
+    # Frontend assets and the SPA fallback, served from a startup manifest
+    init_static(app)
 
     @app.route('/health')
     def health_check():
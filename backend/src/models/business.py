@@ -1,8 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from src.extensions.database import RoutingSession
 from datetime import datetime
 import json
+import zlib
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class Customer(db.Model):
     """Customer information and contact details"""
@@ -31,10 +33,15 @@ class Customer(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# Statuses of bookings that are going ahead or have taken place: they count
+# as booked revenue and demand. Completing a booking must not drop it.
+BOOKED_STATUSES = ('confirmed', 'completed')
+
 class Booking(db.Model):
     """Event booking details and status tracking"""
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customer.id'), nullable=False)
+    equipment_id = db.Column(db.Integer, db.ForeignKey('equipment.id'), nullable=True)  # booth unit, set on confirmation
     event_type = db.Column(db.String(50), nullable=False)  # wedding, corporate, birthday, etc.
     event_date = db.Column(db.Date, nullable=False)
     event_time = db.Column(db.Time, nullable=True)
@@ -49,11 +56,36 @@ class Booking(db.Model):
     status = db.Column(db.String(20), default='inquiry')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     confirmed_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Time-series analytics: bucket by created_at / event_date without table lookups
+        db.Index('ix_booking_created_at_status_event_type', 'created_at', 'status', 'event_type'),
+        db.Index('ix_booking_event_date_status', 'event_date', 'status'),
+        # Booking search: the (event_date, id) keyset, alone or after an equality prefix
+        db.Index('ix_booking_event_date', 'event_date'),
+        db.Index('ix_booking_status_event_date', 'status', 'event_date'),
+        db.Index('ix_booking_event_type_event_date', 'event_type', 'event_date'),
+        db.Index('ix_booking_venue_event_date', 'venue', 'event_date'),
+        db.Index('ix_booking_customer_id_event_date', 'customer_id', 'event_date'),
+        # Booth assignments: one event per unit and day, the units taken on a
+        # date, a unit's bookings. Partial, as most bookings have no unit.
+        db.Index('uq_booking_event_date_equipment_id', 'event_date', 'equipment_id', unique=True,
+                 sqlite_where=db.text('equipment_id IS NOT NULL'),
+                 postgresql_where=db.text('equipment_id IS NOT NULL')),
+        db.Index('ix_booking_equipment_id_event_date', 'equipment_id', 'event_date',
+                 sqlite_where=db.text('equipment_id IS NOT NULL'),
+                 postgresql_where=db.text('equipment_id IS NOT NULL')),
+        # Never reuse the id of an archived booking: without AUTOINCREMENT,
+        # SQLite hands out the highest id again once that row has moved out
+        {'sqlite_autoincrement': True},
+    )
 
     def to_dict(self):
         return {
             'id': self.id,
             'customer_id': self.customer_id,
+            'equipment_id': self.equipment_id,
             'event_type': self.event_type,
             'event_date': self.event_date.isoformat() if self.event_date else None,
             'event_time': self.event_time.isoformat() if self.event_time else None,
@@ -70,14 +102,61 @@ class Booking(db.Model):
             'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None
         }
 
+class BookingArchive(db.Model):
+    """Cold storage for bookings whose events are long past; same columns as Booking"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    customer_id = db.Column(db.Integer, nullable=False)
+    equipment_id = db.Column(db.Integer, nullable=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    event_date = db.Column(db.Date, nullable=False)
+    event_time = db.Column(db.Time, nullable=True)
+    duration_hours = db.Column(db.Integer, nullable=False)
+    venue = db.Column(db.String(200), nullable=True)
+    guest_count = db.Column(db.Integer, nullable=True)
+    backdrop_color = db.Column(db.String(50), nullable=True)
+    photo_layout = db.Column(db.String(20), nullable=True)
+    special_requests = db.Column(db.Text, nullable=True)
+    base_price = db.Column(db.Float, nullable=False)
+    final_price = db.Column(db.Float, nullable=True)
+    status = db.Column(db.String(20), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    confirmed_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # The hot table's search and analytics indexes, so history reads
+        # stay index range scans on both sides of the union
+        db.Index('ix_booking_archive_created_at_status_event_type', 'created_at', 'status', 'event_type'),
+        db.Index('ix_booking_archive_event_date_status', 'event_date', 'status'),
+        db.Index('ix_booking_archive_event_date', 'event_date'),
+        db.Index('ix_booking_archive_status_event_date', 'status', 'event_date'),
+        db.Index('ix_booking_archive_event_type_event_date', 'event_type', 'event_date'),
+        db.Index('ix_booking_archive_venue_event_date', 'venue', 'event_date'),
+        db.Index('ix_booking_archive_customer_id_event_date', 'customer_id', 'event_date'),
+    )
+
 class Communication(db.Model):
     """Communication log for tracking all customer interactions"""
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customer.id'), nullable=False)
-    booking_id = db.Column(db.Integer, db.ForeignKey('booking.id'), nullable=True)
+    # No foreign key: archiving moves the booking to booking_archive, id and all
+    booking_id = db.Column(db.Integer, nullable=True)
     message_type = db.Column(db.String(20), nullable=False)
     content = db.Column(db.Text, nullable=True)
-    sent_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)  # set on delivery
+    # Outbox delivery; rows without a status were only recorded, never queued
+    recipient = db.Column(db.String(120), nullable=True)
+    subject = db.Column(db.String(200), nullable=True)
+    status = db.Column(db.String(20), nullable=True)  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)  # retry time, or lease expiry while sending
+    last_error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (
+        # Outbox workers claim due rows by (status, next_attempt_at)
+        db.Index('ix_communication_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
 
     def to_dict(self):
         return {
@@ -86,7 +165,9 @@ class Communication(db.Model):
             'booking_id': self.booking_id,
             'message_type': self.message_type,
             'content': self.content,
-            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'status': self.status,
+            'attempts': self.attempts
         }
 
 class AIExecutiveDecision(db.Model):
@@ -94,22 +175,84 @@ class AIExecutiveDecision(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     executive_role = db.Column(db.String(20), nullable=False)
     decision_type = db.Column(db.String(50), nullable=False)
-    context = db.Column(db.Text, nullable=True)
-    decision = db.Column(db.Text, nullable=True)
+    context = db.Column(db.Text, nullable=True)  # legacy inline JSON, superseded by context_hash
+    decision = db.Column(db.Text, nullable=True)  # legacy inline JSON, superseded by decision_hash
+    context_hash = db.Column(db.String(32), nullable=True)
+    decision_hash = db.Column(db.String(32), nullable=True)
     impact_level = db.Column(db.String(20), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Listing, keyset pagination, analytics and retention all range over created_at
+        db.Index('ix_ai_executive_decision_created_at', 'created_at'),
+        db.Index('ix_ai_executive_decision_role_created_at', 'executive_role', 'created_at'),
+        db.Index('ix_ai_executive_decision_type_created_at', 'decision_type', 'created_at'),
+    )
+
     def to_dict(self):
+        from src.services.payload_store import load_payloads
+
+        payloads = load_payloads([self.context_hash, self.decision_hash])
+        context = self.context or payloads.get(self.context_hash)
+        decision = self.decision or payloads.get(self.decision_hash)
         return {
             'id': self.id,
             'executive_role': self.executive_role,
             'decision_type': self.decision_type,
-            'context': json.loads(self.context) if self.context else None,
-            'decision': json.loads(self.decision) if self.decision else None,
+            'context': json.loads(context) if context else None,
+            'decision': json.loads(decision) if decision else None,
             'impact_level': self.impact_level,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class AIExecutiveCounter(db.Model):
+    """Decision counts per AI executive, shared by all worker processes"""
+    executive_role = db.Column(db.String(20), primary_key=True)
+    decisions_made = db.Column(db.Integer, nullable=False, default=0)
+    last_decision_at = db.Column(db.DateTime, nullable=True)
+
+class DecisionPayload(db.Model):
+    """Content-addressed store of compressed decision context/decision JSON"""
+    hash = db.Column(db.String(32), primary_key=True)  # blake2b-128 of the canonical JSON text
+    data = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed JSON text
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class AIExecutiveDecisionArchive(db.Model):
+    """Compacted cold storage for AI executive decisions past the retention window"""
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    executive_role = db.Column(db.String(20), nullable=False)
+    decision_type = db.Column(db.String(50), nullable=False)
+    impact_level = db.Column(db.String(20), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    context_hash = db.Column(db.String(32), nullable=True)
+    decision_hash = db.Column(db.String(32), nullable=True)
+    payload = db.Column(db.LargeBinary, nullable=True)  # zlib-compressed JSON [context, decision] of legacy rows
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_ai_executive_decision_archive_created_at', 'created_at'),
+    )
+
+    def to_dict(self):
+        if self.payload is not None:
+            context, decision = json.loads(zlib.decompress(self.payload))
+        else:
+            from src.services.payload_store import load_payloads
+
+            payloads = load_payloads([self.context_hash, self.decision_hash])
+            context = json.loads(payloads[self.context_hash]) if self.context_hash else None
+            decision = json.loads(payloads[self.decision_hash]) if self.decision_hash else None
+        return {
+            'id': self.id,
+            'executive_role': self.executive_role,
+            'decision_type': self.decision_type,
+            'context': context,
+            'decision': decision,
+            'impact_level': self.impact_level,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
+
 class BusinessMetrics(db.Model):
     """Store business performance metrics"""
     id = db.Column(db.Integer, primary_key=True)
@@ -120,6 +263,10 @@ class BusinessMetrics(db.Model):
     average_performance = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_business_metrics_date', 'date'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -158,6 +305,16 @@ class StaffMember(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class StaffSummary(db.Model):
+    """Team aggregates over active staff, a single row kept in step with every staff change"""
+    id = db.Column(db.Integer, primary_key=True)
+    active_count = db.Column(db.Integer, nullable=False, default=0)
+    score_total = db.Column(db.Float, nullable=False, default=0.0)
+    weight_total = db.Column(db.Float, nullable=False, default=0.0)  # sum of performance_score * events_completed
+    events_completed = db.Column(db.Integer, nullable=False, default=0)
+    compensation_total = db.Column(db.Float, nullable=False, default=0.0)  # base salaries plus profit shares
+    updated_at = db.Column(db.DateTime, nullable=True)
+
 class Equipment(db.Model):
     """Equipment inventory and maintenance tracking"""
     id = db.Column(db.Integer, primary_key=True)
@@ -165,10 +322,19 @@ class Equipment(db.Model):
     type = db.Column(db.String(50), nullable=False)
     status = db.Column(db.String(20), default='active')
     purchase_date = db.Column(db.Date, nullable=True)
+    location = db.Column(db.String(100), nullable=True)
     last_maintenance = db.Column(db.Date, nullable=True)
     next_maintenance = db.Column(db.Date, nullable=True)
+    usage_count = db.Column(db.Integer, nullable=True, default=0)  # confirmed bookings since last maintenance
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Maintenance queue: units by due date, overall, per location and per type
+        db.Index('ix_equipment_status_next_maintenance', 'status', 'next_maintenance'),
+        db.Index('ix_equipment_location_status_next_maintenance', 'location', 'status', 'next_maintenance'),
+        db.Index('ix_equipment_type_status_next_maintenance', 'type', 'status', 'next_maintenance'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -178,6 +344,8 @@ class Equipment(db.Model):
             'purchase_date': self.purchase_date.isoformat() if self.purchase_date else None,
             'last_maintenance': self.last_maintenance.isoformat() if self.last_maintenance else None,
             'next_maintenance': self.next_maintenance.isoformat() if self.next_maintenance else None,
+            'location': self.location,
+            'usage_count': self.usage_count,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
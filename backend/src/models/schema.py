@@ -0,0 +1,72 @@
+from src.models.business import db
+from sqlalchemy.schema import CreateColumn
+
+def ensure_schema():
+    """Bring an existing database up to date with the declared models.
+
+    ``db.create_all()`` only creates tables that are missing, so nullable
+    columns and indexes declared later on tables that already exist would
+    never be added. Foreign keys the models no longer declare are dropped
+    (SQLite does not enforce them, so there they are left in place). On
+    SQLite, tables declared with ``sqlite_autoincrement`` that were created
+    without it are rebuilt with it.
+    """
+    engine = db.engine
+    inspector = db.inspect(engine)
+
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN {ddl}')
+
+            if engine.dialect.name != 'sqlite':
+                _drop_undeclared_foreign_keys(connection, inspector, table)
+
+        if engine.dialect.name == 'sqlite':
+            for table in db.metadata.sorted_tables:
+                if table.dialect_options['sqlite']['autoincrement'] and inspector.has_table(table.name):
+                    _ensure_autoincrement(connection, table)
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def _ensure_autoincrement(connection, table):
+    """SQLite cannot add AUTOINCREMENT to a table, so copy it into a new one that has it.
+
+    The table's indexes are recreated with it; its triggers are dropped and
+    left to whoever owns them to recreate at startup (the search index does).
+    """
+    sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+    ).scalar()
+    if 'AUTOINCREMENT' in sql.upper():
+        return
+
+    old = f'{table.name}_without_autoincrement'
+    columns = ', '.join(f'"{column.name}"' for column in table.columns)
+    dependents = connection.exec_driver_sql(
+        "SELECT type, name FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table.name,)
+    ).all()
+    for kind, name in dependents:
+        connection.exec_driver_sql(f'DROP {kind.upper()} "{name}"')
+    # Legacy mode leaves views that name the table alone instead of pointing them at the old copy
+    connection.exec_driver_sql('PRAGMA legacy_alter_table = ON')
+    connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old}"')
+    connection.exec_driver_sql('PRAGMA legacy_alter_table = OFF')
+    table.create(connection)
+    connection.exec_driver_sql(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old}"')
+    connection.exec_driver_sql(f'DROP TABLE "{old}"')
+
+def _drop_undeclared_foreign_keys(connection, inspector, table):
+    declared = {tuple(key.column_keys) for key in table.foreign_key_constraints}
+    for key in inspector.get_foreign_keys(table.name):
+        if key.get('name') and tuple(key['constrained_columns']) not in declared:
+            connection.exec_driver_sql(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{key["name"]}"')
@@ -1,34 +1,36 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, abort, current_app, request, jsonify, stream_with_context
 from src.models.business import db, BusinessMetrics, StaffMember, Equipment, AIExecutiveDecision
 from src.ai_executives_enhanced import get_ai_team
+from src.services.decision_log import decision_log
+from src.services.timeseries import build_timeseries
+from src.services.decision_feed import FILTER_FIELDS, decode_cursor, decision_page, stream_decisions
+from src.services.serializers import STAFF_LIST, EQUIPMENT_LIST
+from src.services.sample_data import generate_sample_data, SCALES
+from src.services.pricing import BASE_PRICES, quote_table
+from src.services.staff_stats import distribute, staff_added, staff_summary
+from src.services.maintenance import (
+    complete_maintenance, due_for_maintenance, register_unit, start_maintenance, upcoming_bookings
+)
+from src.extensions.database import read_only
+from src.extensions.query_audit import query_budget
 from datetime import datetime, timedelta
-import json
+import hmac
 
 business_bp = Blueprint('business', __name__)
 
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+def _admin_authorized() -> bool:
+    # One secret can guard every admin route: without ADMIN_TOKEN the profiling token is used
+    expected = current_app.config.get('ADMIN_TOKEN') or current_app.config.get('PROFILING_TOKEN')
+    token = request.headers.get(ADMIN_TOKEN_HEADER)
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
 @business_bp.route('/staff', methods=['GET'])
 def get_staff():
     """Get all staff members with their compensation details"""
     try:
-        staff_members = StaffMember.query.all()
-        result = []
-        
-        for staff in staff_members:
-            staff_data = {
-                'id': staff.id,
-                'name': staff.name,
-                'role': staff.role,
-                'status': staff.status,
-                'base_salary': float(staff.base_salary),
-                'profit_share': float(staff.profit_share),
-                'performance_score': staff.performance_score,
-                'events_completed': staff.events_completed,
-                'hire_date': staff.hire_date.isoformat(),
-                'total_compensation': float(staff.base_salary + staff.profit_share)
-            }
-            result.append(staff_data)
-        
-        return jsonify(result), 200
+        return jsonify(STAFF_LIST.all(order_by=StaffMember.id)), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -57,6 +59,7 @@ def add_staff_member():
         )
         
         db.session.add(staff)
+        staff_added(staff)
         db.session.commit()
         
         # Get AI CEO decision on compensation structure
@@ -74,15 +77,7 @@ def add_staff_member():
         ceo_decision = ai_team.get_executive_decision('AI_CEO', compensation_context)
         
         # Log AI decision
-        ai_decision = AIExecutiveDecision(
-            executive_role=ceo_decision['executive'],
-            decision_type=ceo_decision['context']['type'],
-            context=json.dumps(ceo_decision['context']),
-            decision=json.dumps(ceo_decision['decision']),
-            impact_level=ceo_decision['decision'].get('impact_level', 'Medium'),
-            created_at=datetime.strptime(ceo_decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-        )
-        db.session.add(ai_decision)
+        decision_log.record(ceo_decision)
         db.session.commit()
         
         return jsonify({
@@ -106,77 +101,42 @@ def distribute_profits():
         if total_profit <= 0:
             return jsonify({'error': 'Total profit must be greater than 0'}), 400
         
+        # Team aggregates come from the staff summary row
+        team = staff_summary()
+        if not team['active_count']:
+            return jsonify({'error': 'No active staff to distribute to'}), 400
+        
         # Get AI CEO decision on profit distribution
         ai_team = get_ai_team()
         
-        # Get all active staff members
-        staff_members = StaffMember.query.filter_by(status='active').all()
-        
         distribution_context = {
             'type': 'profit_distribution',
             'total_profit': total_profit,
-            'staff_count': len(staff_members),
-            'staff_performance': [
-                {
-                    'id': staff.id,
-                    'name': staff.name,
-                    'role': staff.role,
-                    'performance_score': staff.performance_score,
-                    'events_completed': staff.events_completed
-                }
-                for staff in staff_members
-            ]
+            'staff_count': team['active_count'],
+            'average_performance': team['average_performance'],
+            'events_completed': team['events_completed']
         }
         
         ceo_decision = ai_team.get_executive_decision('AI_CEO', distribution_context)
         
-        # Calculate distribution (70% to wage earners as per model)
+        # Calculate distribution (70% to wage earners as per model), weighted
+        # by performance score x events completed
         wage_earner_share = total_profit * 0.70
-        total_performance_points = sum(staff.performance_score * staff.events_completed for staff in staff_members)
-        
-        distributions = []
-        
-        for staff in staff_members:
-            if total_performance_points > 0:
-                performance_weight = (staff.performance_score * staff.events_completed) / total_performance_points
-                individual_share = wage_earner_share * performance_weight
-            else:
-                # Equal distribution if no performance data
-                individual_share = wage_earner_share / len(staff_members)
-            
-            # Update staff profit share
-            staff.profit_share += individual_share
-            
-            distributions.append({
-                'staff_id': staff.id,
-                'name': staff.name,
-                'role': staff.role,
-                'amount': float(individual_share),
-                'performance_score': staff.performance_score,
-                'events_completed': staff.events_completed
-            })
+        distributions = distribute(wage_earner_share)
         
         # Create business metrics record
         metrics = BusinessMetrics(
             date=datetime.now().date(),
             total_revenue=total_profit,
             profit_distributed=wage_earner_share,
-            staff_count=len(staff_members),
-            average_performance=sum(staff.performance_score for staff in staff_members) / len(staff_members),
+            staff_count=team['active_count'],
+            average_performance=team['average_performance'],
             created_at=datetime.now()
         )
         db.session.add(metrics)
         
         # Log AI decision
-        ai_decision = AIExecutiveDecision(
-            executive_role=ceo_decision['executive'],
-            decision_type=ceo_decision['context']['type'],
-            context=json.dumps(ceo_decision['context']),
-            decision=json.dumps(ceo_decision['decision']),
-            impact_level=ceo_decision['decision'].get('impact_level', 'High'),
-            created_at=datetime.strptime(ceo_decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-        )
-        db.session.add(ai_decision)
+        decision_log.record(ceo_decision, default_impact='High')
         
         db.session.commit()
         
@@ -219,39 +179,26 @@ def optimize_pricing():
         
         cmo_decision = ai_team.get_executive_decision('AI_CMO', pricing_context)
         
-        # Generate pricing recommendations
-        base_prices = {2: 498, 3: 747, 4: 996, 5: 1245}
-        
-        # AI may suggest adjustments (simplified logic)
-        adjustment_factor = 1.0
-        if 'increase' in cmo_decision['decision'].get('decision', '').lower():
-            adjustment_factor = 1.15  # 15% increase
-        elif 'decrease' in cmo_decision['decision'].get('decision', '').lower():
-            adjustment_factor = 0.95  # 5% decrease
+        # Recompute demand from booking history; quotes use the new table from now on
+        table = quote_table(refresh=True)
+        adjustment_factor = table.average_multiplier()
         
         optimized_prices = {
-            duration: int(price * adjustment_factor)
-            for duration, price in base_prices.items()
+            duration: round(price * adjustment_factor)
+            for duration, price in BASE_PRICES.items()
         }
         
         # Log AI decision
-        ai_decision = AIExecutiveDecision(
-            executive_role=cmo_decision['executive'],
-            decision_type=cmo_decision['context']['type'],
-            context=json.dumps(cmo_decision['context']),
-            decision=json.dumps(cmo_decision['decision']),
-            impact_level=cmo_decision['decision'].get('impact_level', 'High'),
-            created_at=datetime.strptime(cmo_decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-        )
-        db.session.add(ai_decision)
+        decision_log.record(cmo_decision, default_impact='High')
         db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Pricing optimization completed',
-            'original_prices': base_prices,
+            'original_prices': BASE_PRICES,
             'optimized_prices': optimized_prices,
             'adjustment_factor': adjustment_factor,
+            'demand_multipliers': table.summary(),
             'ai_decision': cmo_decision
         }), 200
         
@@ -272,34 +219,47 @@ def get_ai_executives_status():
         return jsonify({'error': str(e)}), 500
 
 @business_bp.route('/ai-decisions', methods=['GET'])
+@read_only
 def get_ai_decisions():
-    """Get recent AI executive decisions"""
+    """Get recent AI executive decisions, newest first.
+
+    Pages are keyset-paginated: pass the ``X-Next-Cursor`` response header
+    back as ``cursor`` to fetch the next page. ``stream=1`` exports every
+    matching decision as a single streamed JSON array.
+    """
     try:
         limit = request.args.get('limit', 20, type=int)
-        
-        decisions = AIExecutiveDecision.query.order_by(
-            AIExecutiveDecision.created_at.desc()
-        ).limit(limit).all()
-        
-        result = []
-        for decision in decisions:
-            decision_data = {
-                'id': decision.id,
-                'executive_role': decision.executive_role,
-                'decision_type': decision.decision_type,
-                'context': json.loads(decision.context),
-                'decision': json.loads(decision.decision),
-                'impact_level': decision.impact_level,
-                'created_at': decision.created_at.isoformat()
-            }
-            result.append(decision_data)
-        
-        return jsonify(result), 200
+        cursor = request.args.get('cursor')
+        filters = {
+            field: request.args[field]
+            for field in FILTER_FIELDS
+            if request.args.get(field)
+        }
+
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            stream_limit = request.args.get('limit', type=int)
+            return Response(
+                stream_with_context(stream_decisions(filters, cursor, stream_limit)),
+                mimetype='application/json'
+            )
+
+        body, next_cursor = decision_page(filters, cursor, limit)
+        response = Response(body, status=200, mimetype='application/json')
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @business_bp.route('/analytics', methods=['GET'])
+@read_only
 def get_business_analytics():
     """Get comprehensive business analytics"""
     try:
@@ -318,8 +278,7 @@ def get_business_analytics():
         total_distributed = sum(metric.profit_distributed for metric in metrics)
         
         # Get staff analytics
-        staff_members = StaffMember.query.filter_by(status='active').all()
-        total_staff_compensation = sum(staff.base_salary + staff.profit_share for staff in staff_members)
+        team = staff_summary()
         
         # Get AI decision analytics
         ai_decisions_count = AIExecutiveDecision.query.filter(
@@ -335,12 +294,12 @@ def get_business_analytics():
                 'total_revenue': float(total_revenue),
                 'total_profit_distributed': float(total_distributed),
                 'wage_earner_percentage': (total_distributed / total_revenue * 100) if total_revenue > 0 else 0,
-                'total_staff_compensation': float(total_staff_compensation)
+                'total_staff_compensation': float(team['compensation_total'])
             },
             'operational': {
-                'active_staff_count': len(staff_members),
-                'average_performance': sum(staff.performance_score for staff in staff_members) / len(staff_members) if staff_members else 0,
-                'total_events_completed': sum(staff.events_completed for staff in staff_members)
+                'active_staff_count': team['active_count'],
+                'average_performance': team['average_performance'],
+                'total_events_completed': team['events_completed']
             },
             'ai_governance': {
                 'decisions_made': ai_decisions_count,
@@ -354,114 +313,174 @@ def get_business_analytics():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@business_bp.route('/analytics/timeseries', methods=['GET'])
+@read_only
+def get_business_timeseries():
+    """Get revenue, booking and AI decision series bucketed by day, week or month.
+
+    Archived bookings are only counted with ``history=1``.
+    """
+    try:
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=30)
+
+        try:
+            if request.args.get('end_date'):
+                end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date()
+            if request.args.get('start_date'):
+                start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Dates must use the YYYY-MM-DD format'}), 400
+
+        bucket = request.args.get('bucket', 'day')
+        series = [name for name in request.args.get('series', '').split(',') if name]
+        history = request.args.get('history', '0').lower() in ('1', 'true')
+
+        try:
+            timeseries = build_timeseries(start_date, end_date, bucket, series, history)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify(timeseries), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @business_bp.route('/equipment', methods=['GET'])
 def get_equipment():
     """Get all equipment inventory"""
     try:
-        equipment = Equipment.query.all()
-        result = []
-        
-        for item in equipment:
-            equipment_data = {
-                'id': item.id,
-                'name': item.name,
-                'type': item.type,
-                'status': item.status,
-                'purchase_date': item.purchase_date.isoformat() if item.purchase_date else None,
-                'last_maintenance': item.last_maintenance.isoformat() if item.last_maintenance else None,
-                'next_maintenance': item.next_maintenance.isoformat() if item.next_maintenance else None
-            }
-            result.append(equipment_data)
-        
-        return jsonify(result), 200
+        return jsonify(EQUIPMENT_LIST.all(order_by=Equipment.id)), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@business_bp.route('/initialize-sample-data', methods=['POST'])
-def initialize_sample_data():
-    """Initialize sample data for demonstration"""
+@business_bp.route('/equipment', methods=['POST'])
+def add_equipment():
+    """Register a unit; ``type: "booth"`` units are what confirmed bookings reserve"""
     try:
-        # Check if data already exists
-        if StaffMember.query.count() > 0:
-            return jsonify({'message': 'Sample data already exists'}), 200
-        
-        # Create sample staff members
-        staff_data = [
-            {
-                'name': 'Alex Rodriguez',
-                'role': 'Lead Photographer',
-                'base_salary': 3500.0,
-                'performance_score': 96,
-                'events_completed': 8
-            },
-            {
-                'name': 'Sarah Chen',
-                'role': 'Assistant Photographer',
-                'base_salary': 2800.0,
-                'performance_score': 94,
-                'events_completed': 6
-            },
-            {
-                'name': 'Mike Johnson',
-                'role': 'Equipment Technician',
-                'base_salary': 2200.0,
-                'performance_score': 98,
-                'events_completed': 12
+        data = request.get_json(silent=True) or {}
+        
+        # Validate required fields
+        for field in ('name', 'type'):
+            if not data.get(field):
+                return jsonify({'error': f'Missing required field: {field}'}), 400
+        try:
+            dates = {
+                field: datetime.strptime(data[field], '%Y-%m-%d').date() if data.get(field) else None
+                for field in ('purchase_date', 'last_maintenance')
             }
-        ]
-        
-        for staff_info in staff_data:
-            staff = StaffMember(
-                name=staff_info['name'],
-                role=staff_info['role'],
-                status='active',
-                base_salary=staff_info['base_salary'],
-                profit_share=0.0,
-                performance_score=staff_info['performance_score'],
-                events_completed=staff_info['events_completed'],
-                hire_date=datetime.now().date() - timedelta(days=90)
-            )
-            db.session.add(staff)
-        
-        # Create sample equipment
-        equipment_data = [
-            {'name': 'Canon EOS R5', 'type': 'camera', 'status': 'active'},
-            {'name': 'Professional Lighting Kit', 'type': 'lighting', 'status': 'active'},
-            {'name': 'Backdrop Stand System', 'type': 'backdrop', 'status': 'active'},
-            {'name': 'Photo Printer', 'type': 'printer', 'status': 'active'}
-        ]
-        
-        for equip_info in equipment_data:
-            equipment = Equipment(
-                name=equip_info['name'],
-                type=equip_info['type'],
-                status=equip_info['status'],
-                purchase_date=datetime.now().date() - timedelta(days=180)
-            )
-            db.session.add(equipment)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Dates must be given as YYYY-MM-DD'}), 400
         
-        # Create sample business metrics
-        metrics = BusinessMetrics(
-            date=datetime.now().date(),
-            total_revenue=15750.0,
-            profit_distributed=11025.0,  # 70% of revenue
-            staff_count=3,
-            average_performance=96.0,
-            created_at=datetime.now()
+        unit = register_unit(data['name'], data['type'], location=data.get('location'), **dates)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Equipment added successfully',
+            'equipment': unit.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@business_bp.route('/equipment/maintenance-due', methods=['GET'])
+@read_only
+@query_budget(1)
+def get_maintenance_due():
+    """In-service equipment due for maintenance within ``days`` (default 14), soonest first.
+
+    Overdue units come first. ``location`` and ``type`` narrow the queue;
+    ``limit`` caps it (default 100).
+    """
+    try:
+        days = request.args.get('days', 14, type=int)
+        if days < 0:
+            return jsonify({'error': 'days must not be negative'}), 400
+
+        units = due_for_maintenance(
+            days,
+            location=request.args.get('location'),
+            equipment_type=request.args.get('type'),
+            limit=request.args.get('limit', 100, type=int)
         )
-        db.session.add(metrics)
+        return jsonify(units), 200
         
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@business_bp.route('/equipment/<int:equipment_id>/maintenance', methods=['POST'])
+def record_maintenance(equipment_id):
+    """Start (``{"action": "start"}``) or complete (the default) a unit's maintenance.
+
+    Starting takes the unit out of booking capacity and lists its upcoming
+    bookings, which need another unit. Completing returns it to service
+    with a fresh interval.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        action = data.get('action', 'complete')
+        if action not in ('start', 'complete'):
+            return jsonify({'error': f"Unknown action: {action}"}), 400
+
+        unit = db.session.get(Equipment, equipment_id)
+        if unit is None or unit.status == 'retired':
+            return jsonify({'error': 'Equipment not found'}), 404
+        
+        affected = []
+        if action == 'start':
+            start_maintenance(unit)
+            affected = upcoming_bookings(equipment_id)
+        else:
+            complete_maintenance(unit)
         db.session.commit()
         
         return jsonify({
             'success': True,
-            'message': 'Sample data initialized successfully',
-            'staff_created': len(staff_data),
-            'equipment_created': len(equipment_data)
-        }), 201
+            'equipment': unit.to_dict(),
+            'affected_bookings': affected
+        }), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@business_bp.route('/admin/sample-data', methods=['POST'])
+def generate_sample_data_endpoint():
+    """Append a seeded synthetic dataset; larger loads belong to ``flask sample-data``"""
+    if not _admin_authorized():
+        abort(403)
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        scale = data.get('scale', 'demo')
+        if scale not in SCALES:
+            return jsonify({'error': f"Unknown scale: {scale}"}), 400
+        counts = dict(SCALES[scale])
+        try:
+            for name in counts:
+                if name in data:
+                    counts[name] = int(data[name])
+            seed = int(data.get('seed', 42))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Counts and seed must be integers'}), 400
+        if any(count < 0 for count in counts.values()):
+            return jsonify({'error': 'Counts must not be negative'}), 400
+
+        limit = current_app.config['SAMPLE_DATA_REQUEST_LIMIT']
+        if sum(counts.values()) > limit:
+            return jsonify({
+                'error': f'Requests are limited to {limit} customers, staff, equipment and decisions in total; '
+                         'use `flask sample-data`'
+            }), 400
+
+        inserted = generate_sample_data(**counts, seed=seed)
+
+        return jsonify({'success': True, 'rows_created': inserted}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,8 +1,17 @@
-from flask import Blueprint, request, jsonify
-from src.models.business import db, Customer, Booking, Communication, AIExecutiveDecision
+from flask import Blueprint, abort, current_app, request, jsonify
+from src.models.business import db, Customer, Booking, Communication, BOOKED_STATUSES
 from src.ai_executives_enhanced import get_ai_team
+from src.services.decision_log import decision_log
+from src.services.serializers import customers_with_bookings
+from src.services.booking_search import decode_cursor, parse_filters, search_bookings
+from src.services.search_index import search
+from src.services.pricing import quote_price
+from src.services.staff_stats import record_completion, staff_summary
+from src.services.maintenance import NoEquipmentAvailable, reserve_unit
+from src.services.outbox import pending
+from src.extensions.database import read_only
+from src.extensions.query_audit import query_budget
 from datetime import datetime
-import json
 
 customer_bp = Blueprint('customer', __name__)
 
@@ -18,38 +27,11 @@ def create_inquiry():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        # Create customer record
-        customer = Customer(
-            name=data['fullName'],
-            email=data['email'],
-            phone=data.get('phone', ''),
-            created_at=datetime.now()
-        )
-        db.session.add(customer)
-        db.session.flush()  # Get customer ID
-        
-        # Calculate pricing
+        # Demand-adjusted price from the precomputed quote table
         duration = int(data['duration'])
-        base_prices = {2: 498, 3: 747, 4: 996, 5: 1245}
-        base_price = base_prices.get(duration, 747)
-        
-        # Create booking record
-        booking = Booking(
-            customer_id=customer.id,
-            event_type=data['eventType'],
-            event_date=datetime.strptime(data['eventDate'], '%Y-%m-%d').date(),
-            duration_hours=duration,
-            venue=data.get('venue', ''),
-            guest_count=int(data.get('guestCount', 0)) if data.get('guestCount') else None,
-            backdrop_color=data.get('backdrop', ''),
-            photo_layout=data.get('layout', 'horizontal'),
-            special_requests=data.get('notes', ''),
-            base_price=base_price,
-            status='inquiry',
-            created_at=datetime.now()
-        )
-        db.session.add(booking)
-        db.session.flush()  # Get booking ID
+        event_date = datetime.strptime(data['eventDate'], '%Y-%m-%d').date()
+        quote = quote_price(data['eventType'], event_date, duration)
+        base_price = quote['base_price']
         
         # Get AI executive decisions for pricing and response
         ai_team = get_ai_team()
@@ -61,7 +43,8 @@ def create_inquiry():
             'duration': duration,
             'guest_count': data.get('guestCount', 0),
             'venue': data.get('venue', ''),
-            'base_price': base_price
+            'base_price': base_price,
+            'demand_multiplier': quote['demand_multiplier']
         }
         
         cmo_decision = ai_team.get_executive_decision('AI_CMO', pricing_context)
@@ -78,15 +61,39 @@ def create_inquiry():
         
         ceo_decision = ai_team.get_executive_decision('AI_CEO', response_context)
         
-        # Calculate final price (AI may adjust)
-        final_price = base_price
-        if 'price_adjustment' in cmo_decision.get('decision', '').lower():
-            # AI suggested price adjustment - implement logic here
-            pass
+        # Write only once the AI executives have answered, so the write lock
+        # is not held through their LLM calls
+        customer = Customer(
+            name=data['fullName'],
+            email=data['email'],
+            phone=data.get('phone', ''),
+            created_at=datetime.now()
+        )
+        db.session.add(customer)
+        db.session.flush()  # Get customer ID
+        
+        # Create booking record
+        booking = Booking(
+            customer_id=customer.id,
+            event_type=data['eventType'],
+            event_date=event_date,
+            duration_hours=duration,
+            venue=data.get('venue', ''),
+            guest_count=int(data.get('guestCount', 0)) if data.get('guestCount') else None,
+            backdrop_color=data.get('backdrop', ''),
+            photo_layout=data.get('layout', 'horizontal'),
+            special_requests=data.get('notes', ''),
+            base_price=base_price,
+            status='inquiry',
+            created_at=datetime.now()
+        )
+        db.session.add(booking)
+        db.session.flush()  # Get booking ID
         
+        final_price = quote['price']
         booking.final_price = final_price
         
-        # Create communication record
+        # Queue the reply in this transaction; an outbox worker sends it
         ai_response = f"""Thank you for your inquiry, {data['fullName']}!
 
 Our AI executives have reviewed your {data['eventType']} event request and are excited to help make it memorable.
@@ -108,21 +115,12 @@ Party Favor Photo AI Executive Team"""
             booking_id=booking.id,
             message_type='ai_response',
             content=ai_response,
-            sent_at=datetime.now()
+            **pending(data['email'], 'Your Party Favor Photo inquiry')
         )
         db.session.add(communication)
         
         # Log AI decisions
-        for decision in [cmo_decision, ceo_decision]:
-            ai_decision = AIExecutiveDecision(
-                executive_role=decision['executive'],
-                decision_type=decision['context']['type'],
-                context=json.dumps(decision['context']),
-                decision=json.dumps(decision['decision']),
-                impact_level=decision['decision'].get('impact_level', 'Medium'),
-                created_at=datetime.strptime(decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-            )
-            db.session.add(ai_decision)
+        decision_log.record_many([cmo_decision, ceo_decision])
         
         db.session.commit()
         
@@ -140,50 +138,94 @@ Party Favor Photo AI Executive Team"""
         return jsonify({'error': str(e)}), 500
 
 @customer_bp.route('/customers', methods=['GET'])
+@read_only
+@query_budget(2)
 def get_customers():
     """Get all customers with their bookings"""
     try:
-        customers = Customer.query.all()
-        result = []
-        
-        for customer in customers:
-            customer_data = {
-                'id': customer.id,
-                'name': customer.name,
-                'email': customer.email,
-                'phone': customer.phone,
-                'created_at': customer.created_at.isoformat(),
-                'bookings': []
-            }
-            
-            for booking in customer.bookings:
-                booking_data = {
-                    'id': booking.id,
-                    'event_type': booking.event_type,
-                    'event_date': booking.event_date.isoformat(),
-                    'duration_hours': booking.duration_hours,
-                    'venue': booking.venue,
-                    'guest_count': booking.guest_count,
-                    'base_price': booking.base_price,
-                    'final_price': booking.final_price,
-                    'status': booking.status,
-                    'created_at': booking.created_at.isoformat()
-                }
-                customer_data['bookings'].append(booking_data)
-            
-            result.append(customer_data)
-        
-        return jsonify(result), 200
+        return jsonify(customers_with_bookings()), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@customer_bp.route('/bookings', methods=['GET'])
+@read_only
+@query_budget(1)
+def search_bookings_endpoint():
+    """Search bookings by status, event type, venue, customer and event date range.
+
+    ``status`` and ``event_type`` accept comma-separated values. Results are
+    ordered by event date (``order=desc`` for newest first) and
+    keyset-paginated: pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to fetch the next page. Archived bookings are only included
+    with ``history=1``.
+    """
+    try:
+        try:
+            filters = parse_filters(request.args)
+            cursor = request.args.get('cursor')
+            if cursor:
+                decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        bookings, next_cursor = search_bookings(
+            filters, cursor,
+            limit=request.args.get('limit', 50, type=int),
+            descending=request.args.get('order', 'asc').lower() == 'desc',
+            history=request.args.get('history', '0').lower() in ('1', 'true')
+        )
+        response = jsonify(bookings)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@customer_bp.route('/search', methods=['GET'])
+@read_only
+@query_budget(1)
+def search_records():
+    """Full-text search over customers, bookings and communications.
+
+    ``q`` is free text; every word must match, as a prefix. ``type``
+    restricts results to a comma-separated list of customer, booking and
+    communication. Hits are ranked best first, with an HTML snippet.
+    """
+    try:
+        if not current_app.extensions.get('search_index'):
+            return jsonify({'error': 'Full-text search is not available on this database'}), 501
+
+        kinds = [kind for kind in request.args.get('type', '').split(',') if kind]
+        try:
+            results = search(request.args.get('q', ''), kinds, request.args.get('limit', 20, type=int))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify(results), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @customer_bp.route('/bookings/<int:booking_id>/quote', methods=['POST'])
+@query_budget(6)
 def generate_quote(booking_id):
     """Generate an AI-powered quote for a booking"""
     try:
-        booking = Booking.query.get_or_404(booking_id)
-        customer = Customer.query.get_or_404(booking.customer_id)
+        # Booking, customer and the customer's booking count in one statement
+        other_booking = db.aliased(Booking)
+        previous_bookings = db.select(db.func.count(other_booking.id)).where(
+            other_booking.customer_id == Customer.id
+        ).scalar_subquery()
+        row = db.session.execute(
+            db.select(Booking, Customer, previous_bookings)
+            .join(Customer, Customer.id == Booking.customer_id)
+            .where(Booking.id == booking_id)
+        ).first()
+        if row is None:
+            abort(404)
+        booking, customer, previous_bookings = row
         
         # Get AI executive decision for detailed quote
         ai_team = get_ai_team()
@@ -200,7 +242,7 @@ def generate_quote(booking_id):
             },
             'customer_profile': {
                 'name': customer.name,
-                'previous_bookings': len(customer.bookings)
+                'previous_bookings': previous_bookings
             }
         }
         
@@ -240,16 +282,7 @@ def generate_quote(booking_id):
         }
         
         # Log AI decisions
-        for decision in [cmo_decision, coo_decision]:
-            ai_decision = AIExecutiveDecision(
-                executive_role=decision['executive'],
-                decision_type=decision['context']['type'],
-                context=json.dumps(decision['context']),
-                decision=json.dumps(decision['decision']),
-                impact_level=decision['decision'].get('impact_level', 'Medium'),
-                created_at=datetime.strptime(decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-            )
-            db.session.add(ai_decision)
+        decision_log.record_many([cmo_decision, coo_decision])
         
         db.session.commit()
         
@@ -264,10 +297,6 @@ def confirm_booking(booking_id):
     try:
         booking = Booking.query.get_or_404(booking_id)
         
-        # Update booking status
-        booking.status = 'confirmed'
-        booking.confirmed_at = datetime.now()
-        
         # Get AI executive decisions for confirmed booking
         ai_team = get_ai_team()
         
@@ -284,17 +313,21 @@ def confirm_booking(booking_id):
         # Get decisions from all executives
         decisions = ai_team.make_collective_decision(confirmation_context)
         
+        # Write only once the AI executives have answered, so the write lock
+        # is not held through their LLM calls. A booth unit must be free on
+        # the event date
+        try:
+            equipment_id = reserve_unit(booking)
+        except NoEquipmentAvailable as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 409
+        
+        # Update booking status
+        booking.status = 'confirmed'
+        booking.confirmed_at = datetime.now()
+        
         # Log all AI decisions
-        for decision in decisions:
-            ai_decision = AIExecutiveDecision(
-                executive_role=decision['executive'],
-                decision_type=decision['context']['type'],
-                context=json.dumps(decision['context']),
-                decision=json.dumps(decision['decision']),
-                impact_level=decision['decision'].get('impact_level', 'Medium'),
-                created_at=datetime.strptime(decision['timestamp'], '%Y-%m-%dT%H:%M:%S.%f')
-            )
-            db.session.add(ai_decision)
+        decision_log.record_many(decisions)
         
         db.session.commit()
         
@@ -302,6 +335,7 @@ def confirm_booking(booking_id):
             'success': True,
             'message': 'Booking confirmed successfully',
             'booking_id': booking_id,
+            'equipment_id': equipment_id,
             'ai_decisions': decisions
         }), 200
         
@@ -309,27 +343,97 @@ def confirm_booking(booking_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@customer_bp.route('/bookings/<int:booking_id>/complete', methods=['POST'])
+@query_budget(5)
+def complete_booking(booking_id):
+    """Mark a confirmed booking completed and credit the staff who worked it.
+
+    The body lists ``staff_ids`` and may carry the customer's ``rating``
+    (1-5 stars), which moves each staff member's rolling performance score.
+    Staff counters and the team summary are updated in the same transaction.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            staff_ids = [int(staff_id) for staff_id in data.get('staff_ids') or []]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'staff_ids must be a list of staff ids'}), 400
+        if not staff_ids:
+            return jsonify({'error': 'Missing required field: staff_ids'}), 400
+        rating = data.get('rating')
+        if rating is not None:
+            try:
+                rating = float(rating)
+            except (TypeError, ValueError):
+                rating = None
+            if rating is None or not 1 <= rating <= 5:
+                return jsonify({'error': 'rating must be a number from 1 to 5'}), 400
+        
+        completed = db.session.execute(
+            db.update(Booking)
+            .where(Booking.id == booking_id, Booking.status == 'confirmed')
+            .values(status='completed', completed_at=datetime.now())
+            .returning(Booking.id)
+        ).first()
+        if completed is None:
+            status = db.session.execute(db.select(Booking.status).where(Booking.id == booking_id)).scalar()
+            db.session.rollback()
+            if status is None:
+                return jsonify({'error': 'Booking not found'}), 404
+            return jsonify({'error': f'Only confirmed bookings can be completed (status: {status})'}), 409
+        
+        try:
+            staff = record_completion(staff_ids, rating)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Booking completed successfully',
+            'booking_id': booking_id,
+            'staff': staff,
+            'team': staff_summary()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @customer_bp.route('/dashboard', methods=['GET'])
+@read_only
+@query_budget(3)
 def get_dashboard_data():
     """Get dashboard data with AI insights"""
     try:
-        # Calculate metrics
-        total_customers = Customer.query.count()
-        total_bookings = Booking.query.count()
-        confirmed_bookings = Booking.query.filter_by(status='confirmed').count()
-        total_revenue = db.session.query(db.func.sum(Booking.final_price)).filter(
-            Booking.status == 'confirmed'
-        ).scalar() or 0
-        
-        # Get recent bookings
-        recent_bookings = Booking.query.order_by(Booking.created_at.desc()).limit(5).all()
+        # Calculate metrics in a single pass over bookings
+        confirmed = Booking.status.in_(BOOKED_STATUSES)
+        total_customers, total_bookings, confirmed_bookings, total_revenue = db.session.execute(
+            db.select(
+                db.select(db.func.count(Customer.id)).scalar_subquery(),
+                db.func.count(Booking.id),
+                db.func.count(db.case((confirmed, 1))),
+                db.func.sum(db.case((confirmed, Booking.final_price)))
+            )
+        ).one()
+        confirmed_bookings = confirmed_bookings or 0
+        total_revenue = total_revenue or 0
+        
+        # Get recent bookings with their customer names
+        recent_bookings = db.session.execute(
+            db.select(Booking, Customer.name)
+            .join(Customer, Customer.id == Booking.customer_id)
+            .order_by(Booking.created_at.desc())
+            .limit(5)
+        ).all()
         recent_bookings_data = []
         
-        for booking in recent_bookings:
-            customer = Customer.query.get(booking.customer_id)
+        for booking, customer_name in recent_bookings:
             recent_bookings_data.append({
                 'id': booking.id,
-                'client': f"{customer.name} - {booking.event_type}",
+                'client': f"{customer_name} - {booking.event_type}",
                 'date': booking.event_date.isoformat(),
                 'status': booking.status,
                 'value': booking.final_price or booking.base_price
@@ -0,0 +1,106 @@
+from src.models.business import db, Booking, BookingArchive
+from src.services.serializers import BOOKING, RowSerializer
+from datetime import date, datetime, timedelta
+import time
+
+DEFAULT_ARCHIVE_DAYS = 365
+DEFAULT_BATCH_SIZE = 1000
+# Bookings that are settled once their event is past. Confirmed ones stay in
+# the hot table until they are completed, however old the event.
+ARCHIVE_STATUSES = ('completed', 'cancelled', 'inquiry')
+
+HISTORY_VIEW = 'booking_history'
+
+_hot = Booking.__table__
+_cold = BookingArchive.__table__
+_COLUMNS = [column.name for column in _hot.columns]
+
+# Every booking, hot and archived. Only reads that ask for history use it;
+# everything else reads the booking table alone.
+booking_history = db.table(HISTORY_VIEW, *(db.column(column.name, column.type) for column in _hot.columns))
+
+# BOOKING's fields, read from the view
+BOOKING_HISTORY = RowSerializer([(key, booking_history.c[column.key], fmt) for key, column, fmt in BOOKING.fields])
+
+def booking_source(history: bool = False):
+    """The table a booking read should use: the history view or the hot table"""
+    return booking_history if history else _hot
+
+def ensure_booking_history():
+    """(Re)create the view over both tables, so it follows Booking's columns.
+
+    On SQLite, also make sure new bookings get ids above every archived one:
+    databases whose booking table had no AUTOINCREMENT may have handed out
+    an archived id again.
+    """
+    columns = ', '.join(f'"{name}"' for name in _COLUMNS)
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(f"DROP VIEW IF EXISTS {HISTORY_VIEW}")
+        connection.exec_driver_sql(
+            f"CREATE VIEW {HISTORY_VIEW} AS "
+            f"SELECT {columns} FROM {_hot.name} UNION ALL SELECT {columns} FROM {_cold.name}"
+        )
+        if db.engine.dialect.name == 'sqlite':
+            floor = connection.execute(db.select(db.func.max(_cold.c.id))).scalar() or 0
+            sequence = connection.exec_driver_sql(
+                "SELECT seq FROM sqlite_sequence WHERE name = ?", (_hot.name,)
+            ).scalar()
+            if sequence is None:
+                connection.exec_driver_sql(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (_hot.name, floor)
+                )
+            elif sequence < floor:
+                connection.exec_driver_sql(
+                    "UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (floor, _hot.name)
+                )
+
+def archive_bookings(before: date, statuses=ARCHIVE_STATUSES, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_batches: int = None, pause: float = 0.0) -> int:
+    """Move bookings in ``statuses`` for events before ``before`` into the archive table.
+
+    Oldest events go first, in batches that each copy and delete in one
+    transaction, so a booking is always in exactly one of the two tables
+    and an interrupted run resumes where it stopped. Returns the number of
+    bookings archived.
+    """
+    archived = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        ids = list(db.session.execute(
+            db.select(Booking.id).where(Booking.event_date < before, Booking.status.in_(statuses))
+            # Databases from before booking ids were AUTOINCREMENT may have reused an
+            # archived id; such bookings stay put rather than failing every run
+            .where(~db.select(_cold.c.id).where(_cold.c.id == Booking.id).exists())
+            .order_by(Booking.event_date, Booking.id).limit(batch_size)
+        ).scalars())
+        if not ids:
+            break
+
+        try:
+            db.session.execute(
+                db.insert(_cold).from_select(
+                    _COLUMNS + ['archived_at'],
+                    db.select(*(_hot.c[name] for name in _COLUMNS), db.literal(datetime.utcnow(), db.DateTime))
+                    .where(_hot.c.id.in_(ids))
+                )
+            )
+            db.session.execute(db.delete(_hot).where(_hot.c.id.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        archived += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            # Give request-path writers a window between batches
+            time.sleep(pause)
+
+    return archived
+
+def apply_booking_retention(days: int = DEFAULT_ARCHIVE_DAYS, **kwargs) -> int:
+    """Archive settled bookings for events more than ``days`` days ago"""
+    return archive_bookings(date.today() - timedelta(days=days), **kwargs)
@@ -0,0 +1,135 @@
+from src.models.business import db
+from src.services.serializers import BOOKING
+from src.services.booking_archive import BOOKING_HISTORY, booking_source
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+
+# Filters that accept a comma-separated list of values
+LIST_FILTERS = ('status', 'event_type')
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(event_date: date, booking_id: int) -> str:
+    """Opaque keyset cursor pointing just past the given booking"""
+    raw = f"{event_date.isoformat()}|{booking_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        event_date, booking_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return date.fromisoformat(event_date), int(booking_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def parse_filters(args) -> Dict[str, Any]:
+    """Search filters from request arguments; raises ValueError on bad input"""
+    filters = {}
+    for field in LIST_FILTERS:
+        if args.get(field):
+            # Repeated values would add duplicate branches, and duplicate rows
+            filters[field] = list(dict.fromkeys(value for value in args[field].split(',') if value))
+    for field in ('venue',):
+        if args.get(field):
+            filters[field] = args[field]
+    if args.get('customer_id'):
+        try:
+            filters['customer_id'] = int(args['customer_id'])
+        except ValueError:
+            raise ValueError("customer_id must be an integer")
+    for field in ('start_date', 'end_date'):
+        if args.get(field):
+            try:
+                filters[field] = date.fromisoformat(args[field])
+            except ValueError:
+                raise ValueError("Dates must use the YYYY-MM-DD format")
+    return filters
+
+def _keyset(query, table, after: Tuple[date, int], descending: bool):
+    event_date, booking_id = after
+    # The redundant bound on event_date alone gives SQLite an index range;
+    # the plain OR form makes it walk every row from the range start
+    if descending:
+        return query.where(table.c.event_date <= event_date).where(
+            db.or_(table.c.event_date < event_date, table.c.id < booking_id)
+        )
+    return query.where(table.c.event_date >= event_date).where(
+        db.or_(table.c.event_date > event_date, table.c.id > booking_id)
+    )
+
+def _ordered(query, event_date, booking_id, descending: bool, limit: int):
+    if descending:
+        return query.order_by(event_date.desc(), booking_id.desc()).limit(limit)
+    return query.order_by(event_date, booking_id).limit(limit)
+
+def search_query(filters: Dict[str, Any], after: Optional[Tuple[date, int]] = None,
+                 limit: int = 50, descending: bool = False, history: bool = False):
+    """Keyset query over (event_date, id) for the given filters.
+
+    Every filter combination is served by one of Booking's composite
+    indexes: an equality prefix (status, event_type, venue or customer_id)
+    followed by event_date, with the id as SQLite's implicit last index
+    column. The range, the ordering and the page boundary are therefore all
+    resolved inside the index, and a page costs the same at row ten million
+    as at row ten. A filter with several values becomes one such index range
+    per value, each limited to a page, merged by a UNION ALL; an IN list
+    would make the database sort every matching row instead.
+
+    With ``history`` the query reads the booking_history view, so archived
+    bookings are included; SQLite pushes the filters into both of its
+    tables, whose indexes match, but has to sort the combined matches.
+    """
+    table = booking_source(history)
+    columns, _ = (BOOKING_HISTORY if history else BOOKING).compiled()
+    query = db.select(*columns)
+
+    expanded = None
+    for field in LIST_FILTERS:
+        values = filters.get(field)
+        if not values:
+            continue
+        column = table.c[field]
+        if len(values) == 1:
+            query = query.where(column == values[0])
+        elif expanded is None:
+            expanded = (column, values)
+        else:
+            query = query.where(column.in_(values))
+    if filters.get('venue'):
+        query = query.where(table.c.venue == filters['venue'])
+    if filters.get('customer_id') is not None:
+        query = query.where(table.c.customer_id == filters['customer_id'])
+    if filters.get('start_date'):
+        query = query.where(table.c.event_date >= filters['start_date'])
+    if filters.get('end_date'):
+        query = query.where(table.c.event_date <= filters['end_date'])
+    if after:
+        query = _keyset(query, table, after, descending)
+
+    if expanded is None:
+        return _ordered(query, table.c.event_date, table.c.id, descending, limit)
+
+    column, values = expanded
+    branches = db.union_all(*(
+        db.select(_ordered(query.where(column == value), table.c.event_date, table.c.id, descending, limit)
+                  .subquery())
+        for value in values
+    )).subquery()
+    return _ordered(db.select(branches), branches.c.event_date, branches.c.id, descending, limit)
+
+def search_bookings(filters: Dict[str, Any], cursor: str = None, limit: int = 50,
+                    descending: bool = False, history: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of matching bookings, plus the cursor for the next page"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db.session.execute(search_query(filters, after, limit + 1, descending, history)).all()
+    bookings = (BOOKING_HISTORY if history else BOOKING).rows(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = bookings[-1]
+        next_cursor = encode_cursor(date.fromisoformat(last['event_date']), last['id'])
+
+    return bookings, next_cursor
@@ -0,0 +1,183 @@
+from flask import current_app
+from src.models.business import db, Booking, Customer, Communication, BOOKED_STATUSES
+from src.services.booking_archive import booking_history
+from src.services.outbox import pending
+from datetime import date, datetime
+from string import Template
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import os
+
+MESSAGE_TYPE = 'campaign'
+DEFAULT_HASHTAGS = ('#DMVWeddings', '#PhotoBoothFun', '#PartyFavorPhoto')
+
+SEGMENTS = ('all', 'past_customers', 'open_inquiries')
+
+# Content type (as in the CMO's posting schedule) -> subject and body, compiled once
+TEMPLATES = {
+    'wedding_showcase': (
+        Template("$first_name, see this season's favourite wedding booths"),
+        Template(
+            "Hi $first_name,\n\n"
+            "Our booths were at some beautiful weddings this season, and we have put the\n"
+            "favourite backdrops and photo strips together for you. If you are planning a\n"
+            "$event_type, we would love to be part of it.\n\n"
+            "$hashtags\n\n"
+            "Party Favor Photo"
+        ),
+    ),
+    'behind_the_scenes': (
+        Template("Behind the scenes at Party Favor Photo"),
+        Template(
+            "Hi $first_name,\n\n"
+            "Ever wondered what goes into a booth before the first guest walks up? Our\n"
+            "team builds, lights and tests every setup on site, so your $event_type runs\n"
+            "without a hitch.\n\n"
+            "$hashtags\n\n"
+            "Party Favor Photo"
+        ),
+    ),
+    'customer_testimonial': (
+        Template("What our customers say, $first_name"),
+        Template(
+            "Hi $first_name,\n\n"
+            "Five stars, again and again: our customers say the booth was the highlight\n"
+            "of the night. Let us make your next $event_type just as memorable.\n\n"
+            "$hashtags\n\n"
+            "Party Favor Photo"
+        ),
+    ),
+    'engagement_post': (
+        Template("$first_name, show us your favourite booth photo"),
+        Template(
+            "Hi $first_name,\n\n"
+            "Share your favourite photo from a Party Favor Photo booth and tag us. Each\n"
+            "month we feature our favourites.\n\n"
+            "$hashtags\n\n"
+            "Party Favor Photo"
+        ),
+    ),
+}
+
+# The CMO recommends content types in the plural
+_CONTENT_TYPE_ALIASES = {
+    'wedding_showcases': 'wedding_showcase',
+    'customer_testimonials': 'customer_testimonial',
+    'engagement_posts': 'engagement_post',
+}
+
+def content_type_for(strategy: Dict[str, Any], day: date) -> str:
+    """The template a content strategy (AICMO._content_strategy) calls for on ``day``.
+
+    The posting schedule's entry for the weekday wins; otherwise the first
+    recommended content type with a template. Raises ValueError when the
+    strategy names none.
+    """
+    scheduled = strategy.get('posting_schedule', {}).get(day.strftime('%A').lower())
+    for name in [scheduled] + list(strategy.get('recommended_content_types', [])):
+        name = _CONTENT_TYPE_ALIASES.get(name, name)
+        if name in TEMPLATES:
+            return name
+    raise ValueError("The content strategy names no known content type")
+
+def _unindexed(column):
+    return column.op('||')('')
+
+def segment_query(segment: str, event_type: Optional[str] = None, today: Optional[date] = None):
+    """Customers in a segment who prefer email, in id order.
+
+    ``past_customers`` have had a confirmed or completed event, archived
+    ones included; ``open_inquiries`` have an unanswered inquiry for an
+    upcoming event. ``event_type`` narrows any segment to customers with a
+    booking of that type. Each condition is an EXISTS probe on a
+    (customer_id, event_date) index, so a page of customers costs the same
+    however far into the table it starts.
+    """
+    if segment not in SEGMENTS:
+        raise ValueError(f"Unknown segment: {segment}")
+    today = today or date.today()
+
+    query = db.select(Customer.id, Customer.name, Customer.email).where(
+        Customer.email != '',
+        db.func.coalesce(Customer.preferred_contact, 'email') == 'email'
+    )
+
+    # Open inquiries are upcoming, so the hot table has them all
+    bookings = Booking.__table__ if segment == 'open_inquiries' else booking_history
+    # `|| ''` keeps SQLite off the status and event type indexes: with some
+    # statistics it prefers them and then walks every booking of that status
+    # or type for each customer
+    status, kind = _unindexed(bookings.c.status), _unindexed(bookings.c.event_type)
+    conditions = []
+    if segment == 'past_customers':
+        conditions += [status.in_(BOOKED_STATUSES), bookings.c.event_date < today]
+    elif segment == 'open_inquiries':
+        conditions += [status == 'inquiry', bookings.c.event_date >= today]
+    if event_type:
+        conditions.append(kind == event_type)
+    if conditions:
+        query = query.where(
+            db.select(bookings.c.id).where(bookings.c.customer_id == Customer.id, *conditions).exists()
+        )
+    return query
+
+def recipients(segment: str, event_type: Optional[str] = None, batch_size: int = 500,
+               today: Optional[date] = None) -> Iterator[List[Any]]:
+    """Stream a segment in pages of ``batch_size`` rows, keyset-paginated by customer id"""
+    query = segment_query(segment, event_type, today)
+    after = 0
+    while True:
+        rows = db.session.execute(
+            query.where(Customer.id > after).order_by(Customer.id).limit(batch_size)
+        ).all()
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        after = rows[-1].id
+
+def render(content_type: str, rows, event_type: Optional[str] = None,
+           hashtags=DEFAULT_HASHTAGS) -> Iterator[tuple]:
+    """(customer id, email, subject, body) for each recipient row"""
+    subject, body = TEMPLATES[content_type]
+    fields = {'event_type': event_type or 'event', 'hashtags': ' '.join(hashtags)}
+    for customer_id, name, email in rows:
+        fields['first_name'] = (name or '').split(' ', 1)[0] or 'there'
+        yield customer_id, email, subject.substitute(fields), body.substitute(fields)
+
+def run_campaign(content_type: str, segment: str = 'all', event_type: Optional[str] = None,
+                 hashtags=DEFAULT_HASHTAGS, batch_size: Optional[int] = None, dry_run: bool = False,
+                 today: Optional[date] = None,
+                 progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+    """Render a content type for every customer in a segment and queue it.
+
+    Recipients stream from the database a page at a time, and each page is
+    rendered and written to the outbox as one batched Communication insert
+    and committed, so memory stays flat whatever the segment size. Outbox
+    workers deliver the messages. With ``dry_run`` nothing is written.
+    Returns the counts.
+    """
+    if content_type not in TEMPLATES:
+        raise ValueError(f"Unknown content type: {content_type}")
+    batch_size = batch_size or current_app.config['CAMPAIGN_BATCH_SIZE']
+    counts = {'recipients': 0, 'queued': 0}
+
+    for rows in recipients(segment, event_type, batch_size, today):
+        queued_at = datetime.utcnow()
+        messages = [
+            {'customer_id': customer_id, 'booking_id': None, 'message_type': MESSAGE_TYPE,
+             'content': body, **pending(email, subject, queued_at)}
+            for customer_id, email, subject, body in render(content_type, rows, event_type, hashtags)
+        ]
+        counts['recipients'] += len(messages)
+        if dry_run:
+            continue
+        db.session.execute(db.insert(Communication), messages)
+        db.session.commit()
+        counts['queued'] += len(messages)
+        if progress:
+            progress(counts)
+    return counts
+
+def init_campaigns(app):
+    """Page size of campaign runs"""
+    app.config.setdefault('CAMPAIGN_BATCH_SIZE', int(os.environ.get('CAMPAIGN_BATCH_SIZE', 500)))
@@ -0,0 +1,131 @@
+from src.models.business import db, AIExecutiveDecision
+from src.services.payload_store import load_payloads
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import base64
+import json
+
+FILTER_FIELDS = ('executive_role', 'decision_type', 'impact_level')
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+_COLUMNS = (
+    AIExecutiveDecision.id,
+    AIExecutiveDecision.executive_role,
+    AIExecutiveDecision.decision_type,
+    AIExecutiveDecision.context,
+    AIExecutiveDecision.decision,
+    AIExecutiveDecision.context_hash,
+    AIExecutiveDecision.decision_hash,
+    AIExecutiveDecision.impact_level,
+    AIExecutiveDecision.created_at
+)
+
+def encode_cursor(created_at: datetime, decision_id: int) -> str:
+    """Opaque keyset cursor pointing just past the given row"""
+    raw = f"{created_at.isoformat()}|{decision_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, decision_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(created_at), int(decision_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _select(filters: Dict[str, str], after: Optional[Tuple[datetime, int]], limit: int):
+    """Newest-first keyset query over (created_at, id)"""
+    query = db.select(*_COLUMNS)
+
+    for field, value in filters.items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unknown filter: {field}")
+        query = query.where(getattr(AIExecutiveDecision, field) == value)
+
+    if after:
+        created_at, decision_id = after
+        query = query.where(db.or_(
+            AIExecutiveDecision.created_at < created_at,
+            db.and_(AIExecutiveDecision.created_at == created_at, AIExecutiveDecision.id < decision_id)
+        ))
+
+    return query.order_by(
+        AIExecutiveDecision.created_at.desc(),
+        AIExecutiveDecision.id.desc()
+    ).limit(limit)
+
+def render_decision(row, payloads: Dict[str, str]) -> str:
+    """Render one decision row as a JSON object.
+
+    ``context`` and ``decision`` are stored as JSON text already (inline on
+    legacy rows, in the payload store otherwise), so they are spliced into
+    the output verbatim instead of being parsed and re-encoded. Keys are
+    emitted in sorted order to match ``jsonify``.
+    """
+    (decision_id, role, decision_type, context, decision,
+     context_hash, decision_hash, impact_level, created_at) = row
+    context = context or payloads.get(context_hash)
+    decision = decision or payloads.get(decision_hash)
+    return (
+        '{"context":' + (context or 'null') +
+        ',"created_at":' + (json.dumps(created_at.isoformat()) if created_at else 'null') +
+        ',"decision":' + (decision or 'null') +
+        ',"decision_type":' + json.dumps(decision_type) +
+        ',"executive_role":' + json.dumps(role) +
+        ',"id":' + str(decision_id) +
+        ',"impact_level":' + json.dumps(impact_level) +
+        '}'
+    )
+
+def _render_batch(rows) -> List[str]:
+    """Render a batch of rows, resolving their unique payload hashes in one query"""
+    payloads = load_payloads(
+        key for row in rows for key in (row.context_hash, row.decision_hash)
+    )
+    return [render_decision(row, payloads) for row in rows]
+
+def decision_page(filters: Dict[str, str], cursor: str = None,
+                  limit: int = 20) -> Tuple[str, Optional[str]]:
+    """One page of decisions as a JSON array, plus the cursor for the next page"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db.session.execute(_select(filters, after, limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return '[' + ','.join(_render_batch(rows)) + ']', next_cursor
+
+def stream_decisions(filters: Dict[str, str], cursor: str = None,
+                     limit: int = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[str]:
+    """Yield a JSON array of decisions in keyset batches.
+
+    Only one batch is held in memory at a time, so exports of the whole
+    audit table run in constant memory.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    remaining = limit
+    first = True
+
+    yield '['
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = db.session.execute(_select(filters, after, size)).all()
+        if not rows:
+            break
+
+        chunk = ','.join(_render_batch(rows))
+        yield chunk if first else ',' + chunk
+        first = False
+
+        after = (rows[-1].created_at, rows[-1].id)
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            break
+    yield ']'
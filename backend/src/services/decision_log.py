@@ -0,0 +1,191 @@
+from flask import current_app
+from src.models.business import db, AIExecutiveDecision
+from src.services.payload_store import store_payloads
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+import atexit
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def _entry(decision: Dict[str, Any], default_impact: str) -> Dict[str, Any]:
+    """Flatten an AI executive decision log into the fields of an audit row"""
+    return {
+        'executive_role': decision['executive'],
+        'decision_type': decision['context']['type'],
+        'context': decision['context'],
+        'decision': decision['decision'],
+        'impact_level': decision['decision'].get('impact_level', default_impact),
+        'created_at': datetime.fromisoformat(decision['timestamp'])
+    }
+
+def insert_entries(entries: List[Dict[str, Any]]):
+    """Insert audit rows into the current session with one batched statement.
+
+    Context and decision payloads go to the content-addressed payload store;
+    the rows only reference them by hash.
+    """
+    hashes = store_payloads(
+        payload for entry in entries for payload in (entry['context'], entry['decision'])
+    )
+    db.session.execute(db.insert(AIExecutiveDecision), [
+        {
+            'executive_role': entry['executive_role'],
+            'decision_type': entry['decision_type'],
+            'context_hash': hashes[2 * index],
+            'decision_hash': hashes[2 * index + 1],
+            'impact_level': entry['impact_level'],
+            'created_at': entry['created_at']
+        }
+        for index, entry in enumerate(entries)
+    ])
+
+class _BufferedWriter:
+    """Per-app write-behind buffer flushed by a background thread.
+
+    Records that fail to write (say the database is locked) go back to the
+    front of the buffer and are retried on the following flushes; only after
+    ``max_retries`` failures in a row are they logged and dropped.
+    """
+
+    def __init__(self, app, batch_size: int, interval: float, max_retries: int):
+        self.app = app
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_retries = max_retries
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            # Preforking servers must not inherit the parent's thread or lock
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._failures = 0
+
+    def submit(self, entries: List[Dict[str, Any]]):
+        with self._lock:
+            self._buffer.extend(entries)
+            full = len(self._buffer) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='decision-log-writer', daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written"""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return 0
+
+        with self.app.app_context():
+            try:
+                for start in range(0, len(entries), self.batch_size):
+                    insert_entries(entries[start:start + self.batch_size])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self._failed(entries)
+                return 0
+            finally:
+                db.session.remove()
+        self._failures = 0
+        return len(entries)
+
+    def _failed(self, entries: List[Dict[str, Any]]):
+        self._failures += 1
+        if self._failures > self.max_retries:
+            self._failures = 0
+            logger.exception("Dropping %d AI decision records after %d failed writes",
+                             len(entries), self.max_retries + 1)
+            return
+        logger.warning("Failed to write %d AI decision records (attempt %d of %d); will retry",
+                       len(entries), self._failures, self.max_retries + 1, exc_info=True)
+        with self._lock:
+            self._buffer[:0] = entries
+
+    def close(self):
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+        while self._failures:
+            time.sleep(self.interval)
+            self.flush()
+
+class DecisionLog:
+    """Shared writer for AI executive decision audit records.
+
+    In ``async`` mode records are buffered in memory and a background thread
+    inserts them in batches every ``DECISION_LOG_BATCH_SIZE`` records or
+    ``DECISION_LOG_FLUSH_INTERVAL_MS`` milliseconds, keeping audit writes off
+    the request path. A failed write is retried up to
+    ``DECISION_LOG_MAX_RETRIES`` times. The buffer is flushed on shutdown. In ``sync`` mode
+    (the default under ``TESTING``) records are added to the caller's session
+    and committed with its transaction.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault(
+            'DECISION_LOG_MODE',
+            os.environ.get('DECISION_LOG_MODE', 'sync' if app.testing else 'async')
+        )
+        app.config.setdefault('DECISION_LOG_BATCH_SIZE', 100)
+        app.config.setdefault('DECISION_LOG_FLUSH_INTERVAL_MS', 200)
+        app.config.setdefault('DECISION_LOG_MAX_RETRIES', 5)
+
+        writer = None
+        if app.config['DECISION_LOG_MODE'] == 'async':
+            writer = _BufferedWriter(
+                app,
+                app.config['DECISION_LOG_BATCH_SIZE'],
+                app.config['DECISION_LOG_FLUSH_INTERVAL_MS'] / 1000.0,
+                app.config['DECISION_LOG_MAX_RETRIES']
+            )
+            atexit.register(writer.close)
+        app.extensions['decision_log'] = writer
+
+    def record(self, decision: Dict[str, Any], default_impact: str = 'Medium'):
+        """Record one decision log returned by an AI executive"""
+        self.record_many([decision], default_impact)
+
+    def record_many(self, decisions: Iterable[Dict[str, Any]], default_impact: str = 'Medium'):
+        """Record several decision logs returned by AI executives"""
+        entries = [_entry(decision, default_impact) for decision in decisions]
+        if not entries:
+            return
+
+        writer = current_app.extensions.get('decision_log')
+        if writer is None:
+            insert_entries(entries)
+        else:
+            writer.submit(entries)
+
+    def flush(self) -> int:
+        """Write buffered records now (no-op in sync mode)"""
+        writer = current_app.extensions.get('decision_log')
+        return writer.flush() if writer is not None else 0
+
+decision_log = DecisionLog()
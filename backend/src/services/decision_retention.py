@@ -0,0 +1,136 @@
+from src.models.business import db, AIExecutiveDecision, AIExecutiveDecisionArchive
+from src.services.payload_store import store_payloads
+from datetime import datetime, timedelta
+import json
+import time
+import zlib
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_BATCH_SIZE = 500
+
+def compact_payload(context: str, decision: str) -> bytes:
+    """Pack the stored context/decision JSON text into one compressed blob"""
+    text = '[' + (context or 'null') + ',' + (decision or 'null') + ']'
+    return zlib.compress(text.encode('utf-8'), 9)
+
+def archive_decisions(older_than: datetime, batch_size: int = DEFAULT_BATCH_SIZE,
+                      max_batches: int = None, pause: float = 0.0) -> int:
+    """Move decisions created before ``older_than`` into the archive table.
+
+    Rows are moved oldest first in small batches, each in its own short
+    transaction, so the hot table is never locked for long and an
+    interrupted run simply resumes where it stopped. Returns the number of
+    rows archived.
+    """
+    archived = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        rows = db.session.execute(
+            db.select(
+                AIExecutiveDecision.id,
+                AIExecutiveDecision.executive_role,
+                AIExecutiveDecision.decision_type,
+                AIExecutiveDecision.context,
+                AIExecutiveDecision.decision,
+                AIExecutiveDecision.context_hash,
+                AIExecutiveDecision.decision_hash,
+                AIExecutiveDecision.impact_level,
+                AIExecutiveDecision.created_at
+            ).where(
+                AIExecutiveDecision.created_at < older_than
+            ).order_by(AIExecutiveDecision.created_at, AIExecutiveDecision.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        now = datetime.utcnow()
+        try:
+            db.session.execute(db.insert(AIExecutiveDecisionArchive), [
+                {
+                    'id': row.id,
+                    'executive_role': row.executive_role,
+                    'decision_type': row.decision_type,
+                    'impact_level': row.impact_level,
+                    'created_at': row.created_at,
+                    'context_hash': row.context_hash,
+                    'decision_hash': row.decision_hash,
+                    # Deduplicated rows keep pointing at the shared payload store
+                    'payload': (
+                        compact_payload(row.context, row.decision)
+                        if row.context is not None or row.decision is not None else None
+                    ),
+                    'archived_at': now
+                }
+                for row in rows
+            ])
+            db.session.execute(
+                db.delete(AIExecutiveDecision).where(AIExecutiveDecision.id.in_([row.id for row in rows]))
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        archived += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+        if pause:
+            # Give request-path writers a window between batches
+            time.sleep(pause)
+
+    return archived
+
+def apply_retention(days: int = DEFAULT_RETENTION_DAYS, **kwargs) -> int:
+    """Archive decisions older than ``days`` days"""
+    return archive_decisions(datetime.now() - timedelta(days=days), **kwargs)
+
+def deduplicate_decisions(batch_size: int = DEFAULT_BATCH_SIZE, max_batches: int = None) -> int:
+    """Move inline context/decision JSON of legacy rows into the payload store.
+
+    Runs in small batches like ``archive_decisions``; returns the number of
+    rows converted.
+    """
+    converted = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        rows = db.session.execute(
+            db.select(
+                AIExecutiveDecision.id,
+                AIExecutiveDecision.context,
+                AIExecutiveDecision.decision
+            ).where(
+                db.or_(AIExecutiveDecision.context.isnot(None), AIExecutiveDecision.decision.isnot(None))
+            ).order_by(AIExecutiveDecision.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        try:
+            hashes = store_payloads(
+                json.loads(text) if text else None
+                for row in rows for text in (row.context, row.decision)
+            )
+            db.session.execute(db.update(AIExecutiveDecision), [
+                {
+                    'id': row.id,
+                    'context': None,
+                    'decision': None,
+                    'context_hash': hashes[2 * index],
+                    'decision_hash': hashes[2 * index + 1]
+                }
+                for index, row in enumerate(rows)
+            ])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        converted += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    return converted
@@ -0,0 +1,70 @@
+from flask import has_app_context
+from src.models.business import db, AIExecutiveCounter
+from src.ai_executives_enhanced import LocalDecisionCounter, get_ai_team
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from typing import Dict, Iterable
+
+_counters = AIExecutiveCounter.__table__
+
+class DatabaseDecisionCounter:
+    """Decision counts kept in the ai_executive_counter table.
+
+    Each increment is a single ``UPDATE ... SET decisions_made =
+    decisions_made + 1 RETURNING`` committed in its own short transaction,
+    so it is atomic across worker processes and never holds the write lock
+    through the LLM call that follows, nor for the rest of the request.
+    Outside an app context it counts in process memory.
+    """
+
+    def __init__(self):
+        self._local = LocalDecisionCounter()
+
+    def increment(self, role: str) -> int:
+        if not has_app_context():
+            return self._local.increment(role)
+
+        statement = (
+            db.update(_counters)
+            .where(_counters.c.executive_role == role)
+            .values(decisions_made=_counters.c.decisions_made + 1, last_decision_at=datetime.now())
+            .returning(_counters.c.decisions_made)
+        )
+        with db.engine.begin() as connection:
+            value = connection.execute(statement).scalar()
+        if value is None:
+            # Roles are seeded at startup; this covers one added since
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(db.insert(_counters).values(executive_role=role, decisions_made=0))
+            except IntegrityError:
+                pass  # another process created it first
+            with db.engine.begin() as connection:
+                value = connection.execute(statement).scalar()
+        return value
+
+    def counts(self) -> Dict[str, int]:
+        if not has_app_context():
+            return self._local.counts()
+        return dict(db.session.execute(db.select(_counters.c.executive_role, _counters.c.decisions_made)).all())
+
+def seed_counters(roles: Iterable[str]):
+    """Create a zero counter row for every role that has none"""
+    existing = set(db.session.execute(db.select(_counters.c.executive_role)).scalars())
+    missing = [role for role in roles if role not in existing]
+    if not missing:
+        return
+    try:
+        db.session.execute(db.insert(_counters), [
+            {'executive_role': role, 'decisions_made': 0} for role in missing
+        ])
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()  # another worker seeded them first
+
+def init_executive_state(app):
+    """Share AI executive decision counts between processes through the database"""
+    team = get_ai_team()
+    with app.app_context():
+        seed_counters(team.executives)
+    team.use_counter(DatabaseDecisionCounter())
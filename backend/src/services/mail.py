@@ -0,0 +1,137 @@
+from flask import current_app
+from abc import ABC, abstractmethod
+from email.generator import BytesGenerator
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid, parseaddr
+import os
+import smtplib
+import threading
+import time
+
+class Transport(ABC):
+    """Delivers email. ``send`` raises when a message could not be handed over
+    and may be called from several threads at once."""
+
+    def __init__(self, sender: str):
+        self.sender = sender
+        self._domain = parseaddr(sender)[1].partition('@')[2] or None
+
+    def message(self, recipient: str, subject: str, body: str) -> MIMEText:
+        # The compat32 classes take headers as given; the default policy's
+        # header parsing costs more than a millisecond per message
+        message = MIMEText(body, 'plain', 'us-ascii' if body.isascii() else 'utf-8')
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = subject
+        message['Date'] = formatdate(localtime=True)
+        message['Message-ID'] = make_msgid(domain=self._domain)
+        return message
+
+    @abstractmethod
+    def send(self, recipient: str, subject: str, body: str):
+        pass
+
+    def close(self):
+        pass
+
+class FileTransport(Transport):
+    """Local stand-in: appends every message to an mbox file instead of sending it"""
+
+    def __init__(self, sender: str, path: str):
+        super().__init__(sender)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def send(self, recipient: str, subject: str, body: str):
+        message = self.message(recipient, subject, body)
+        envelope = f"From {parseaddr(self.sender)[1] or 'MAILER-DAEMON'} {time.asctime()}\n".encode()
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'ab')
+            self._file.write(envelope)
+            BytesGenerator(self._file, mangle_from_=True).flatten(message)
+            self._file.write(b'\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class SMTPTransport(Transport):
+    """Sends through an SMTP server, keeping one connection per sending thread"""
+
+    def __init__(self, sender: str, host: str, port: int, username: str = None, password: str = None,
+                 starttls: bool = False, timeout: float = 30):
+        super().__init__(sender)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password or '')
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def send(self, recipient: str, subject: str, body: str):
+        message = self.message(recipient, subject, body)
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            try:
+                connection.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                pass  # idle connection dropped by the server; reconnect once
+        self._local.connection = self._connect()
+        self._local.connection.send_message(message)
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.quit()
+            except smtplib.SMTPException:
+                connection.close()
+        self._local = threading.local()
+
+def build_transport(config) -> Transport:
+    """The transport named by MAIL_TRANSPORT; raises ValueError for unknown names"""
+    name = config['MAIL_TRANSPORT']
+    if name == 'file':
+        return FileTransport(config['MAIL_SENDER'], config['MAIL_FILE_PATH'])
+    if name == 'smtp':
+        return SMTPTransport(
+            config['MAIL_SENDER'], config['SMTP_HOST'], config['SMTP_PORT'],
+            config['SMTP_USERNAME'], config['SMTP_PASSWORD'], config['SMTP_STARTTLS']
+        )
+    raise ValueError(f"Unknown mail transport: {name}")
+
+def init_mail(app):
+    """Mail settings, by default writing to a local mbox file in the instance folder"""
+    app.config.setdefault('MAIL_TRANSPORT', os.environ.get('MAIL_TRANSPORT', 'file'))
+    app.config.setdefault('MAIL_SENDER', os.environ.get('MAIL_SENDER', 'Party Favor Photo <hello@partyfavorphoto.com>'))
+    app.config.setdefault('MAIL_FILE_PATH', os.environ.get('MAIL_FILE_PATH', os.path.join(app.instance_path, 'outbox.mbox')))
+    app.config.setdefault('SMTP_HOST', os.environ.get('SMTP_HOST', 'localhost'))
+    app.config.setdefault('SMTP_PORT', int(os.environ.get('SMTP_PORT', 25)))
+    app.config.setdefault('SMTP_USERNAME', os.environ.get('SMTP_USERNAME'))
+    app.config.setdefault('SMTP_PASSWORD', os.environ.get('SMTP_PASSWORD'))
+    app.config.setdefault('SMTP_STARTTLS', os.environ.get('SMTP_STARTTLS', '0') == '1')
+
+def mail_transport() -> Transport:
+    """A new transport for the current app's settings; close it when done"""
+    return build_transport(current_app.config)
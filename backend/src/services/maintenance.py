@@ -0,0 +1,187 @@
+from src.models.business import db, Booking, Equipment
+from src.services.serializers import RowSerializer
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+# Service every MAINTENANCE_INTERVAL_DAYS, or sooner with heavy use: each
+# confirmed booking on a unit brings its due date forward by WEAR_DAYS, so
+# EVENTS_PER_INTERVAL events use up a whole interval
+MAINTENANCE_INTERVAL_DAYS = 180
+EVENTS_PER_INTERVAL = 60
+WEAR_DAYS = MAINTENANCE_INTERVAL_DAYS // EVENTS_PER_INTERVAL
+
+# Days a unit is out of service from its due date
+SERVICE_DAYS = 2
+
+# Equipment type a booking takes one unit of
+BOOKED_TYPE = 'booth'
+
+MAX_QUEUE_PAGE = 500
+
+# Picks tried when concurrent confirmations take the chosen unit first
+RESERVE_ATTEMPTS = 3
+
+# Units in the queue; 'maintenance' units are already being serviced and
+# retired ones never come back
+_in_service = Equipment.status == 'active'
+
+MAINTENANCE_QUEUE = RowSerializer([
+    ('id', Equipment.id, None),
+    ('name', Equipment.name, None),
+    ('type', Equipment.type, None),
+    ('location', Equipment.location, None),
+    ('last_maintenance', Equipment.last_maintenance, 'date'),
+    ('next_maintenance', Equipment.next_maintenance, 'date'),
+    ('usage_count', Equipment.usage_count, None),
+])
+
+class NoEquipmentAvailable(Exception):
+    """Every unit is booked, being serviced or due for service on the event date"""
+
+def ensure_maintenance_schedule(today: Optional[date] = None) -> int:
+    """Give units without a due date one, so they enter the queue and can be booked"""
+    today = today or date.today()
+    units = db.session.execute(
+        db.select(Equipment.id, Equipment.last_maintenance).where(Equipment.next_maintenance.is_(None))
+    ).all()
+    for unit_id, last_maintenance in units:
+        db.session.execute(
+            db.update(Equipment).where(Equipment.id == unit_id)
+            .values(next_maintenance=(last_maintenance or today) + timedelta(days=MAINTENANCE_INTERVAL_DAYS))
+        )
+    db.session.commit()
+    return len(units)
+
+def due_for_maintenance(days: int, location: Optional[str] = None, equipment_type: Optional[str] = None,
+                        limit: int = 100, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """In-service units due within ``days``, overdue ones included, soonest first.
+
+    A range scan over one of Equipment's (..., status, next_maintenance)
+    indexes, so the answer costs the number of units returned whatever
+    the size of the inventory.
+    """
+    today = today or date.today()
+    columns, _ = MAINTENANCE_QUEUE.compiled()
+    query = db.select(*columns).where(_in_service, Equipment.next_maintenance <= today + timedelta(days=days))
+    if location:
+        query = query.where(Equipment.location == location)
+    if equipment_type:
+        query = query.where(Equipment.type == equipment_type)
+    rows = db.session.execute(
+        query.order_by(Equipment.next_maintenance, Equipment.id).limit(max(1, min(limit, MAX_QUEUE_PAGE)))
+    ).all()
+    return MAINTENANCE_QUEUE.rows(rows)
+
+def _available_on(event_date: date, today: date):
+    """Units that can work an event on ``event_date``.
+
+    A unit is out for SERVICE_DAYS from its due date. Within that window of
+    today, units being serviced or overdue cannot be back in time. Later
+    dates only exclude a unit whose own service window covers the date.
+    """
+    if event_date < today + timedelta(days=SERVICE_DAYS):
+        return db.and_(_in_service, Equipment.next_maintenance > event_date)
+    return db.and_(
+        Equipment.status.in_(('active', 'maintenance')),
+        db.or_(
+            Equipment.next_maintenance > event_date,
+            Equipment.next_maintenance <= event_date - timedelta(days=SERVICE_DAYS)
+        )
+    )
+
+def register_unit(name: str, equipment_type: str, location: Optional[str] = None,
+                  purchase_date: Optional[date] = None, last_maintenance: Optional[date] = None,
+                  today: Optional[date] = None) -> Equipment:
+    """Add a unit to the fleet, scheduled for service an interval after its last one (or today)"""
+    unit = Equipment(
+        name=name,
+        type=equipment_type,
+        status='active',
+        location=location,
+        purchase_date=purchase_date,
+        last_maintenance=last_maintenance,
+        next_maintenance=(last_maintenance or today or date.today()) + timedelta(days=MAINTENANCE_INTERVAL_DAYS),
+        usage_count=0
+    )
+    db.session.add(unit)
+    return unit
+
+def reserve_unit(booking: Booking, today: Optional[date] = None) -> Optional[int]:
+    """Assign a free booth unit to a booking and count the use against its schedule.
+
+    A unit is free when maintenance does not take it out on the event date
+    and it works no other event that day. The unit with the most time left
+    before its service is picked, which spreads wear across the fleet.
+    Capacity only applies once the fleet has booth units: without any, the
+    booking gets none and None is returned. Raises NoEquipmentAvailable
+    when every unit is taken.
+
+    The assignment is written at once, in a savepoint: when a concurrent
+    confirmation took the same unit first, the unique (event_date,
+    equipment_id) index rejects it and another unit is picked.
+    """
+    if booking.equipment_id is not None:
+        return booking.equipment_id
+
+    today = today or date.today()
+    taken = db.select(Booking.equipment_id).where(
+        Booking.event_date == booking.event_date, Booking.equipment_id.is_not(None)
+    )
+    for _ in range(RESERVE_ATTEMPTS):
+        unit_id = db.session.execute(
+            db.select(Equipment.id)
+            .where(Equipment.type == BOOKED_TYPE, _available_on(booking.event_date, today))
+            .where(Equipment.id.not_in(taken))
+            .order_by(Equipment.next_maintenance.desc())
+            .limit(1)
+        ).scalar()
+        if unit_id is None:
+            fleet = db.session.execute(
+                db.select(Equipment.id).where(Equipment.type == BOOKED_TYPE, Equipment.status != 'retired').limit(1)
+            ).scalar()
+            if fleet is None:
+                return None
+            break
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    db.update(Booking).where(Booking.id == booking.id).values(equipment_id=unit_id)
+                )
+        except IntegrityError:
+            continue  # taken by a concurrent confirmation; pick again
+
+        db.session.execute(
+            db.update(Equipment).where(Equipment.id == unit_id).values(
+                usage_count=db.func.coalesce(Equipment.usage_count, 0) + 1,
+                next_maintenance=db.func.date(Equipment.next_maintenance, f'-{WEAR_DAYS} days')
+                if db.engine.dialect.name == 'sqlite'
+                else Equipment.next_maintenance - timedelta(days=WEAR_DAYS)
+            )
+        )
+        set_committed_value(booking, 'equipment_id', unit_id)
+        return unit_id
+
+    raise NoEquipmentAvailable(f"No {BOOKED_TYPE} available on {booking.event_date.isoformat()}")
+
+def start_maintenance(unit: Equipment):
+    """Take a unit out of service; it stops counting towards near-term booking capacity"""
+    unit.status = 'maintenance'
+
+def complete_maintenance(unit: Equipment, today: Optional[date] = None):
+    """Return a serviced unit with a fresh interval and no usage against it"""
+    today = today or date.today()
+    unit.status = 'active'
+    unit.last_maintenance = today
+    unit.next_maintenance = today + timedelta(days=MAINTENANCE_INTERVAL_DAYS)
+    unit.usage_count = 0
+
+def upcoming_bookings(unit_id: int, today: Optional[date] = None) -> List[int]:
+    """Ids of the unit's bookings from today on, which need another unit while it is serviced"""
+    today = today or date.today()
+    return list(db.session.execute(
+        db.select(Booking.id).where(Booking.equipment_id == unit_id, Booking.event_date >= today)
+        .order_by(Booking.event_date)
+    ).scalars())
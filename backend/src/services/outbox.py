@@ -0,0 +1,192 @@
+from flask import current_app
+from src.models.business import db, Communication
+from src.services.mail import Transport, mail_transport
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+PENDING, SENDING, SENT, FAILED = 'pending', 'sending', 'sent', 'failed'
+
+_outbox = Communication.__table__
+
+def pending(recipient: str, subject: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Outbox fields that queue a new Communication for delivery.
+
+    Write them in the same transaction as the change that calls for the
+    message; a worker delivers it once that commits.
+    """
+    return {
+        'recipient': recipient,
+        'subject': subject,
+        'status': PENDING,
+        'attempts': 0,
+        'next_attempt_at': now or datetime.utcnow(),
+        'sent_at': None
+    }
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next try: exponential in the attempts made, capped and
+    jittered so messages that failed together do not retry together"""
+    config = current_app.config
+    delay = min(config['OUTBOX_RETRY_BASE_SECONDS'] * 2 ** (attempts - 1), config['OUTBOX_RETRY_MAX_SECONDS'])
+    return delay * random.uniform(0.5, 1.0)
+
+def claim(limit: int, now: Optional[datetime] = None):
+    """Lease up to ``limit`` due messages to this worker and commit.
+
+    Claimed rows become 'sending' with ``next_attempt_at`` as the lease
+    expiry; a worker that dies mid-batch leaves them to be claimed again
+    once it passes, so delivery is at least once. Each step is a single
+    statement over the (status, next_attempt_at) index, and SQLite runs
+    writers one at a time, so two workers never claim the same row.
+    """
+    now = now or datetime.utcnow()
+    db.session.execute(
+        db.update(_outbox)
+        .where(_outbox.c.status == SENDING, _outbox.c.next_attempt_at <= now)
+        .values(status=PENDING)
+    )
+    due = (
+        db.select(_outbox.c.id)
+        .where(_outbox.c.status == PENDING, _outbox.c.next_attempt_at <= now)
+        .order_by(_outbox.c.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.session.execute(
+        db.update(_outbox)
+        .where(_outbox.c.id.in_(due.scalar_subquery()))
+        .values(
+            status=SENDING,
+            attempts=db.func.coalesce(_outbox.c.attempts, 0) + 1,
+            next_attempt_at=now + timedelta(seconds=current_app.config['OUTBOX_LEASE_SECONDS'])
+        )
+        .returning(_outbox.c.id, _outbox.c.recipient, _outbox.c.subject, _outbox.c.content, _outbox.c.attempts)
+    ).all()
+    db.session.commit()
+    return rows
+
+def _send(transport: Transport, row) -> Optional[str]:
+    try:
+        transport.send(row.recipient, row.subject or '', row.content or '')
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"[:1000]
+    return None
+
+def deliver_batch(transport: Transport, pool: ThreadPoolExecutor,
+                  now: Optional[datetime] = None) -> Dict[str, int]:
+    """Claim one batch, deliver it on ``pool`` and record the outcome.
+
+    Delivered rows become 'sent'. Failed ones are scheduled again after
+    retry_delay, or marked 'failed' after OUTBOX_MAX_ATTEMPTS. Every claim
+    counts an attempt, so an outcome only applies while the row's attempts
+    still match this worker's claim: a worker that outlived its lease cannot
+    overwrite the outcome of the one that claimed the row after it.
+    """
+    rows = claim(current_app.config['OUTBOX_BATCH_SIZE'], now)
+    counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+    if not rows:
+        return counts
+
+    errors = list(pool.map(_send, [transport] * len(rows), rows))
+    finished = datetime.utcnow()
+    failed = [(row.id, error) for row, error in zip(rows, errors) if error is not None]
+    if failed:
+        logger.warning("%d of %d deliveries failed; communication %s: %s", len(failed), len(rows), *failed[0])
+
+    outcomes = []
+    for row, error in zip(rows, errors):
+        if error is None:
+            outcome, retry_at = SENT, None
+        elif row.attempts >= current_app.config['OUTBOX_MAX_ATTEMPTS']:
+            outcome, retry_at = FAILED, None
+        else:
+            outcome, retry_at = 'retrying', finished + timedelta(seconds=retry_delay(row.attempts))
+        counts[outcome] += 1
+        outcomes.append({
+            'row_id': row.id,
+            'claimed_attempts': row.attempts,
+            'new_status': PENDING if retry_at else outcome,
+            'new_sent_at': finished if error is None else None,
+            'new_next_attempt_at': retry_at,
+            'new_last_error': error
+        })
+
+    db.session.execute(
+        db.update(_outbox)
+        .where(_outbox.c.id == db.bindparam('row_id'), _outbox.c.status == SENDING,
+               _outbox.c.attempts == db.bindparam('claimed_attempts'))
+        .values(status=db.bindparam('new_status'), sent_at=db.bindparam('new_sent_at'),
+                next_attempt_at=db.bindparam('new_next_attempt_at'), last_error=db.bindparam('new_last_error')),
+        outcomes
+    )
+    db.session.commit()
+    return counts
+
+def run_worker(stop: Optional[threading.Event] = None, once: bool = False,
+               transport: Optional[Transport] = None,
+               progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+    """Deliver queued communications until ``stop`` is set.
+
+    Batches follow each other while messages are due; otherwise the worker
+    polls every OUTBOX_POLL_SECONDS. With ``once`` it returns as soon as
+    nothing is due. Returns the totals.
+    """
+    config = current_app.config
+    stop = stop or threading.Event()
+    totals = {'sent': 0, 'retrying': 0, 'failed': 0}
+
+    own_transport = transport is None
+    if own_transport:
+        transport = mail_transport()
+    try:
+        with ThreadPoolExecutor(max_workers=config['OUTBOX_CONCURRENCY'], thread_name_prefix='outbox') as pool:
+            while not stop.is_set():
+                counts = deliver_batch(transport, pool)
+                if any(counts.values()):
+                    for name, count in counts.items():
+                        totals[name] += count
+                    if progress:
+                        progress(totals)
+                    continue
+                if once:
+                    break
+                stop.wait(config['OUTBOX_POLL_SECONDS'])
+    finally:
+        if own_transport:
+            transport.close()
+    return totals
+
+def outbox_counts() -> Dict[str, int]:
+    """Queued communications by status; rows recorded outside the outbox are left out"""
+    rows = db.session.execute(
+        db.select(_outbox.c.status, db.func.count())
+        .where(_outbox.c.status.is_not(None))
+        .group_by(_outbox.c.status)
+    ).all()
+    return {status: 0 for status in (PENDING, SENDING, SENT, FAILED)} | dict(rows)
+
+def requeue_failed(now: Optional[datetime] = None) -> int:
+    """Give messages that ran out of attempts a fresh set"""
+    requeued = db.session.execute(
+        db.update(_outbox).where(_outbox.c.status == FAILED)
+        .values(status=PENDING, attempts=0, next_attempt_at=now or datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return requeued
+
+def init_outbox(app):
+    """Batch size, delivery threads, polling, leases and retry backoff of outbox workers"""
+    app.config.setdefault('OUTBOX_BATCH_SIZE', int(os.environ.get('OUTBOX_BATCH_SIZE', 100)))
+    app.config.setdefault('OUTBOX_CONCURRENCY', int(os.environ.get('OUTBOX_CONCURRENCY', 8)))
+    app.config.setdefault('OUTBOX_POLL_SECONDS', float(os.environ.get('OUTBOX_POLL_SECONDS', 1.0)))
+    app.config.setdefault('OUTBOX_LEASE_SECONDS', int(os.environ.get('OUTBOX_LEASE_SECONDS', 300)))
+    app.config.setdefault('OUTBOX_MAX_ATTEMPTS', int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 6)))
+    app.config.setdefault('OUTBOX_RETRY_BASE_SECONDS', int(os.environ.get('OUTBOX_RETRY_BASE_SECONDS', 30)))
+    app.config.setdefault('OUTBOX_RETRY_MAX_SECONDS', int(os.environ.get('OUTBOX_RETRY_MAX_SECONDS', 3600)))
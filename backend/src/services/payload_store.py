@@ -0,0 +1,149 @@
+from src.models.business import db, DecisionPayload
+from src.extensions.metrics import record_cache
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import threading
+import zlib
+
+CACHE_SIZE = 4096
+_PENDING_KEY = 'decision_payloads_pending'
+
+class _PayloadCache:
+    """Thread-safe LRU of hash -> decompressed JSON text"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Payloads are immutable, so anything cached is known to be committed. Each
+# app keeps its own cache: a hash committed to one database says nothing
+# about another. Hashes written by a session wait in session.info, with the
+# cache they belong to, until its commit succeeds.
+def _cache() -> _PayloadCache:
+    cache = current_app.extensions.get('decision_payloads')
+    if cache is None:
+        cache = current_app.extensions.setdefault('decision_payloads', _PayloadCache(CACHE_SIZE))
+    return cache
+
+@event.listens_for(Session, 'after_commit')
+def _promote_pending(session):
+    cache, pending = session.info.pop(_PENDING_KEY, (None, {}))
+    for key, text in pending.items():
+        cache.put(key, text)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+def _pending() -> Dict[str, str]:
+    return db.session.info.setdefault(_PENDING_KEY, (_cache(), {}))[1]
+
+def canonical_json(obj: Any) -> str:
+    """Stable JSON text so equal payloads always hash the same"""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+def payload_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _insert_ignoring_duplicates(rows: List[Dict[str, Any]]):
+    """Insert payload rows, tolerating a concurrent writer storing the same hash"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        db.session.execute(db.insert(DecisionPayload), rows)
+        return
+    db.session.execute(insert(DecisionPayload).on_conflict_do_nothing(index_elements=['hash']), rows)
+
+def store_payloads(objects: Iterable[Any]) -> List[Optional[str]]:
+    """Store JSON-serialisable payloads by content hash and return the hashes.
+
+    ``None`` maps to ``None``. Payloads already present are not written
+    again; the new rows join the caller's transaction.
+    """
+    hashes = []
+    unknown = {}
+    cache = _cache()
+    session_pending = _pending()
+    for obj in objects:
+        if obj is None:
+            hashes.append(None)
+            continue
+        text = canonical_json(obj)
+        key = payload_hash(text)
+        hashes.append(key)
+        if key not in unknown and key not in session_pending and cache.get(key) is None:
+            unknown[key] = text
+
+    if unknown:
+        existing = set(db.session.execute(
+            db.select(DecisionPayload.hash).where(DecisionPayload.hash.in_(list(unknown)))
+        ).scalars())
+        now = datetime.utcnow()
+        rows = [
+            {'hash': key, 'data': zlib.compress(text.encode('utf-8')), 'created_at': now}
+            for key, text in unknown.items()
+            if key not in existing
+        ]
+        if rows:
+            _insert_ignoring_duplicates(rows)
+        session_pending.update(unknown)
+
+    return hashes
+
+def load_payloads(hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Batch-resolve hashes to their JSON text, fetching each unique miss once"""
+    result = {}
+    missing = set()
+    cache = _cache()
+    session_pending = db.session.info.get(_PENDING_KEY, (None, {}))[1]
+    for key in hashes:
+        if not key or key in result:
+            continue
+        text = cache.get(key) or session_pending.get(key)
+        if text is None:
+            missing.add(key)
+        else:
+            result[key] = text
+    record_cache('decision_payloads', len(result), len(missing))
+
+    if missing:
+        rows = db.session.execute(
+            db.select(DecisionPayload.hash, DecisionPayload.data).where(DecisionPayload.hash.in_(list(missing)))
+        ).all()
+        for key, data in rows:
+            text = zlib.decompress(data).decode('utf-8')
+            cache.put(key, text)
+            result[key] = text
+
+    return result
+
+def clear_cache():
+    _cache().clear()
@@ -0,0 +1,205 @@
+from flask import current_app
+from src.models.business import db, Booking, BOOKED_STATUSES
+from src.services.booking_archive import booking_history
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Package price by duration in hours
+BASE_PRICES = {2: 498, 3: 747, 4: 996, 5: 1245}
+DEFAULT_DURATION = 3
+
+HISTORY_DAYS = 730   # bookings that shape the seasonal and weekday demand
+HORIZON_DAYS = 365   # event dates priced ahead in the quote table
+
+# Demand moves prices by a quarter of its deviation from normal, within these bounds
+SENSITIVITY = 0.25
+MIN_MULTIPLIER, MAX_MULTIPLIER = 0.95, 1.15
+
+# Pseudo-count pulling thin history towards normal demand
+SMOOTHING = 5
+
+# A date's bookings so far are compared with the same weekday this many weeks either side
+LOAD_WEEKS = 4
+
+DEMAND_STATUSES = ('inquiry',) + BOOKED_STATUSES
+
+def base_price(duration: int) -> int:
+    return BASE_PRICES.get(duration, BASE_PRICES[DEFAULT_DURATION])
+
+def _index(counts: Dict[Any, int], keys) -> Dict[Any, float]:
+    """Each key's count relative to the mean over ``keys``, smoothed towards 1"""
+    mean = sum(counts.get(key, 0) for key in keys) / len(keys)
+    return {key: (counts.get(key, 0) + SMOOTHING) / (mean + SMOOTHING) for key in keys}
+
+def _multiplier(demand: float) -> float:
+    return round(min(MAX_MULTIPLIER, max(MIN_MULTIPLIER, 1 + SENSITIVITY * (demand - 1))), 3)
+
+class QuoteTable:
+    """Demand multipliers for every event date in the horizon, by event type.
+
+    Built from two grouped aggregations over Booking: one over the history
+    window by event type, month and weekday, one over the horizon by event
+    date. Demand for a date combines how busy the event type usually is in
+    that month, how busy that weekday usually is, and how full the date
+    already is compared with the same weekday in the surrounding weeks.
+    Dates outside the horizon get the seasonal part alone.
+    """
+
+    def __init__(self, today: date, history, booked):
+        self.today = today
+        self.built_at = time.monotonic()
+
+        by_type_month = defaultdict(int)
+        by_weekday = defaultdict(int)
+        for event_type, month, weekday, count in history:
+            by_type_month[event_type, int(month)] += count
+            by_type_month[None, int(month)] += count
+            by_weekday[int(weekday)] += count
+        months = range(1, 13)
+        self.event_types = sorted({event_type for event_type, _ in by_type_month if event_type is not None})
+        self.seasonal = {
+            event_type: _index({month: by_type_month[event_type, month] for month in months}, months)
+            for event_type in self.event_types + [None]
+        }
+        # SQLite and PostgreSQL number weekdays from Sunday = 0
+        self.weekday = _index(by_weekday, range(7))
+
+        booked = {(day if isinstance(day, date) else date.fromisoformat(str(day))): count for day, count in booked}
+        horizon = [today + timedelta(days=offset) for offset in range(HORIZON_DAYS)]
+        self.load = {}
+        for day in horizon:
+            # Neighbouring same weekdays have a similar lead time, so dates
+            # near today are not priced up just for being booked earlier
+            neighbours = [day + timedelta(weeks=week) for week in range(-LOAD_WEEKS, LOAD_WEEKS + 1) if week]
+            neighbours = [other for other in neighbours if today <= other < horizon[-1]] or [day]
+            expected = sum(booked.get(other, 0) for other in neighbours) / len(neighbours)
+            self.load[day] = (booked.get(day, 0) + SMOOTHING) / (expected + SMOOTHING)
+        self.multipliers = {
+            (day, event_type): self._demand_multiplier(day, event_type, self.load[day])
+            for day in horizon for event_type in self.event_types + [None]
+        }
+
+    def _demand_multiplier(self, day: date, event_type: Optional[str], load: float = 1.0) -> float:
+        seasonal = self.seasonal.get(event_type, self.seasonal[None])
+        return _multiplier(seasonal[day.month] * self.weekday[_weekday(day)] * load)
+
+    def multiplier(self, event_type: str, event_date: date) -> float:
+        found = self.multipliers.get((event_date, event_type))
+        if found is None:
+            found = self.multipliers.get((event_date, None))
+        if found is None:
+            found = self._demand_multiplier(event_date, event_type)
+        return found
+
+    def quote(self, event_type: str, event_date: date, duration: int) -> Dict[str, Any]:
+        base = base_price(duration)
+        multiplier = self.multiplier(event_type, event_date)
+        return {
+            'base_price': base,
+            'demand_multiplier': multiplier,
+            'price': round(base * multiplier)
+        }
+
+    def average_multiplier(self) -> float:
+        """Mean multiplier over the horizon, all event types alike"""
+        return round(sum(self.multipliers.values()) / len(self.multipliers), 3)
+
+    def summary(self) -> Dict[str, Any]:
+        """Mean multiplier per event type and month over the horizon"""
+        totals = defaultdict(list)
+        for (day, event_type), multiplier in self.multipliers.items():
+            totals[event_type or 'other', day.strftime('%Y-%m')].append(multiplier)
+        by_type = defaultdict(dict)
+        for (event_type, month), values in sorted(totals.items()):
+            by_type[event_type][month] = round(sum(values) / len(values), 3)
+        return dict(by_type)
+
+def _weekday(day: date) -> int:
+    return (day.weekday() + 1) % 7
+
+def build_quote_table(today: Optional[date] = None) -> QuoteTable:
+    """Aggregate booking demand into a fresh quote table (two queries)"""
+    today = today or date.today()
+    # Two years back reaches past the archive cutoff, so read the history view
+    past = booking_history.c
+    month = db.extract('month', past.event_date)
+    weekday = db.extract('dow', past.event_date)
+    history = db.session.execute(
+        db.select(past.event_type, month, weekday, db.func.count())
+        .where(past.event_date >= today - timedelta(days=HISTORY_DAYS), past.event_date < today)
+        .where(past.status.in_(DEMAND_STATUSES))
+        .group_by(past.event_type, month, weekday)
+    ).all()
+    booked = db.session.execute(
+        db.select(Booking.event_date, db.func.count())
+        .where(Booking.event_date >= today, Booking.event_date < today + timedelta(days=HORIZON_DAYS))
+        .where(Booking.status.in_(DEMAND_STATUSES))
+        .group_by(Booking.event_date)
+    ).all()
+    return QuoteTable(today, history, booked)
+
+class QuoteCache:
+    """The app's current quote table, rebuilt once it is ``max_age`` seconds old.
+
+    Each worker process keeps its own. A stale table is rebuilt by a
+    background thread while every caller keeps quoting from it, so no
+    request waits for the GROUP BYs; only the very first build, and an
+    explicit refresh, make the caller wait.
+    """
+
+    def __init__(self, app, max_age: float):
+        self.app = app
+        self.max_age = max_age
+        self._table: Optional[QuoteTable] = None
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            # A rebuild running in the parent does not exist in the child
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+
+    def get(self, refresh: bool = False) -> QuoteTable:
+        table = self._table
+        if table is None or refresh:
+            with self._lock:
+                if self._table is table or refresh:
+                    self._table = build_quote_table()
+                return self._table
+        stale = table.today != date.today() or time.monotonic() - table.built_at > self.max_age
+        # The rebuild thread releases the lock once the new table is in place
+        if stale and self._lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild, name='quote-table-rebuild', daemon=True).start()
+        return table
+
+    def _rebuild(self):
+        try:
+            with self.app.app_context():
+                try:
+                    self._table = build_quote_table()
+                finally:
+                    db.session.remove()
+        except Exception:
+            logger.exception("Failed to rebuild the quote table; quoting from the previous one")
+        finally:
+            self._lock.release()
+
+def init_pricing(app):
+    """Keep a quote table per process, refreshed every PRICING_REFRESH_SECONDS"""
+    app.config.setdefault('PRICING_REFRESH_SECONDS', int(os.environ.get('PRICING_REFRESH_SECONDS', 900)))
+    app.extensions['pricing'] = QuoteCache(app, app.config['PRICING_REFRESH_SECONDS'])
+
+def quote_table(refresh: bool = False) -> QuoteTable:
+    """The current app's quote table; ``refresh`` rebuilds it first"""
+    return current_app.extensions['pricing'].get(refresh)
+
+def quote_price(event_type: str, event_date: date, duration: int) -> Dict[str, Any]:
+    """Demand-adjusted price for an event: a lookup in the current quote table"""
+    return quote_table().quote(event_type, event_date, duration)
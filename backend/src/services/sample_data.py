@@ -0,0 +1,321 @@
+from src.models.business import (
+    db, Customer, Booking, BookingArchive, Communication, StaffMember, Equipment, BusinessMetrics
+)
+from src.services.decision_log import insert_entries
+from src.services.pricing import BASE_PRICES
+from src.services.staff_stats import rebuild_staff_summary
+from src.ai_executives_enhanced import AIExecutiveTeam
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional
+import random
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Preset sizes; any count can also be given directly
+SCALES = {
+    'demo': {'customers': 200, 'staff': 5, 'equipment': 8, 'decisions': 500},
+    'small': {'customers': 10_000, 'staff': 25, 'equipment': 40, 'decisions': 20_000},
+    'large': {'customers': 1_000_000, 'staff': 200, 'equipment': 300, 'decisions': 1_000_000},
+}
+
+FIRST_NAMES = ['Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Mateo', 'Sophia', 'Lucas', 'Mia', 'Ethan',
+               'Isabella', 'Mason', 'Amelia', 'Logan', 'Harper', 'Elijah', 'Aria', 'James', 'Chloe', 'Wei',
+               'Priya', 'Omar', 'Fatima', 'Hiro', 'Sofia', 'Diego', 'Grace', 'Kwame', 'Nora', 'Ivan']
+LAST_NAMES = ['Smith', 'Johnson', 'Garcia', 'Chen', 'Williams', 'Brown', 'Martinez', 'Nguyen', 'Patel',
+              'Kim', 'Lopez', 'Davis', 'Rodriguez', 'Miller', 'Wilson', 'Anderson', 'Thomas', 'Taylor',
+              'Moore', 'Okafor', 'Hernandez', 'Singh', 'Khan', 'Rossi', 'Silva', 'Cohen', 'Murphy', 'Lee']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Events', 'Stark Industries', 'Wayne Enterprises']
+VENUES = ['The Grand Ballroom', 'Riverside Hall', 'City Garden Pavilion', 'The Hilton', 'Oak Barn',
+          'Harbor View Terrace', 'Community Center', 'Private Residence', 'Rooftop Lounge', 'Country Club']
+LOCATIONS = ['Downtown', 'Northside', 'Riverside', 'Airport', 'Westfield']
+BACKDROPS = ['white', 'black', 'gold sequin', 'floral wall', 'green screen', 'rose gold']
+
+# event type -> (share of bookings, typical guest count, relative demand by month Jan..Dec)
+EVENT_TYPES = {
+    'wedding': (0.34, 130, (2, 2, 4, 6, 9, 10, 9, 9, 10, 10, 5, 3)),
+    'corporate': (0.22, 90, (5, 6, 7, 7, 6, 5, 3, 3, 7, 7, 8, 10)),
+    'birthday': (0.18, 40, (6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6, 6)),
+    'graduation': (0.08, 60, (1, 1, 1, 3, 10, 10, 3, 1, 1, 1, 1, 2)),
+    'holiday_party': (0.07, 75, (1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 4, 10)),
+    'anniversary': (0.06, 50, (5, 6, 5, 5, 6, 6, 6, 6, 6, 5, 5, 6)),
+    'prom': (0.05, 200, (0, 0, 3, 10, 8, 1, 0, 0, 0, 0, 0, 0)),
+}
+DURATION_WEIGHTS = {2: 20, 3: 40, 4: 28, 5: 12}
+LEAD_DAYS = {'wedding': (60, 400), 'corporate': (14, 120), 'prom': (30, 150)}
+DEFAULT_LEAD_DAYS = (7, 90)
+
+STAFF_ROLES = {
+    'Lead Photographer': (0.2, 3500.0),
+    'Assistant Photographer': (0.35, 2800.0),
+    'Equipment Technician': (0.2, 2200.0),
+    'Event Coordinator': (0.15, 3000.0),
+    'Booth Attendant': (0.1, 2000.0),
+}
+EQUIPMENT_TYPES = {
+    'camera': ['Canon EOS R5', 'Sony A7 IV', 'Nikon Z6 II'],
+    'printer': ['DNP DS620', 'Mitsubishi CP-D90'],
+    'lighting': ['Professional Lighting Kit', 'LED Ring Light', 'Softbox Pair'],
+    'backdrop': ['Backdrop Stand System', 'Sequin Backdrop', 'Flower Wall Panel'],
+    'booth': ['Open Air Booth', 'Enclosed Booth Shell', 'Mirror Booth'],
+}
+
+def _weighted(rng: random.Random, weights: Dict[Any, float]):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+class _Generator:
+    """Seeded row factories; the same seed and anchor date give the same rows"""
+
+    def __init__(self, seed: int, today: date, history_days: int, future_days: int):
+        self.rng = random.Random(seed)
+        self.today = today
+        self.history_days = history_days
+        self.future_days = future_days
+        self.event_shares = {name: spec[0] for name, spec in EVENT_TYPES.items()}
+        self.revenue_by_day = defaultdict(float)
+        executives = AIExecutiveTeam().executives
+        self.roles = list(executives)
+        self.fallbacks = {role: executive._fallback_decision for role, executive in executives.items()}
+
+    def timestamp(self, day: date) -> datetime:
+        return datetime.combine(day, time(self.rng.randrange(8, 22), self.rng.randrange(60), self.rng.randrange(60)))
+
+    def event_date(self, event_type: str) -> date:
+        """Event date in the window, drawn with the event type's seasonality"""
+        months = EVENT_TYPES[event_type][2]
+        peak = max(months)
+        while True:
+            day = self.today + timedelta(days=self.rng.randrange(-self.history_days, self.future_days + 1))
+            if self.rng.random() * peak < months[day.month - 1]:
+                return day
+
+    def customer(self, customer_id: int) -> Dict[str, Any]:
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created = self.timestamp(self.today - timedelta(days=rng.randrange(self.history_days + 1)))
+        return {
+            'id': customer_id,
+            'name': f'{first} {last}',
+            'email': f'{first}.{last}.{customer_id}@example.com'.lower(),
+            'phone': f'555-{rng.randrange(10000):04d}' if rng.random() < 0.8 else None,
+            'company': rng.choice(COMPANIES) if rng.random() < 0.15 else None,
+            'preferred_contact': _weighted(rng, {'email': 70, 'phone': 20, 'sms': 10}),
+            'created_at': created,
+            'updated_at': created
+        }
+
+    def booking(self, booking_id: int, customer_id: int) -> Dict[str, Any]:
+        rng = self.rng
+        event_type = _weighted(rng, self.event_shares)
+        event_date = self.event_date(event_type)
+        low, high = LEAD_DAYS.get(event_type, DEFAULT_LEAD_DAYS)
+        created_at = self.timestamp(event_date - timedelta(days=rng.randrange(low, high + 1)))
+        duration = _weighted(rng, DURATION_WEIGHTS)
+        base_price = float(BASE_PRICES[duration])
+
+        if event_date < self.today:
+            status = _weighted(rng, {'confirmed': 85, 'cancelled': 7, 'inquiry': 8})
+        else:
+            status = _weighted(rng, {'confirmed': 55, 'inquiry': 45})
+        final_price = round(base_price * rng.uniform(0.95, 1.15), 2) if status == 'confirmed' else None
+        confirmed_at = None
+        if status == 'confirmed':
+            confirmed_at = created_at + timedelta(days=rng.randrange(1, 15), minutes=rng.randrange(1440))
+            if event_date < self.today:
+                self.revenue_by_day[event_date] += final_price
+
+        guests = EVENT_TYPES[event_type][1]
+        return {
+            'id': booking_id,
+            'customer_id': customer_id,
+            'event_type': event_type,
+            'event_date': event_date,
+            'event_time': time(rng.choice([10, 12, 14, 16, 18, 19, 20]), rng.choice([0, 30])),
+            'duration_hours': duration,
+            'venue': rng.choice(VENUES),
+            'guest_count': max(5, int(rng.gauss(guests, guests / 3))),
+            'backdrop_color': rng.choice(BACKDROPS),
+            'photo_layout': _weighted(rng, {'horizontal': 60, 'vertical': 30, 'grid': 10}),
+            'special_requests': rng.choice(['', '', 'Props please', 'Custom logo on prints', 'Extra attendant']),
+            'base_price': base_price,
+            'final_price': final_price,
+            'status': status,
+            'created_at': created_at,
+            'confirmed_at': confirmed_at
+        }
+
+    def communications(self, booking: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The messages a booking's lifecycle produces up to today"""
+        created, now = booking['created_at'], datetime.combine(self.today, time())
+        messages = [('ai_response', created, 'Thank you for your inquiry!')]
+        if booking['confirmed_at'] is not None:
+            messages.append(('email', booking['confirmed_at'], 'Your booking is confirmed.'))
+            event = datetime.combine(booking['event_date'], time(9))
+            messages.append(('sms', event - timedelta(days=2), 'Reminder: your event is in two days.'))
+            messages.append(('email', event + timedelta(days=2), 'Your photos are ready to download.'))
+        elif self.rng.random() < 0.5:
+            messages.append(('email', created + timedelta(days=3), 'Following up on your inquiry.'))
+        return [
+            {
+                'customer_id': booking['customer_id'],
+                'booking_id': booking['id'],
+                'message_type': message_type,
+                'content': content,
+                'sent_at': sent_at
+            }
+            for message_type, sent_at, content in messages
+            if sent_at <= now
+        ]
+
+    def staff(self) -> Dict[str, Any]:
+        rng = self.rng
+        role = _weighted(rng, {name: spec[0] for name, spec in STAFF_ROLES.items()})
+        hired = self.today - timedelta(days=rng.randrange(30, 2000))
+        return {
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'role': role,
+            'status': 'active' if rng.random() < 0.9 else 'inactive',
+            'base_salary': STAFF_ROLES[role][1] + rng.randrange(0, 600, 50),
+            'profit_share': 0.0,
+            'performance_score': round(min(100.0, max(60.0, rng.gauss(92, 4))), 1),
+            'events_completed': (self.today - hired).days // rng.randrange(7, 21),
+            'hire_date': hired,
+            'created_at': self.timestamp(hired)
+        }
+
+    def equipment(self, index: int) -> Dict[str, Any]:
+        rng = self.rng
+        equipment_type = rng.choice(list(EQUIPMENT_TYPES))
+        purchased = self.today - timedelta(days=rng.randrange(30, 1500))
+        serviced = self.today - timedelta(days=rng.randrange(0, 120))
+        return {
+            'name': f'{rng.choice(EQUIPMENT_TYPES[equipment_type])} #{index}',
+            'type': equipment_type,
+            'status': _weighted(rng, {'active': 85, 'maintenance': 10, 'retired': 5}),
+            'purchase_date': purchased,
+            'location': rng.choice(LOCATIONS),
+            'last_maintenance': max(serviced, purchased),
+            'next_maintenance': serviced + timedelta(days=rng.choice([90, 180])),
+            'usage_count': 0,
+            'created_at': self.timestamp(purchased)
+        }
+
+    def decision(self) -> Dict[str, Any]:
+        """An audit entry shaped like the ones the API records"""
+        rng = self.rng
+        event_type = _weighted(rng, self.event_shares)
+        duration = _weighted(rng, DURATION_WEIGHTS)
+        context = rng.choice([
+            {'type': 'pricing', 'event_type': event_type, 'duration': duration,
+             'base_price': BASE_PRICES[duration]},
+            {'type': 'customer_response', 'customer_profile': {
+                'event_type': event_type, 'budget_indicator': BASE_PRICES[duration], 'special_requests': ''}},
+            {'type': 'booking_confirmation', 'booking_details': {
+                'event_type': event_type, 'final_price': BASE_PRICES[duration]}},
+            {'type': 'profit_distribution', 'total_profit': rng.randrange(5000, 50000, 250)},
+            {'type': 'pricing_optimization', 'current_metrics': {
+                'market_demand': rng.choice(['low', 'medium', 'high'])}},
+        ])
+        role = rng.choice(self.roles)
+        decision = self.fallbacks[role](context)
+        return {
+            'executive_role': role,
+            'decision_type': context['type'],
+            'context': context,
+            'decision': decision,
+            'impact_level': decision.get('impact_level', 'Medium'),
+            'created_at': self.timestamp(self.today - timedelta(days=rng.randrange(self.history_days + 1)))
+        }
+
+def _next_id(*models) -> int:
+    """One past the highest id in any of ``models``"""
+    return max(db.session.scalar(db.select(db.func.max(model.id))) or 0 for model in models) + 1
+
+def _insert(model, rows: List[Dict[str, Any]]):
+    if rows:
+        # Core executemany: no ORM bookkeeping for rows nobody reads back
+        db.session.execute(model.__table__.insert(), rows)
+
+def generate_sample_data(customers: int = 0, staff: int = 0, equipment: int = 0, decisions: int = 0,
+                         seed: int = 42, history_days: int = 730, future_days: int = 365,
+                         today: Optional[date] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         progress: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+    """Append a seeded synthetic dataset and return the rows inserted per table.
+
+    Customers make one to a few bookings whose event types, seasons, lead
+    times, durations and statuses follow the distributions above; each
+    booking brings the communications its lifecycle would have sent so far.
+    Daily business metrics cover the history window with the revenue of the
+    bookings generated in it. Rows go in with executemany inserts, one
+    transaction per ``chunk_size`` customers (or decisions), so millions of
+    rows load in minutes and an interrupted run keeps the chunks it
+    committed. The same arguments (including ``today``) always produce the
+    same rows.
+    """
+    generator = _Generator(seed, today or date.today(), history_days, future_days)
+    counts = defaultdict(int)
+
+    def committed(table: str, rows: int):
+        counts[table] += rows
+        if progress is not None:
+            progress(table, counts[table])
+
+    staff_rows = [generator.staff() for _ in range(staff)]
+    _insert(StaffMember, staff_rows)
+    if staff_rows:
+        rebuild_staff_summary()
+    first_equipment = _next_id(Equipment)
+    _insert(Equipment, [generator.equipment(first_equipment + index) for index in range(equipment)])
+    db.session.commit()
+    committed('staff', staff)
+    committed('equipment', equipment)
+
+    customer_id, booking_id = _next_id(Customer), _next_id(Booking, BookingArchive)
+    for start in range(0, customers, chunk_size):
+        customer_rows, booking_rows, communication_rows = [], [], []
+        for _ in range(min(chunk_size, customers - start)):
+            customer_rows.append(generator.customer(customer_id))
+            # Mostly one-off customers, with a tail of repeat bookers
+            for _ in range(min(5, 1 + int(generator.rng.expovariate(1.6)))):
+                booking = generator.booking(booking_id, customer_id)
+                booking_rows.append(booking)
+                communication_rows.extend(generator.communications(booking))
+                booking_id += 1
+            customer_id += 1
+        _insert(Customer, customer_rows)
+        _insert(Booking, booking_rows)
+        _insert(Communication, communication_rows)
+        db.session.commit()
+        committed('communications', len(communication_rows))
+        committed('bookings', len(booking_rows))
+        committed('customers', len(customer_rows))
+
+    if customers:
+        scores = [row['performance_score'] for row in staff_rows] or [95.0]
+        first_day = generator.today - timedelta(days=history_days)
+        # Days that already have metrics (from an earlier run) keep them
+        existing = set(db.session.scalars(db.select(BusinessMetrics.date).where(BusinessMetrics.date >= first_day)))
+        metrics = []
+        for offset in range(history_days, 0, -1):
+            day = generator.today - timedelta(days=offset)
+            if day in existing:
+                continue
+            revenue = round(generator.revenue_by_day.get(day, 0.0), 2)
+            metrics.append({
+                'date': day,
+                'total_revenue': revenue,
+                'profit_distributed': round(revenue * 0.7, 2),
+                'staff_count': max(len(staff_rows), 1),
+                'average_performance': round(sum(scores) / len(scores) + generator.rng.uniform(-1, 1), 2),
+                'created_at': datetime.combine(day, time(23, 59))
+            })
+        _insert(BusinessMetrics, metrics)
+        db.session.commit()
+        committed('business_metrics', len(metrics))
+
+    for start in range(0, decisions, chunk_size):
+        insert_entries([generator.decision() for _ in range(min(chunk_size, decisions - start))])
+        db.session.commit()
+        committed('ai_decisions', min(chunk_size, decisions - start))
+
+    return dict(counts)
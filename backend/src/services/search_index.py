@@ -0,0 +1,262 @@
+from src.models.business import db
+from typing import Any, Dict, List, Optional
+import html
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'search_index'
+MAX_RESULTS = 100
+# Matches considered for ranking: the newest ones, plus the newest whose title matches
+CANDIDATES = 100
+# Titles weigh ten times the body; k1 and b are BM25's usual defaults
+TITLE_WEIGHT = 10.0
+BM25_K1, BM25_B = 1.2, 0.75
+
+# One FTS5 table indexes every searchable row; rowid = source id * 4 + kind,
+# so a hit maps back to its row without a lookup table. Archived bookings
+# keep their ids, so they get a kind of their own and are found as bookings.
+KINDS = {'customer': 1, 'booking': 2, 'communication': 3, 'booking_archive': 0}
+_KIND_NAMES = {1: 'customer', 2: 'booking', 3: 'communication', 0: 'booking'}
+TYPES = ('customer', 'booking', 'communication')
+
+_BOOKING_TITLE = "{row}.event_type || ' at ' || coalesce({row}.venue, '')"
+_BOOKING_BODY = "coalesce({row}.backdrop_color, '') || ' ' || coalesce({row}.special_requests, '')"
+_BOOKING_COLUMNS = ('event_type', 'venue', 'backdrop_color', 'special_requests')
+
+# kind -> (source table, title expression, body expression, columns that feed them)
+DOCUMENTS = {
+    'customer': (
+        'customer',
+        "{row}.name",
+        "coalesce({row}.email, '') || ' ' || coalesce({row}.company, '')",
+        ('name', 'email', 'company'),
+    ),
+    'booking': ('booking', _BOOKING_TITLE, _BOOKING_BODY, _BOOKING_COLUMNS),
+    'communication': (
+        'communication',
+        "{row}.message_type",
+        "coalesce({row}.content, '')",
+        ('message_type', 'content'),
+    ),
+    # Archiving deletes the booking, dropping its entry, and inserts it here
+    'booking_archive': ('booking_archive', _BOOKING_TITLE, _BOOKING_BODY, _BOOKING_COLUMNS),
+}
+
+# Dropped from queries so natural phrasing still matches ("the wedding at the
+# Hilton with the gold backdrop"); every booking has a backdrop, so the word
+# is not indexed and would only slow the query down
+STOPWORDS = frozenset('a an and at backdrop by for from in of on or that the to with'.split())
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Snippet markers that cannot occur in stored text; swapped for <mark> after escaping
+_OPEN, _CLOSE = '\x02', '\x03'
+
+# Prefix indexes up to 8 characters let a half-typed last word be read off
+# one doclist instead of merging every word that starts with it; a common
+# prefix otherwise costs 5-15 ms on a large index. They add about a third
+# to its size.
+_CREATE = (
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4 5 6 7 8')"
+)
+
+def _statements(kind: str) -> List[str]:
+    table, title, body, columns = DOCUMENTS[kind]
+    number = KINDS[kind]
+    insert = (
+        f"INSERT INTO {TABLE}(rowid, title, body) VALUES "
+        f"(new.id * 4 + {number}, {title.format(row='new')}, {body.format(row='new')});"
+    )
+    delete = f"DELETE FROM {TABLE} WHERE rowid = old.id * 4 + {number};"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_{table}_update AFTER UPDATE OF {', '.join(columns)} "
+        f"ON {table} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+
+def _backfill(connection, kinds=DOCUMENTS):
+    for kind in kinds:
+        table, title, body, _ = DOCUMENTS[kind]
+        connection.exec_driver_sql(
+            f"INSERT INTO {TABLE}(rowid, title, body) "
+            f"SELECT id * 4 + {KINDS[kind]}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+        )
+
+def _untracked(connection) -> List[str]:
+    """Kinds whose insert trigger is missing: new kinds, or tables rebuilt since"""
+    triggers = {name for (name,) in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?", (f'{TABLE}_%',)
+    )}
+    return [kind for kind, (table, *_) in DOCUMENTS.items() if f'{TABLE}_{table}_insert' not in triggers]
+
+def _drop_index(connection):
+    for (name,) in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?", (f'{TABLE}_%',)
+    ).all():
+        connection.exec_driver_sql(f"DROP TRIGGER {name}")
+    connection.exec_driver_sql(f"DROP TABLE {TABLE}")
+
+def ensure_search_index() -> bool:
+    """Create the FTS5 index and the triggers that keep it in sync.
+
+    Inserts, updates of the indexed columns and deletes on customer, booking
+    and communication rows, and on archived bookings, update the index in
+    the same transaction, bulk inserts included. An index created on an
+    existing database is filled from the source tables once, and so is a
+    kind whose triggers are missing (added since, or dropped by a table
+    rebuild). An index built with an older definition is dropped and built
+    again. Returns whether search is available: it needs SQLite built with
+    FTS5.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    with db.engine.begin() as connection:
+        existing = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE,)
+        ).scalar()
+        if existing is not None and existing != _CREATE:
+            logger.info("Rebuilding %s with its current definition", TABLE)
+            _drop_index(connection)
+        created = existing != _CREATE
+        if created:
+            try:
+                connection.exec_driver_sql(_CREATE)
+            except Exception as e:
+                logger.warning("Full-text search disabled: %s", e)
+                return False
+        untracked = list(DOCUMENTS) if created else _untracked(connection)
+        for kind in untracked:
+            if not created:
+                connection.exec_driver_sql(f"DELETE FROM {TABLE} WHERE rowid % 4 = {KINDS[kind]}")
+            for statement in _statements(kind):
+                connection.exec_driver_sql(statement)
+        _backfill(connection, untracked)
+    return True
+
+def rebuild_search_index():
+    """Re-index every source row from scratch"""
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(f"DELETE FROM {TABLE}")
+        _backfill(connection)
+        connection.exec_driver_sql(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+
+def optimize_search_index():
+    """Merge the index's segments; worth running after bulk loads"""
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+
+def match_expression(text: str, column: Optional[str] = None) -> Optional[str]:
+    """FTS5 query for free text: every word must match, the last as a prefix.
+
+    Earlier words are taken as typed, so FTS5 reads each straight off the
+    index instead of merging every term that starts with it; the last may
+    still be half-typed (``garc`` finds Garcia). Words are quoted, so FTS5
+    operators and punctuation in the input are taken literally. With
+    ``column`` every word must match in that column. Returns None when
+    nothing searchable is left.
+    """
+    words = [word for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+    if not words:
+        return None
+    terms = ' '.join([f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*'])
+    return f'{column} : ({terms})' if column else terms
+
+def _snippet_html(snippet: str) -> str:
+    return html.escape(snippet).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+_MARKED = re.compile(f'{_OPEN}(.*?){_CLOSE}', re.DOTALL)
+
+def _bm25(marked: str, average: float) -> float:
+    """BM25 term-frequency part for one column, from its highlighted text.
+
+    Lengths are counted in characters, which is close enough to words for
+    normalising and saves tokenizing every candidate.
+    """
+    marks = marked.count(_OPEN)
+    if not marks:
+        return 0.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(marked) / average)
+    terms = [term.lower() for term in _MARKED.findall(marked)] if marks > 1 else ()
+    distinct = set(terms)
+    if len(distinct) == len(terms):  # each word once, the usual case
+        return marks * (BM25_K1 + 1) / (1 + norm)
+    return sum(tf * (BM25_K1 + 1) / (tf + norm) for tf in map(terms.count, distinct))
+
+def _rank(candidates) -> List[tuple]:
+    """(score, rowid, title, snippet) per candidate, best (lowest) first"""
+    average_title = sum(len(title) for _, title, _, _ in candidates) / len(candidates) or 1
+    average_body = sum(len(body) for _, _, body, _ in candidates) / len(candidates) or 1
+    ranked = []
+    for rowid, title, body, snippet in candidates:
+        score = TITLE_WEIGHT * _bm25(title, average_title) + _bm25(body, average_body)
+        ranked.append((-score, rowid, title, snippet))
+    ranked.sort(key=lambda hit: (hit[0], -hit[1]))  # ties: newest first
+    return [
+        (score, rowid, title.replace(_OPEN, '').replace(_CLOSE, ''), snippet)
+        for score, rowid, title, snippet in ranked
+    ]
+
+def search(text: str, kinds: Optional[List[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Best matches for ``text``, ranked by BM25 with titles weighted up.
+
+    Only two sets of candidates are read: the newest CANDIDATES matches,
+    which FTS5 yields in rowid order for free, and the newest CANDIDATES
+    older matches whose title holds every word. The second set keeps an
+    older record whose title matches (a long-standing customer's name, say)
+    from being crowded out by newer text that only mentions it; those are
+    found through the title alone, so only their title counts. Candidates
+    are ranked here, by BM25 without its IDF factor: FTS5's bm25() reads
+    every posting of every word to count the documents each occurs in,
+    which for a common word costs far more than the query itself. Each
+    candidate matches every word, so IDF would mostly shift all scores
+    alike. Each hit carries its type, source id, title, an HTML snippet of
+    the best-matching column with the matched words in ``<mark>``
+    (everything else escaped) and its score (lower is better). Archived
+    bookings are found too, as bookings.
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    for kind in kinds or ():
+        if kind not in TYPES:
+            raise ValueError(f"Unknown type: {kind}")
+
+    kind_filter = ''
+    numbers = [number for number, name in _KIND_NAMES.items() if not kinds or name in kinds]
+    if len(numbers) < len(_KIND_NAMES):
+        kind_filter = f" AND rowid % 4 IN ({', '.join(map(str, sorted(numbers)))})"
+    columns = (
+        f"rowid, highlight({TABLE}, 0, '{_OPEN}', '{_CLOSE}'), highlight({TABLE}, 1, '{_OPEN}', '{_CLOSE}'), "
+        f"snippet({TABLE}, -1, '{_OPEN}', '{_CLOSE}', '…', 12)"
+    )
+    # Title matches at or above the oldest of the newest are among them
+    # already; when the newest hold every match, nothing older is left
+    candidates = db.session.execute(db.text(
+        f"WITH newest AS MATERIALIZED ("
+        f"SELECT {columns} FROM {TABLE} WHERE {TABLE} MATCH :expression{kind_filter} "
+        f"ORDER BY rowid DESC LIMIT :candidates) "
+        f"SELECT * FROM newest UNION ALL SELECT * FROM ("
+        f"SELECT {columns} FROM {TABLE} WHERE {TABLE} MATCH :title_expression{kind_filter} "
+        f"AND rowid < (SELECT CASE WHEN count(*) < :candidates THEN 0 ELSE min(rowid) END FROM newest) "
+        f"ORDER BY rowid DESC LIMIT :candidates)"
+    ), {
+        'expression': expression,
+        'title_expression': match_expression(text, 'title'),
+        'candidates': CANDIDATES
+    }).all()
+    if not candidates:
+        return []
+
+    return [
+        {
+            'type': _KIND_NAMES[rowid % 4],
+            'id': rowid // 4,
+            'title': title,
+            'snippet': _snippet_html(snippet),
+            'score': round(score, 4)
+        }
+        for score, rowid, title, snippet in _rank(candidates)[:max(1, min(limit, MAX_RESULTS))]
+    ]
@@ -0,0 +1,196 @@
+from src.models.business import db, Customer, Booking, StaffMember, Equipment
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Field spec: (output key, column or SQL expression, formatter name or None)
+FieldSpec = Tuple[str, Any, Optional[str]]
+
+def _iso_or_none(value):
+    return value.isoformat() if value else None
+
+def _float(value):
+    return float(value)
+
+def _float_or_none(value):
+    return float(value) if value else None
+
+def _datetime_text(value):
+    # SQLite text 'YYYY-MM-DD HH:MM:SS.ffffff' -> datetime.isoformat(),
+    # which omits a zero microsecond part
+    if not value:
+        return None
+    if value[20:] == '000000':
+        return value[:10] + 'T' + value[11:19]
+    return value[:10] + 'T' + value[11:]
+
+def _date_text(value):
+    return value or None
+
+def _time_text(value):
+    if not value:
+        return None
+    return value[:8] if value[9:] == '000000' else value
+
+_FORMATTERS = {
+    'float': _float,
+    'float_or_none': _float_or_none,
+    # Python formatters for datetime/date/time objects
+    'datetime': _iso_or_none,
+    'date': _iso_or_none,
+    'time': _iso_or_none,
+}
+
+# On SQLite temporal columns are ISO text already: read them raw and slice
+# instead of parsing into datetime objects and formatting them back
+_SQLITE_TEXT_FORMATTERS = {
+    'datetime': _datetime_text,
+    'date': _date_text,
+    'time': _time_text,
+}
+
+class RowSerializer:
+    """Serialize selected columns straight from row tuples into dicts.
+
+    The per-row function is generated once per database dialect, so building
+    each dict is a single dict display with no attribute lookups, ORM
+    identity-map bookkeeping or per-field branching.
+    """
+
+    def __init__(self, fields: List[FieldSpec]):
+        self.fields = fields
+        self._compiled = {}
+
+    def _compile(self, dialect: str):
+        raw_text = dialect == 'sqlite'
+        columns = []
+        namespace = {}
+        items = []
+
+        for index, (key, column, formatter) in enumerate(self.fields):
+            if raw_text and formatter in _SQLITE_TEXT_FORMATTERS:
+                column = db.type_coerce(column, db.String)
+                function = _SQLITE_TEXT_FORMATTERS[formatter]
+            else:
+                function = _FORMATTERS.get(formatter)
+
+            columns.append(column)
+            if function is None:
+                items.append(f"{key!r}: row[{index}]")
+            else:
+                namespace[f'_f{index}'] = function
+                items.append(f"{key!r}: _f{index}(row[{index}])")
+
+        source = "def serialize(row):\n    return {" + ", ".join(items) + "}\n"
+        exec(source, namespace)
+        return columns, namespace['serialize']
+
+    def compiled(self) -> Tuple[List[Any], Callable]:
+        dialect = db.session.get_bind().dialect.name
+        if dialect not in self._compiled:
+            self._compiled[dialect] = self._compile(dialect)
+        return self._compiled[dialect]
+
+    def select(self, *where, order_by=None):
+        """Column-only SELECT for this serializer"""
+        columns, _ = self.compiled()
+        query = db.select(*columns)
+        if where:
+            query = query.where(*where)
+        if order_by is not None:
+            query = query.order_by(order_by)
+        return query
+
+    def all(self, *where, order_by=None) -> List[Dict[str, Any]]:
+        _, serialize = self.compiled()
+        rows = db.session.execute(self.select(*where, order_by=order_by))
+        return [serialize(row) for row in rows]
+
+    def rows(self, rows) -> List[Dict[str, Any]]:
+        """Serialize rows fetched with ``select()``"""
+        _, serialize = self.compiled()
+        return [serialize(row) for row in rows]
+
+# Same output as Booking.to_dict(), for booking lists and the archive
+
+BOOKING = RowSerializer([
+    ('id', Booking.id, None),
+    ('customer_id', Booking.customer_id, None),
+    ('equipment_id', Booking.equipment_id, None),
+    ('event_type', Booking.event_type, None),
+    ('event_date', Booking.event_date, 'date'),
+    ('event_time', Booking.event_time, 'time'),
+    ('duration_hours', Booking.duration_hours, None),
+    ('venue', Booking.venue, None),
+    ('guest_count', Booking.guest_count, None),
+    ('backdrop_color', Booking.backdrop_color, None),
+    ('photo_layout', Booking.photo_layout, None),
+    ('special_requests', Booking.special_requests, None),
+    ('base_price', Booking.base_price, 'float_or_none'),
+    ('final_price', Booking.final_price, 'float_or_none'),
+    ('status', Booking.status, None),
+    ('created_at', Booking.created_at, 'datetime'),
+    ('confirmed_at', Booking.confirmed_at, 'datetime'),
+])
+
+# Shapes returned by the list endpoints
+
+STAFF_LIST = RowSerializer([
+    ('id', StaffMember.id, None),
+    ('name', StaffMember.name, None),
+    ('role', StaffMember.role, None),
+    ('status', StaffMember.status, None),
+    ('base_salary', StaffMember.base_salary, 'float'),
+    ('profit_share', StaffMember.profit_share, 'float'),
+    ('performance_score', StaffMember.performance_score, None),
+    ('events_completed', StaffMember.events_completed, None),
+    ('hire_date', StaffMember.hire_date, 'date'),
+    ('total_compensation', StaffMember.base_salary + StaffMember.profit_share, 'float'),
+])
+
+EQUIPMENT_LIST = RowSerializer([
+    ('id', Equipment.id, None),
+    ('name', Equipment.name, None),
+    ('type', Equipment.type, None),
+    ('status', Equipment.status, None),
+    ('purchase_date', Equipment.purchase_date, 'date'),
+    ('last_maintenance', Equipment.last_maintenance, 'date'),
+    ('next_maintenance', Equipment.next_maintenance, 'date'),
+    ('location', Equipment.location, None),
+    ('usage_count', Equipment.usage_count, None),
+])
+
+CUSTOMER_LIST = RowSerializer([
+    ('id', Customer.id, None),
+    ('name', Customer.name, None),
+    ('email', Customer.email, None),
+    ('phone', Customer.phone, None),
+    ('created_at', Customer.created_at, 'datetime'),
+])
+
+CUSTOMER_BOOKING_LIST = RowSerializer([
+    ('customer_id', Booking.customer_id, None),
+    ('id', Booking.id, None),
+    ('event_type', Booking.event_type, None),
+    ('event_date', Booking.event_date, 'date'),
+    ('duration_hours', Booking.duration_hours, None),
+    ('venue', Booking.venue, None),
+    ('guest_count', Booking.guest_count, None),
+    ('base_price', Booking.base_price, None),
+    ('final_price', Booking.final_price, None),
+    ('status', Booking.status, None),
+    ('created_at', Booking.created_at, 'datetime'),
+])
+
+def customers_with_bookings() -> List[Dict[str, Any]]:
+    """Customers with their bookings in two column-only queries"""
+    customers = CUSTOMER_LIST.all(order_by=Customer.id)
+    by_id = {}
+    for customer in customers:
+        customer['bookings'] = []
+        by_id[customer['id']] = customer['bookings']
+
+    for booking in CUSTOMER_BOOKING_LIST.all(order_by=Booking.id):
+        bookings = by_id.get(booking.pop('customer_id'))
+        if bookings is not None:
+            bookings.append(booking)
+
+    return customers
@@ -0,0 +1,178 @@
+from src.models.business import db, StaffMember, StaffSummary
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+SUMMARY_ID = 1
+
+# Weight of the latest event in the rolling performance score; the score
+# mostly reflects the last twenty or so events
+SCORE_ALPHA = 0.1
+
+# A customer rating of 1-5 stars maps onto the 0-100 performance scale
+RATING_SCALE = 20
+
+_summary = StaffSummary.__table__
+_active = StaffMember.status == 'active'
+_weight = StaffMember.performance_score * StaffMember.events_completed
+
+def _totals() -> Dict[str, Any]:
+    active_count, score_total, weight_total, events_completed, compensation_total = db.session.execute(
+        db.select(
+            db.func.count(StaffMember.id),
+            db.func.coalesce(db.func.sum(StaffMember.performance_score), 0.0),
+            db.func.coalesce(db.func.sum(_weight), 0.0),
+            db.func.coalesce(db.func.sum(StaffMember.events_completed), 0),
+            db.func.coalesce(db.func.sum(StaffMember.base_salary + StaffMember.profit_share), 0.0)
+        ).where(_active)
+    ).one()
+    return {
+        'active_count': active_count,
+        'score_total': score_total,
+        'weight_total': weight_total,
+        'events_completed': events_completed,
+        'compensation_total': compensation_total,
+        'updated_at': datetime.now()
+    }
+
+def rebuild_staff_summary():
+    """Recompute the summary row from the staff table (one aggregate query).
+
+    Needed after staff rows are written in bulk outside this module, and it
+    also clears any floating-point drift from the incremental updates.
+    """
+    totals = _totals()
+    if db.session.execute(db.update(_summary).where(_summary.c.id == SUMMARY_ID).values(**totals)).rowcount == 0:
+        db.session.execute(db.insert(_summary).values(id=SUMMARY_ID, **totals))
+
+def ensure_staff_summary():
+    """Create the summary row from the current staff when there is none"""
+    if db.session.get(StaffSummary, SUMMARY_ID) is not None:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(db.insert(_summary).values(id=SUMMARY_ID, **_totals()))
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()  # another worker created it first
+
+def adjust_summary(**deltas):
+    """Add ``deltas`` to the summary's totals in one atomic UPDATE"""
+    values = {name: _summary.c[name] + delta for name, delta in deltas.items() if delta}
+    db.session.execute(
+        db.update(_summary).where(_summary.c.id == SUMMARY_ID).values(updated_at=datetime.now(), **values)
+    )
+
+def staff_summary() -> Dict[str, Any]:
+    """Team aggregates over active staff, read from the summary row"""
+    row = db.session.execute(db.select(_summary).where(_summary.c.id == SUMMARY_ID)).mappings().first()
+    if row is None:
+        return {'active_count': 0, 'average_performance': 0, 'weight_total': 0.0,
+                'events_completed': 0, 'compensation_total': 0.0}
+    return {
+        'active_count': row['active_count'],
+        'average_performance': row['score_total'] / row['active_count'] if row['active_count'] else 0,
+        'weight_total': row['weight_total'],
+        'events_completed': row['events_completed'],
+        'compensation_total': row['compensation_total']
+    }
+
+def staff_added(staff: StaffMember):
+    """Count a newly inserted staff member in the summary"""
+    if staff.status == 'active':
+        adjust_summary(
+            active_count=1,
+            score_total=staff.performance_score,
+            weight_total=staff.performance_score * staff.events_completed,
+            events_completed=staff.events_completed,
+            compensation_total=staff.base_salary + staff.profit_share
+        )
+
+def record_completion(staff_ids: Iterable[int], rating: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Credit each staff member with a completed event.
+
+    ``events_completed`` goes up by one and, when the event was rated, the
+    performance score moves towards the rating by SCORE_ALPHA. The rows'
+    current values are read and locked first (on SQLite the transaction's
+    earlier writes hold the lock, as in complete_booking), then changed by
+    one UPDATE ... RETURNING, so concurrent completions never lose an update
+    and the summary receives exactly the change made, from the old and new
+    values as stored.
+    Raises ValueError when a staff member is unknown or inactive.
+    """
+    staff_ids = sorted(set(staff_ids))
+    old = {
+        row.id: row for row in db.session.execute(
+            db.select(StaffMember.id, StaffMember.performance_score, _weight.label('weight'))
+            .where(StaffMember.id.in_(staff_ids), _active)
+            .with_for_update()
+        )
+    }
+    missing = set(staff_ids) - set(old)
+    if missing:
+        raise ValueError(f"Unknown or inactive staff: {', '.join(map(str, sorted(missing)))}")
+
+    values = {'events_completed': StaffMember.events_completed + 1}
+    if rating is not None:
+        values['performance_score'] = (
+            StaffMember.performance_score * (1 - SCORE_ALPHA) + rating * RATING_SCALE * SCORE_ALPHA
+        )
+    rows = db.session.execute(
+        db.update(StaffMember)
+        .where(StaffMember.id.in_(staff_ids), _active)
+        .values(**values)
+        .returning(StaffMember.id, StaffMember.name, StaffMember.performance_score, StaffMember.events_completed,
+                   _weight.label('weight'))
+    ).all()
+
+    adjust_summary(
+        score_total=sum(row.performance_score - old[row.id].performance_score for row in rows),
+        weight_total=sum(row.weight - old[row.id].weight for row in rows),
+        events_completed=len(rows)
+    )
+
+    return [
+        {
+            'staff_id': row.id,
+            'name': row.name,
+            'performance_score': round(row.performance_score, 2),
+            'events_completed': row.events_completed
+        }
+        for row in rows
+    ]
+
+def distribute(amount: float) -> List[Dict[str, Any]]:
+    """Add ``amount`` to active staff profit shares, weighted by score x events.
+
+    The total weight comes from the summary row, so the whole distribution
+    is one UPDATE ... RETURNING over the active staff; with no weight yet,
+    everyone gets an equal share. Raises ValueError when nobody is active.
+    """
+    summary = staff_summary()
+    if not summary['active_count']:
+        raise ValueError("No active staff to distribute to")
+    if summary['weight_total'] > 1e-6:
+        share = _weight * (amount / summary['weight_total'])
+    else:
+        share = db.literal(amount / summary['active_count'])
+
+    rows = db.session.execute(
+        db.update(StaffMember)
+        .where(_active)
+        .values(profit_share=StaffMember.profit_share + share)
+        .returning(StaffMember.id, StaffMember.name, StaffMember.role, share.label('amount'),
+                   StaffMember.performance_score, StaffMember.events_completed)
+    ).all()
+    adjust_summary(compensation_total=sum(row.amount for row in rows))
+
+    return [
+        {
+            'staff_id': row.id,
+            'name': row.name,
+            'role': row.role,
+            'amount': float(row.amount),
+            'performance_score': row.performance_score,
+            'events_completed': row.events_completed
+        }
+        for row in sorted(rows, key=lambda row: row.id)
+    ]
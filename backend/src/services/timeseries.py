@@ -0,0 +1,158 @@
+from src.models.business import db, BusinessMetrics, AIExecutiveDecision, BOOKED_STATUSES
+from src.services.booking_archive import booking_source
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any
+
+BUCKETS = ('day', 'week', 'month')
+SERIES = ('revenue', 'bookings_by_status', 'bookings_by_event_type', 'ai_decisions')
+
+# Booking statuses that count towards booked revenue
+REVENUE_STATUSES = BOOKED_STATUSES
+
+def bucket_expression(column, bucket: str):
+    """SQL expression truncating a date/datetime column to the start of its bucket"""
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+
+    if db.engine.dialect.name == 'sqlite':
+        # SQLite stores dates as ISO text; slicing the prefix is much cheaper
+        # than running every row through the date/time functions.
+        day = db.func.substr(column, 1, 10)
+        if bucket == 'day':
+            return day
+        if bucket == 'week':
+            # ISO weeks start on Monday
+            return db.func.date(day, 'weekday 0', '-6 days')
+        return db.func.substr(column, 1, 7).op('||')('-01')
+
+    return db.func.date_trunc(bucket, column)
+
+def _bucket_key(value) -> str:
+    """Normalise a bucket value returned by the database to an ISO date string"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+def _datetime_range(start_date: date, end_date: date):
+    """Half-open datetime range covering every instant of the given dates"""
+    return (
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    )
+
+def revenue_series(start_date: date, end_date: date, bucket: str,
+                   history: bool = False) -> List[Dict[str, Any]]:
+    """Booked revenue (by event date) merged with recorded business metrics"""
+    bookings = booking_source(history)
+    booking_bucket = bucket_expression(bookings.c.event_date, bucket).label('bucket')
+    booked = db.session.query(
+        booking_bucket,
+        db.func.count(bookings.c.id),
+        db.func.sum(db.func.coalesce(bookings.c.final_price, bookings.c.base_price))
+    ).filter(
+        bookings.c.event_date >= start_date,
+        bookings.c.event_date <= end_date,
+        bookings.c.status.in_(REVENUE_STATUSES)
+    ).group_by(booking_bucket).all()
+
+    metrics_bucket = bucket_expression(BusinessMetrics.date, bucket).label('bucket')
+    recorded = db.session.query(
+        metrics_bucket,
+        db.func.sum(BusinessMetrics.total_revenue),
+        db.func.sum(BusinessMetrics.profit_distributed)
+    ).filter(
+        BusinessMetrics.date >= start_date,
+        BusinessMetrics.date <= end_date
+    ).group_by(metrics_bucket).all()
+
+    series = {}
+
+    def _point(key):
+        if key not in series:
+            series[key] = {
+                'bucket': key,
+                'booked_revenue': 0.0,
+                'confirmed_bookings': 0,
+                'metrics_revenue': 0.0,
+                'profit_distributed': 0.0
+            }
+        return series[key]
+
+    for bucket_value, count, revenue in booked:
+        point = _point(_bucket_key(bucket_value))
+        point['confirmed_bookings'] = count
+        point['booked_revenue'] = float(revenue or 0)
+
+    for bucket_value, revenue, distributed in recorded:
+        point = _point(_bucket_key(bucket_value))
+        point['metrics_revenue'] = float(revenue or 0)
+        point['profit_distributed'] = float(distributed or 0)
+
+    return [series[key] for key in sorted(series)]
+
+def _count_series(column, group_column, start_date: date, end_date: date,
+                  bucket: str, name: str) -> List[Dict[str, Any]]:
+    """Row counts of a datetime column grouped by bucket and one dimension"""
+    start, end = _datetime_range(start_date, end_date)
+    bucket_column = bucket_expression(column, bucket).label('bucket')
+
+    rows = db.session.query(
+        bucket_column,
+        group_column,
+        db.func.count()
+    ).filter(
+        column >= start,
+        column < end
+    ).group_by(bucket_column, group_column).order_by(bucket_column, group_column).all()
+
+    return [
+        {'bucket': _bucket_key(bucket_value), name: group_value, 'count': count}
+        for bucket_value, group_value, count in rows
+    ]
+
+def build_timeseries(start_date: date, end_date: date, bucket: str = 'day',
+                     series: List[str] = None, history: bool = False) -> Dict[str, Any]:
+    """Build the requested analytics series, aggregated entirely in SQL.
+
+    The response size is bounded by the number of buckets (times the number
+    of distinct statuses, event types and roles), not by the number of rows.
+    Booking series cover archived bookings only with ``history``.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+
+    series = list(series or SERIES)
+    unknown = [name for name in series if name not in SERIES]
+    if unknown:
+        raise ValueError(f"Unknown series: {', '.join(unknown)}")
+
+    result = {
+        'period': {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'bucket': bucket
+        }
+    }
+
+    if 'revenue' in series:
+        result['revenue'] = revenue_series(start_date, end_date, bucket, history)
+    bookings = booking_source(history)
+    if 'bookings_by_status' in series:
+        result['bookings_by_status'] = _count_series(
+            bookings.c.created_at, bookings.c.status, start_date, end_date, bucket, 'status'
+        )
+    if 'bookings_by_event_type' in series:
+        result['bookings_by_event_type'] = _count_series(
+            bookings.c.created_at, bookings.c.event_type, start_date, end_date, bucket, 'event_type'
+        )
+    if 'ai_decisions' in series:
+        result['ai_decisions'] = _count_series(
+            AIExecutiveDecision.created_at, AIExecutiveDecision.executive_role,
+            start_date, end_date, bucket, 'executive_role'
+        )
+
+    return result
@@ -0,0 +1,13 @@
+"""WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py src.wsgi:app
+"""
+from src.main import create_app
+from src.models.business import db
+from src.extensions.database import dispose_engines
+
+app = create_app()
+
+# With preload_app the app is built once in the master; workers must not
+# inherit its database connections
+dispose_engines(app, db)
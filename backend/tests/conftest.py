@@ -0,0 +1,36 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from src.main import create_app
+from src.ai_executives_enhanced import get_ai_team
+from src.services.sample_data import generate_sample_data
+
+TODAY = date(2026, 1, 1)
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """The app in testing mode on a temporary SQLite database with sample data.
+
+    AI executives run on their offline fallback, and views over their query
+    budget raise (QUERY_AUDIT_STRICT defaults on under TESTING).
+    """
+    for executive in get_ai_team().executives.values():
+        executive.model = None
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        generate_sample_data(customers=500, staff=10, equipment=20, decisions=100, today=TODAY)
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
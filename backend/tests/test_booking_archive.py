@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.main import create_app
+from src.models.business import db, Booking, BookingArchive, Communication, Customer
+from src.services.booking_archive import archive_bookings
+from src.services.search_index import ensure_search_index, search
+
+CUTOFF = date(2025, 1, 1)
+
+@pytest.fixture
+def archive_app(tmp_path):
+    """An app with one customer's bookings on both sides of CUTOFF, in every status"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'archive.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        db.session.add(Customer(id=1, name='Ada Guest', email='ada@example.com'))
+        for offset in (-30, 30):
+            for status in ('inquiry', 'confirmed', 'completed', 'cancelled'):
+                db.session.add(Booking(
+                    customer_id=1, event_type='wedding', event_date=CUTOFF + timedelta(days=offset),
+                    duration_hours=4, venue='The Hilton', base_price=500.0, status=status
+                ))
+        db.session.commit()
+        yield app
+
+def _statuses(model):
+    return sorted((row.event_date < CUTOFF, row.status) for row in model.query)
+
+def test_only_settled_past_bookings_are_archived(archive_app):
+    assert archive_bookings(CUTOFF) == 3
+    assert _statuses(BookingArchive) == [(True, 'cancelled'), (True, 'completed'), (True, 'inquiry')]
+    assert _statuses(Booking) == [
+        (False, 'cancelled'), (False, 'completed'), (False, 'confirmed'), (False, 'inquiry'), (True, 'confirmed')
+    ]
+
+def test_statuses_to_archive_are_configurable(archive_app):
+    assert archive_bookings(CUTOFF, statuses=['cancelled']) == 1
+    assert _statuses(BookingArchive) == [(True, 'cancelled')]
+
+def test_communications_keep_their_archived_booking(archive_app):
+    booking_id = db.session.scalar(
+        db.select(Booking.id).where(Booking.status == 'completed').order_by(Booking.event_date).limit(1)
+    )
+    db.session.add(Communication(customer_id=1, booking_id=booking_id, message_type='email', content='Thanks!'))
+    db.session.commit()
+
+    archive_bookings(CUTOFF)
+    assert db.session.get(BookingArchive, booking_id) is not None
+    assert Communication.query.one().booking_id == booking_id
+    referenced = {key['referred_table'] for key in db.inspect(db.engine).get_foreign_keys('communication')}
+    assert referenced == {'customer'}
+
+def test_archived_ids_are_not_reused(archive_app):
+    newest = db.session.scalar(db.select(db.func.max(Booking.id)))
+    db.session.execute(db.update(Booking).where(Booking.id == newest)
+                       .values(event_date=CUTOFF - timedelta(days=1), status='completed'))
+    db.session.commit()
+    archive_bookings(CUTOFF)
+    booking = Booking(customer_id=1, event_type='prom', event_date=CUTOFF, duration_hours=3, base_price=400.0)
+    db.session.add(booking)
+    db.session.commit()
+    assert booking.id > newest
+
+def _found(text, kinds=None):
+    return {(hit['type'], hit['id']) for hit in search(text, kinds)}
+
+def test_archived_bookings_stay_searchable(archive_app):
+    past = set(db.session.scalars(db.select(Booking.id).where(Booking.event_date < CUTOFF, Booking.status != 'confirmed')))
+    before = _found('wedding at the hilton')
+    archive_bookings(CUTOFF)
+    assert _found('wedding at the hilton') == before
+    assert {('booking', booking_id) for booking_id in past} <= _found('hilton', ['booking'])
+    assert not _found('hilton', ['customer'])
+
+def test_archive_index_is_filled_on_an_existing_database(archive_app):
+    archive_bookings(CUTOFF)
+    # A database indexed before archived bookings were
+    db.session.execute(db.text('DROP TRIGGER search_index_booking_archive_insert'))
+    db.session.execute(db.text('DELETE FROM search_index WHERE rowid % 4 = 0'))
+    db.session.commit()
+    assert len(_found('hilton')) == 5
+
+    assert ensure_search_index()
+    assert len(_found('hilton')) == 8
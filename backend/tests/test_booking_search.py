@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.explain_booking_search import CASES, problems
+from src.models.business import db
+from src.services.booking_search import parse_filters, search_query
+from conftest import TODAY
+
+from datetime import timedelta
+
+@pytest.mark.parametrize('descending', [False, True], ids=['asc', 'desc'])
+@pytest.mark.parametrize('after', [None, (TODAY - timedelta(days=250), 100)], ids=['first page', 'next page'])
+@pytest.mark.parametrize('name', list(CASES))
+def test_search_plan_reads_its_index(app, name, after, descending):
+    filters, index = CASES[name]
+    with app.app_context():
+        query = search_query(filters, after, 51, descending)
+        sql = str(query.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+        plan = [row[3] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql))]
+    assert problems(plan, index) == [], '\n'.join(plan)
+
+def test_parse_filters_drops_repeated_values():
+    filters = parse_filters({'status': 'confirmed,inquiry,confirmed,', 'event_type': 'prom,prom'})
+    assert filters == {'status': ['confirmed', 'inquiry'], 'event_type': ['prom']}
+
+def test_repeated_status_returns_each_booking_once(client):
+    once = client.get('/api/bookings?status=confirmed&limit=200').get_json()
+    twice = client.get('/api/bookings?status=confirmed,confirmed&limit=200').get_json()
+    ids = [booking['id'] for booking in twice]
+    assert ids and len(ids) == len(set(ids))
+    assert ids == [booking['id'] for booking in once]
@@ -0,0 +1,111 @@
+import logging
+import time
+from datetime import datetime
+
+import pytest
+
+from src.models.business import db, AIExecutiveDecision
+from src.services import decision_log
+from src.services.decision_log import _BufferedWriter, _entry
+
+def _entries(decision_type, count):
+    return [
+        _entry({
+            'executive': 'CEO',
+            'context': {'type': decision_type, 'index': index},
+            'decision': {'approved': True},
+            'timestamp': datetime(2026, 1, 1, 12, 0, index).isoformat()
+        }, 'Medium')
+        for index in range(count)
+    ]
+
+def _written(app, decision_type):
+    with app.app_context():
+        try:
+            return db.session.execute(
+                db.select(db.func.count()).where(AIExecutiveDecision.decision_type == decision_type)
+            ).scalar()
+        finally:
+            db.session.remove()
+
+def _wait_for(app, decision_type, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _written(app, decision_type) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return _written(app, decision_type)
+
+@pytest.fixture
+def writers():
+    started = []
+    yield started.append
+    for writer in started:
+        writer.close()
+
+def test_full_batch_is_written_without_waiting_for_the_interval(app, writers):
+    writer = _BufferedWriter(app, batch_size=5, interval=60, max_retries=2)
+    writers(writer)
+    writer.submit(_entries('log-count', 4))
+    time.sleep(0.2)
+    assert _written(app, 'log-count') == 0
+    writer.submit(_entries('log-count', 1))
+    assert _wait_for(app, 'log-count', 5) == 5
+
+def test_partial_batch_is_written_after_the_interval(app, writers):
+    writer = _BufferedWriter(app, batch_size=100, interval=0.05, max_retries=2)
+    writers(writer)
+    writer.submit(_entries('log-interval', 3))
+    assert _wait_for(app, 'log-interval', 3) == 3
+
+def test_failed_batch_is_retried(app, writers, monkeypatch):
+    writer = _BufferedWriter(app, batch_size=100, interval=60, max_retries=2)
+    writers(writer)
+    insert = decision_log.insert_entries
+    calls = []
+
+    def flaky_insert(entries):
+        calls.append(len(entries))
+        if len(calls) == 1:
+            raise RuntimeError('database is locked')
+        insert(entries)
+
+    monkeypatch.setattr(decision_log, 'insert_entries', flaky_insert)
+    writer.submit(_entries('log-retry', 3))
+    assert writer.flush() == 0
+    writer.submit(_entries('log-retry', 1))
+    assert writer.flush() == 4
+    assert calls == [3, 4]
+    assert _written(app, 'log-retry') == 4
+
+def test_batch_is_dropped_after_max_retries(app, writers, monkeypatch, caplog):
+    writer = _BufferedWriter(app, batch_size=100, interval=60, max_retries=1)
+    writers(writer)
+
+    def failing_insert(entries):
+        raise RuntimeError('database is locked')
+
+    monkeypatch.setattr(decision_log, 'insert_entries', failing_insert)
+    writer.submit(_entries('log-dropped', 2))
+    with caplog.at_level(logging.WARNING):
+        assert writer.flush() == 0
+        assert writer.flush() == 0
+    assert writer.flush() == 0  # nothing left to retry
+    assert 'Dropping 2 AI decision records after 2 failed writes' in caplog.text
+    assert _written(app, 'log-dropped') == 0
+
+def test_close_flushes_what_is_buffered(app):
+    writer = _BufferedWriter(app, batch_size=100, interval=60, max_retries=2)
+    writer.submit(_entries('log-close', 3))
+    writer.close()
+    assert not writer._thread.is_alive()
+    assert _written(app, 'log-close') == 3
+
+def test_sync_mode_writes_with_the_callers_transaction(app):
+    decision = {'executive': 'CEO', 'context': {'type': 'log-sync'}, 'decision': {},
+                'timestamp': datetime(2026, 1, 1).isoformat()}
+    with app.app_context():
+        assert app.extensions['decision_log'] is None
+        decision_log.decision_log.record(decision)
+        db.session.rollback()
+        decision_log.decision_log.record(decision)
+        db.session.commit()
+    assert _written(app, 'log-sync') == 1
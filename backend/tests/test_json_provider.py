@@ -0,0 +1,63 @@
+import dataclasses
+import hashlib
+import random
+from datetime import date, datetime, time
+
+import pytest
+from flask import Flask
+
+from benchmarks.bench_json import analytics_payload, customers_payload, decisions_payload
+from src.extensions.json_provider import JSONProvider, OrjsonProvider
+
+orjson = pytest.importorskip('orjson')
+
+@dataclasses.dataclass
+class Quote:
+    total: float
+    discount: float
+
+HASHES = {
+    'context_hash': hashlib.sha256(b'context').hexdigest(),
+    'decision_hash': '0e5' + hashlib.sha256(b'decision').hexdigest()[3:],
+    'email': 'guest5e3@example.com',
+    'note': 'Booth 2e4 at 1e-7 Main St',
+    'price': 859.05,
+}
+
+PAYLOADS = {
+    'customers': lambda: customers_payload(50, random.Random(1)),
+    'decisions': lambda: decisions_payload(20, random.Random(2)),
+    'analytics': analytics_payload,
+    'hashes': lambda: [HASHES] * 3,
+    'floats': lambda: {
+        'values': [0.0, -0.0, 1e-4, 9.99e-5, 1e-5, -2.5e-5, 1e-7, 0.1, 123.456, 1e15, 9999999999999998.0, 1e16,
+                   -3.5e20, 2 ** 0.5],
+        'nested': ({'ratio': 1e-6}, [5e-5]),
+        'quote': Quote(747.0, 1e-5),
+        'hash': HASHES['context_hash'],
+    },
+    'temporal': lambda: {'at': datetime(2026, 1, 1, 12, 30, 0, 250), 'on': date(2026, 1, 1), 'time': time(18, 30)},
+    'unicode': lambda: {'name': 'Zoë Café', 'venue': 'Château 1e5'},
+    'large int': lambda: {'id': 2 ** 70, 'price': 12.5},
+}
+
+@pytest.fixture(scope='module')
+def providers():
+    app = Flask(__name__)
+    with app.app_context():
+        yield JSONProvider(app), OrjsonProvider(app)
+
+@pytest.mark.parametrize('name', list(PAYLOADS))
+def test_orjson_responses_match_the_stdlib_byte_for_byte(providers, name):
+    stdlib, fast = providers
+    payload = PAYLOADS[name]()
+    assert fast.response(payload).get_data() == stdlib.response(payload).get_data()
+
+def test_text_that_looks_like_an_exponent_keeps_orjson(providers):
+    _, fast = providers
+    assert fast._encode([HASHES] * 3, fast._options()) is not None
+
+@pytest.mark.parametrize('value', [1e16, 1e-7, 1e-5, -2.5e-5])
+def test_floats_orjson_formats_differently_use_the_stdlib(providers, value):
+    _, fast = providers
+    assert fast._encode({'value': value, 'hash': HASHES['context_hash']}, fast._options()) is None
@@ -0,0 +1,173 @@
+import mailbox
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.main import create_app
+from src.models.business import db, Communication, Customer
+from src.services import outbox
+from src.services.mail import FileTransport, Transport
+
+SENDER = 'Party Favor Photo <hello@partyfavorphoto.com>'
+
+class FailingTransport(Transport):
+    def __init__(self):
+        super().__init__(SENDER)
+
+    def send(self, recipient, subject, body):
+        raise ConnectionRefusedError('SMTP server unavailable')
+
+@pytest.fixture(scope='module')
+def outbox_app(tmp_path_factory):
+    """An app with one customer and an otherwise empty outbox"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path_factory.mktemp('db') / 'outbox.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        db.session.add(Customer(id=1, name='Ada Guest', email='ada@example.com'))
+        db.session.commit()
+    return app
+
+@pytest.fixture
+def ctx(outbox_app):
+    with outbox_app.app_context():
+        yield outbox_app
+        db.session.rollback()
+        db.session.execute(db.delete(Communication))
+        db.session.commit()
+
+def _queue(count, now):
+    db.session.execute(db.insert(Communication), [
+        {'customer_id': 1, 'booking_id': None, 'message_type': 'email', 'content': f'Message {index}',
+         **outbox.pending(f'guest{index}@example.com', 'Your booking', now)}
+        for index in range(count)
+    ])
+    db.session.commit()
+
+def _row(row_id):
+    db.session.expire_all()
+    return db.session.get(Communication, row_id)
+
+def test_concurrent_claimers_never_share_a_row(ctx):
+    now = datetime.utcnow()
+    _queue(100, now)
+    claimed = [[], []]
+    start = threading.Barrier(2)
+
+    def claimer(index):
+        with ctx.app_context():
+            start.wait()
+            while rows := outbox.claim(7, now):
+                claimed[index].extend(row.id for row in rows)
+            db.session.remove()
+
+    threads = [threading.Thread(target=claimer, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not set(claimed[0]) & set(claimed[1])
+    assert sorted(claimed[0] + claimed[1]) == sorted(db.session.scalars(db.select(Communication.id)))
+
+def test_expired_lease_is_claimed_again(ctx):
+    now = datetime.utcnow()
+    _queue(1, now)
+    (first,) = outbox.claim(10, now)
+    lease = timedelta(seconds=ctx.config['OUTBOX_LEASE_SECONDS'])
+    assert outbox.claim(10, now + lease - timedelta(seconds=1)) == []
+
+    (second,) = outbox.claim(10, now + lease)
+    assert second.id == first.id
+    assert (first.attempts, second.attempts) == (1, 2)
+
+def test_delivered_message_is_written_to_the_file_transport(ctx, tmp_path):
+    _queue(2, datetime.utcnow())
+    transport = FileTransport(SENDER, str(tmp_path / 'outbox.mbox'))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert outbox.deliver_batch(transport, pool) == {'sent': 2, 'retrying': 0, 'failed': 0}
+    transport.close()
+    assert sorted(message['To'] for message in mailbox.mbox(str(tmp_path / 'outbox.mbox'))) == [
+        'guest0@example.com', 'guest1@example.com'
+    ]
+    assert outbox.outbox_counts()['sent'] == 2
+
+def test_failing_transport_backs_off_then_gives_up(ctx, monkeypatch):
+    monkeypatch.setitem(ctx.config, 'OUTBOX_MAX_ATTEMPTS', 3)
+    base = ctx.config['OUTBOX_RETRY_BASE_SECONDS']
+    _queue(1, datetime.utcnow())
+    row_id = db.session.scalar(db.select(Communication.id))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for attempt in (1, 2):
+            before = datetime.utcnow()
+            now = _row(row_id).next_attempt_at
+            assert outbox.deliver_batch(FailingTransport(), pool, now) == {'sent': 0, 'retrying': 1, 'failed': 0}
+            row = _row(row_id)
+            assert (row.status, row.attempts) == (outbox.PENDING, attempt)
+            assert 'ConnectionRefusedError' in row.last_error
+            delay = (row.next_attempt_at - before).total_seconds()
+            # Exponential in the attempts made, jittered down to half
+            assert base * 2 ** (attempt - 1) * 0.5 <= delay <= base * 2 ** (attempt - 1) + 1
+            # Not due again before the backoff has passed
+            assert outbox.claim(10, before) == []
+
+        assert outbox.deliver_batch(FailingTransport(), pool, _row(row_id).next_attempt_at) == {
+            'sent': 0, 'retrying': 0, 'failed': 1
+        }
+    row = _row(row_id)
+    assert (row.status, row.attempts, row.next_attempt_at) == (outbox.FAILED, 3, None)
+    assert outbox.requeue_failed() == 1
+    assert (_row(row_id).status, _row(row_id).attempts) == (outbox.PENDING, 0)
+
+class StalledTransport(Transport):
+    """Holds each send until released, then delivers or fails it"""
+
+    def __init__(self, fail: bool):
+        super().__init__(SENDER)
+        self.fail = fail
+        self.sending, self.release = threading.Event(), threading.Event()
+
+    def send(self, recipient, subject, body):
+        self.sending.set()
+        self.release.wait(5)
+        if self.fail:
+            raise TimeoutError('SMTP server stopped responding')
+
+def _worker(app, transport, now, results):
+    def deliver():
+        with app.app_context(), ThreadPoolExecutor(max_workers=1) as pool:
+            results.append(outbox.deliver_batch(transport, pool, now))
+            db.session.remove()
+    thread = threading.Thread(target=deliver)
+    thread.start()
+    assert transport.sending.wait(5)
+    return thread
+
+def test_stale_attempt_does_not_overwrite_a_newer_one(ctx):
+    now = datetime.utcnow()
+    _queue(1, now)
+    row_id = db.session.scalar(db.select(Communication.id))
+    later = now + timedelta(seconds=ctx.config['OUTBOX_LEASE_SECONDS'] + 1)
+
+    # The first worker stalls past its lease; a second claims the row meanwhile
+    stale, current, results = StalledTransport(fail=True), StalledTransport(fail=False), []
+    stale_worker = _worker(ctx, stale, now, results)
+    current_worker = _worker(ctx, current, later, results)
+
+    # The stale failure lands while the second attempt is still sending
+    stale.release.set()
+    stale_worker.join()
+    row = _row(row_id)
+    assert (row.status, row.attempts, row.last_error) == (outbox.SENDING, 2, None)
+
+    current.release.set()
+    current_worker.join()
+    assert results == [{'sent': 0, 'retrying': 1, 'failed': 0}, {'sent': 1, 'retrying': 0, 'failed': 0}]
+    row = _row(row_id)
+    assert (row.status, row.attempts, row.last_error) == (outbox.SENT, 2, None)
+    assert row.sent_at is not None
@@ -0,0 +1,94 @@
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from src.extensions.query_audit import QueryBudgetExceeded, capture_queries, init_query_audit, query_budget
+from src.models.business import db, Booking
+
+def _audited_app(**config):
+    """A bare app with only the auditor, whose views run statements on an in-memory engine"""
+    app = Flask(__name__)
+    app.config.update(config)
+    init_query_audit(app)
+    engine = create_engine('sqlite://')
+
+    @app.route('/one')
+    @query_budget(1)
+    def one():
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        return 'ok'
+
+    @app.route('/three')
+    @query_budget(1)
+    def three():
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text('SELECT 1'))
+        return 'ok'
+
+    return app
+
+def test_capture_queries_groups_repeated_shapes(app):
+    with app.app_context(), capture_queries() as report:
+        for ids in ([1], [1, 2], [1, 2, 3]):
+            db.session.execute(db.select(Booking.id).where(Booking.id.in_(ids))).all()
+        db.session.execute(db.select(db.func.count(Booking.id))).scalar()
+    assert report.count == 4
+    assert len(report.shapes) == 2
+    (shape, count), = report.repeated(3)
+    assert count == 3 and 'IN (...)' in shape
+    with pytest.raises(QueryBudgetExceeded):
+        report.assert_budget(3)
+
+def test_strict_mode_fails_a_view_over_its_budget():
+    client = _audited_app(TESTING=True).test_client()
+    assert client.get('/one').headers['X-Query-Count'] == '1'
+    with pytest.raises(QueryBudgetExceeded, match='three exceeded its query budget of 1'):
+        client.get('/three')
+
+def test_lenient_mode_only_logs_a_view_over_its_budget(caplog):
+    client = _audited_app(QUERY_AUDIT=True, QUERY_AUDIT_STRICT=False).test_client()
+    response = client.get('/three')
+    assert response.status_code == 200 and response.headers['X-Query-Count'] == '3'
+    assert 'exceeded its query budget' in caplog.text
+
+def test_auditing_follows_debug_mode_set_after_startup():
+    app = _audited_app()
+    assert 'X-Query-Count' not in app.test_client().get('/one').headers
+    app.debug = True  # as app.run(debug=True) does
+    assert app.test_client().get('/one').headers['X-Query-Count'] == '1'
+
+def _confirmed_booking(app):
+    with app.app_context():
+        return db.session.execute(
+            db.select(Booking.id).where(Booking.status == 'confirmed').order_by(Booking.id).limit(1)
+        ).scalar_one()
+
+# endpoint -> (method, path, JSON body); path may be a callable of the app
+BUDGETED_REQUESTS = {
+    'customer.get_customers': ('GET', '/api/customers', None),
+    'customer.search_bookings_endpoint': ('GET', '/api/bookings?status=confirmed,inquiry&order=desc', None),
+    'customer.search_records': ('GET', '/api/search?q=customer', None),
+    'customer.generate_quote': ('POST', '/api/bookings/1/quote', {}),
+    'customer.complete_booking': (
+        'POST', lambda app: f'/api/bookings/{_confirmed_booking(app)}/complete', {'staff_ids': [1, 2], 'rating': 5}
+    ),
+    'customer.get_dashboard_data': ('GET', '/api/dashboard', None),
+    'business.get_maintenance_due': ('GET', '/api/equipment/maintenance-due?days=90', None),
+}
+
+def test_every_budgeted_view_is_covered(app):
+    budgeted = {
+        endpoint for endpoint, view in app.view_functions.items() if getattr(view, 'query_budget', None) is not None
+    }
+    assert budgeted == set(BUDGETED_REQUESTS)
+
+@pytest.mark.parametrize('endpoint', list(BUDGETED_REQUESTS))
+def test_view_stays_within_its_query_budget(app, client, endpoint):
+    method, path, body = BUDGETED_REQUESTS[endpoint]
+    path = path(app) if callable(path) else path
+    # Strict under TESTING: a view over its budget raises QueryBudgetExceeded here
+    response = client.open(path, method=method, json=body)
+    assert response.status_code < 400, response.get_data(as_text=True)
+    assert int(response.headers['X-Query-Count']) <= app.view_functions[endpoint].query_budget
@@ -0,0 +1,41 @@
+from datetime import date
+
+from src.main import create_app
+from src.models.business import db
+from src.services.sample_data import generate_sample_data
+
+COUNTS = {'customers': 60, 'staff': 4, 'equipment': 5, 'decisions': 30}
+# Stamped with the time of the load rather than generated
+LOAD_TIMES = {'decision_payload.created_at', 'staff_summary.updated_at'}
+
+def _generate(path, seed=42, today=date(2026, 1, 1)):
+    """Every table's rows after generating COUNTS into a fresh database"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        generate_sample_data(**COUNTS, seed=seed, today=today, chunk_size=25)
+        return {
+            table.name: db.session.execute(
+                db.select(*[column for column in table.columns if str(column) not in LOAD_TIMES])
+                .order_by(*table.primary_key.columns)
+            ).all()
+            for table in db.metadata.sorted_tables
+        }
+
+def test_same_seed_and_today_give_the_same_rows(tmp_path):
+    first = _generate(tmp_path / 'first.db')
+    assert all(first[table] for table in ('customer', 'booking', 'communication', 'staff_member', 'equipment'))
+    assert first == _generate(tmp_path / 'second.db')
+
+def test_seed_and_today_change_the_rows(tmp_path):
+    rows = _generate(tmp_path / 'first.db')
+    assert _generate(tmp_path / 'seed.db', seed=7)['booking'] != rows['booking']
+    assert _generate(tmp_path / 'today.db', today=date(2026, 2, 1))['booking'] != rows['booking']
+
+def test_sample_data_endpoint_needs_the_admin_token(client, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'secret')
+    assert client.post('/api/admin/sample-data', json={'customers': 1}).status_code == 403
+    assert '/api/initialize-sample-data' not in {rule.rule for rule in app.url_map.iter_rules()}
@@ -0,0 +1,99 @@
+from datetime import date
+
+import pytest
+
+from src.main import create_app
+from src.models.business import db, Booking, BookingArchive, Communication, Customer
+from src.services import search_index
+from src.services.search_index import ensure_search_index, search
+
+EVENT_DATE = date(2026, 6, 1)
+
+# kind -> (model, row with 'quokka' in an indexed column, that column, type it is found as)
+SOURCES = {
+    'customer': (Customer, {'name': 'Quokka Hall', 'email': 'hall@example.com'}, 'name', 'customer'),
+    'booking': (Booking, {
+        'customer_id': 1, 'event_type': 'wedding', 'event_date': EVENT_DATE, 'duration_hours': 4,
+        'venue': 'Quokka Barn', 'base_price': 500.0
+    }, 'venue', 'booking'),
+    'communication': (Communication, {
+        'customer_id': 1, 'message_type': 'email', 'content': 'Bring the quokka costume'
+    }, 'content', 'communication'),
+    'booking_archive': (BookingArchive, {
+        'id': 1000, 'customer_id': 1, 'event_type': 'wedding', 'event_date': EVENT_DATE, 'duration_hours': 4,
+        'special_requests': 'Quokka ears for everyone', 'base_price': 500.0
+    }, 'special_requests', 'booking'),
+}
+
+@pytest.fixture
+def search_app(tmp_path):
+    """An app with a single customer to hang bookings and communications off"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'search.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        db.session.add(Customer(id=1, name='Ada Guest', email='ada@example.com', company='Gold Events'))
+        db.session.commit()
+        yield app
+
+def _found(text, kinds=None):
+    return {(hit['type'], hit['id']) for hit in search(text, kinds)}
+
+@pytest.mark.parametrize('kind', SOURCES)
+def test_index_follows_inserts_updates_and_deletes(search_app, kind):
+    model, fields, column, found_as = SOURCES[kind]
+    row = model(**fields)
+    db.session.add(row)
+    db.session.commit()
+    row_id = row.id
+    assert _found('quokka') == {(found_as, row_id)}
+
+    setattr(row, column, 'Wombat Lodge')
+    db.session.commit()
+    assert _found('quokka') == set()
+    assert _found('wombat') == {(found_as, row_id)}
+
+    db.session.delete(row)
+    db.session.commit()
+    assert _found('wombat') == set()
+
+def test_only_the_last_word_is_a_prefix(search_app):
+    assert _found('ada gue') == {('customer', 1)}
+    assert _found('gue') == {('customer', 1)}
+    assert _found('ad guest') == set()
+
+def test_title_match_ranks_above_body_match(search_app):
+    db.session.add(Communication(customer_id=1, message_type='email', content='Say hi to Otto for us'))
+    db.session.add(Customer(id=2, name='Otto Lens', email='otto@example.com'))
+    db.session.commit()
+    assert [hit['type'] for hit in search('otto')] == ['customer', 'communication']
+
+def test_older_title_match_is_not_crowded_out(search_app, monkeypatch):
+    monkeypatch.setattr(search_index, 'CANDIDATES', 2)
+    for number in range(5):
+        db.session.add(Communication(customer_id=1, message_type='email', content=f'Note {number} for Ada'))
+    db.session.commit()
+    hits = search('ada')
+    assert len(hits) == 3
+    assert (hits[0]['type'], hits[0]['id']) == ('customer', 1)
+
+def test_search_narrows_by_type(search_app):
+    db.session.add(Communication(customer_id=1, message_type='email', content='Gold Events called'))
+    db.session.commit()
+    assert {found for found, _ in _found('gold')} == {'customer', 'communication'}
+    assert {found for found, _ in _found('gold', ['communication'])} == {'communication'}
+    with pytest.raises(ValueError):
+        search('gold', ['invoice'])
+
+def test_index_with_an_older_definition_is_rebuilt(search_app):
+    db.session.execute(db.text('DROP TABLE search_index'))
+    db.session.execute(db.text("CREATE VIRTUAL TABLE search_index USING fts5(title, body, prefix = '2 3')"))
+    db.session.commit()
+    assert _found('ada') == set()
+
+    assert ensure_search_index()
+    assert _found('ada') == {('customer', 1)}
+    assert db.session.scalar(db.text("SELECT sql FROM sqlite_master WHERE name = 'search_index'")) == \
+        search_index._CREATE
@@ -0,0 +1,37 @@
+import pytest
+from flask import jsonify
+
+from benchmarks.bench_serializers import legacy_customers, legacy_equipment, legacy_staff, load
+from src.main import create_app
+from src.models.business import db, Booking
+from src.services.serializers import BOOKING
+
+@pytest.fixture(scope='module')
+def serializer_app(tmp_path_factory):
+    """An app loaded with the serializer benchmark's data, which covers NULLs,
+    zero microseconds and awkward floats"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path_factory.mktemp('db') / 'serializers.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        load(customers=200, staff=50, equipment=50, seed=7)
+    return app
+
+@pytest.mark.parametrize('path, legacy', [
+    ('/api/customers', legacy_customers),
+    ('/api/staff', legacy_staff),
+    ('/api/equipment', legacy_equipment),
+], ids=['customers', 'staff', 'equipment'])
+def test_list_endpoint_matches_orm_output(serializer_app, path, legacy):
+    response = serializer_app.test_client().get(path)
+    assert response.status_code == 200
+    with serializer_app.app_context():
+        expected = jsonify(legacy()).get_data()
+    assert response.get_data() == expected
+
+def test_booking_rows_match_to_dict(serializer_app):
+    with serializer_app.app_context():
+        expected = jsonify([booking.to_dict() for booking in Booking.query.order_by(Booking.id)]).get_data()
+        assert jsonify(BOOKING.all(order_by=Booking.id)).get_data() == expected
@@ -0,0 +1,56 @@
+import random
+from datetime import date
+
+import pytest
+
+from src.main import create_app
+from src.models.business import db, StaffMember
+from src.services.staff_stats import distribute, rebuild_staff_summary, record_completion, staff_summary
+
+@pytest.fixture
+def staff_app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'staff.db'}",
+        'DECISION_LOG_MODE': 'sync',
+        'TESTING': True
+    })
+    with app.app_context():
+        rng = random.Random(3)
+        db.session.add_all([
+            StaffMember(name=f'Staff {index}', role='Photographer', base_salary=2800.0,
+                        performance_score=rng.uniform(60, 100), events_completed=rng.randrange(50),
+                        hire_date=date(2024, 1, 1), status='inactive' if index == 4 else 'active')
+            for index in range(12)
+        ])
+        rebuild_staff_summary()
+        db.session.commit()
+        yield app
+
+def _rebuilt():
+    rebuild_staff_summary()
+    try:
+        return staff_summary()
+    finally:
+        db.session.rollback()
+
+def test_completions_keep_the_summary_equal_to_a_rebuild(staff_app):
+    rng = random.Random(11)
+    active = [staff_id for staff_id in range(1, 13) if staff_id != 5]
+    for completion in range(500):
+        record_completion(rng.sample(active, rng.randint(1, 3)), rng.choice([None, 1, 2.5, 4, 5]))
+        if completion % 50 == 0:
+            distribute(1000.0)
+        db.session.commit()
+
+    summary, rebuilt = staff_summary(), _rebuilt()
+    assert summary['events_completed'] == rebuilt['events_completed']
+    assert summary['active_count'] == rebuilt['active_count']
+    for field in ('average_performance', 'weight_total', 'compensation_total'):
+        assert summary[field] == pytest.approx(rebuilt[field], rel=1e-12, abs=1e-9), field
+
+def test_unknown_or_inactive_staff_change_nothing(staff_app):
+    before = staff_summary()
+    with pytest.raises(ValueError, match='Unknown or inactive staff: 5, 99'):
+        record_completion([1, 5, 99], 5)
+    db.session.rollback()
+    assert staff_summary() == before